@@ -1,52 +1,244 @@
-import streamlit as st
+import numpy as np
+from algorithms.stats import timed
 
-def calculate_savings(distance_matrix):
+def savings_formula(to_first, to_second, between, lam=1.0, mu=0.0, nu=0.0, demand_term=None):
+    """
+    Parameterized savings of linking two customers, on arrays that broadcast.
+
+    s = d[i, 0] + d[0, j] - lam * d[i, j] + mu * |d[i, 0] - d[0, j]| + nu * demand_term
+    where lam is the route shape parameter, mu weighs the asymmetry of the
+    depot distances and `demand_term` is (q_i + q_j) / mean demand. The
+    defaults give the classic Clark-Wright savings.
+    """
+    savings = to_first + to_second - (between if lam == 1 else lam * between)
+    if mu:
+        savings = savings + mu * np.abs(to_first - to_second)
+    if nu:
+        savings = savings + nu * demand_term
+    return savings
+
+def _demand_weights(demands, customers, nu):
+    """
+    Return q / mean(q) for the customers when the demand term is used.
+    """
+    if not nu:
+        return None
+    if demands is None:
+        raise ValueError("The demand term of the savings (nu) needs the demands.")
+    q = np.asarray(demands, dtype=float)[:customers]
+    mean = q.mean() if len(q) else 0.0
+    return q / mean if mean else np.zeros_like(q)
+
+def calculate_savings(distance_matrix, lam=1.0, mu=0.0, nu=0.0, demands=None):
     """
     Calculate the savings for each pair of nodes.
+
+    The savings d[i, depot] + d[j, depot] - d[i, j] are broadcast over the
+    upper triangle of the matrix in one pass. Returns three arrays
+    (first, second, savings) sorted by savings in descending order; ties keep
+    the row-major (i, j) order of the upper triangle. `lam`, `mu` and `nu`
+    select a parameterized variant, see savings_formula.
     """
-    savings = []
-    n = len(distance_matrix)
+    d = np.asarray(distance_matrix)
+    if not np.issubdtype(d.dtype, np.floating):
+        d = d.astype(float)
+    n = len(d)
     depot = n - 1  # Depot is the last node in the matrix
+    index_dtype = np.int32 if n < np.iinfo(np.int32).max else np.int64
 
-    for i in range(n - 1):  # Exclude depot itself
-        for j in range(i + 1, n - 1):
-            saving = distance_matrix.iloc[i, depot] + distance_matrix.iloc[j, depot] - distance_matrix.iloc[i, j]
-            savings.append((i, j, saving))
+    # Upper triangle of the customer block, excluding the depot itself
+    first, second = np.triu_indices(n - 1, k=1)
+    first = first.astype(index_dtype)
+    second = second.astype(index_dtype)
+    weights = _demand_weights(demands, n - 1, nu)
+    savings = savings_formula(
+        d[first, depot], d[second, depot], d[first, second], lam, mu, nu,
+        None if weights is None else weights[first] + weights[second],
+    )
 
-    # Sort by savings in descending order
-    savings.sort(key=lambda x: x[2], reverse=True)
-    return savings
+    # Sort by savings in descending order (stable, so ties keep pair order)
+    order = np.argsort(-savings, kind="stable")
+    return first[order], second[order], savings[order]
 
-def clark_wright(distance_matrix, demands, max_capacity):
+def calculate_granular_savings(distance_matrix, neighbors, block_size=256, lam=1.0, mu=0.0, nu=0.0, demands=None):
+    """
+    Calculate only the best `neighbors` savings of every customer.
+
+    Rows are processed in blocks of `block_size` customers and the candidates
+    are written into preallocated int32/float32 arrays of n * neighbors
+    entries, so memory grows linearly with n instead of with the n^2/2 pairs
+    of calculate_savings. Returns the same (first, second, savings) layout,
+    with duplicate pairs removed and sorted in descending order.
+    """
+    d = np.asarray(distance_matrix)
+    customers = len(d) - 1
+    to_depot = np.asarray(d[:customers, customers], dtype=float)
+
+    def distance_rows(start, stop):
+        return np.asarray(d[start:stop, :customers], dtype=float)
+
+    return granular_savings(to_depot, distance_rows, neighbors, block_size, lam, mu, nu, demands)
+
+def granular_savings(to_depot, distance_rows, neighbors, block_size=256, lam=1.0, mu=0.0, nu=0.0, demands=None):
+    """
+    Top-`neighbors` savings per customer from a row-block distance provider.
+
+    `to_depot` holds each customer's distance to the depot and
+    `distance_rows(start, stop)` returns the customer-to-customer distances
+    of rows start..stop, so callers can compute blocks on the fly instead of
+    storing a matrix (see calculate_granular_savings and geo.coordinate_savings).
+    """
+    customers = len(to_depot)
+    k = min(int(neighbors), customers - 1)
+    if k <= 0:
+        return np.empty(0, np.int32), np.empty(0, np.int32), np.empty(0, np.float32)
+
+    weights = _demand_weights(demands, customers, nu)
+    first = np.empty(customers * k, dtype=np.int32)
+    second = np.empty(customers * k, dtype=np.int32)
+    savings = np.empty(customers * k, dtype=np.float32)
+
+    for start in range(0, customers, block_size):
+        stop = min(start + block_size, customers)
+        rows = np.arange(start, stop)
+        block = savings_formula(
+            to_depot[rows, None], to_depot[None, :], distance_rows(start, stop), lam, mu, nu,
+            None if weights is None else weights[rows, None] + weights[None, :],
+        )
+        block[rows - start, rows] = -np.inf  # A customer is never its own neighbour
+        best = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        first[start * k:stop * k] = np.repeat(rows, k)
+        second[start * k:stop * k] = best.ravel()
+        savings[start * k:stop * k] = np.take_along_axis(block, best, axis=1).ravel()
+
+    # Store each pair once as (smaller, larger), like the upper triangle
+    low = np.minimum(first, second)
+    high = np.maximum(first, second)
+    _, unique = np.unique(low.astype(np.int64) * customers + high, return_index=True)
+    first, second, savings = low[unique], high[unique], savings[unique]
+
+    order = np.argsort(-savings, kind="stable")
+    return first[order], second[order], savings[order]
+
+def _walk_routes(parent, head, label, link_a, link_b):
+    """
+    Emit the routes of a merge, ordered by label, by walking neighbour links from each head.
+    """
+    routes = []
+    for root in sorted((node for node in range(len(parent)) if parent[node] == node), key=label.__getitem__):
+        route = []
+        previous, node = -1, head[root]
+        while node != -1:
+            route.append(node)
+            previous, node = node, (link_a[node] if link_a[node] != previous else link_b[node])
+        routes.append(route)
+    return routes
+
+def merge_routes(first, second, demands, max_capacity, stats=None):
+    """
+    Merge single-customer routes along the sorted savings pairs.
+
+    Routes are tracked with a disjoint-set forest (path compression, union by
+    size) whose roots hold the route's head, tail and load, and every customer
+    keeps its two route neighbours (-1 meaning the depot). Each merge is
+    therefore an O(1) endpoint and capacity test plus an O(1) relink, and all
+    four head/tail orientations of the pair are accepted. Plain lists are used
+    for the state because they index faster than NumPy scalars in this loop.
+    With a SolverStats, the pairs scanned and the merges accepted or rejected
+    by capacity are counted.
+    """
+    m = len(demands)
+    parent = list(range(m))
+    size = [1] * m
+    head = list(range(m))
+    tail = list(range(m))
+    load = list(demands)
+    label = list(range(m))  # Route key, used to emit routes in a stable order
+    link_a = [-1] * m
+    link_b = [-1] * m
+    interior = [False] * m
+    routes_left = m
+    scanned = 0
+    rejected = 0
+
+    def find(node):
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    for scanned, (i, j) in enumerate(zip(first.tolist(), second.tolist()), start=1):
+        if routes_left == 1:
+            scanned -= 1
+            break
+        # Only route endpoints (customers next to the depot) can be linked
+        if interior[i] or interior[j]:
+            continue
+        route_i = find(i)
+        route_j = find(j)
+        if route_i == route_j:
+            continue
+        if load[route_i] + load[route_j] > max_capacity:
+            rejected += 1
+            continue
+
+        if tail[route_i] == i and head[route_j] == j:
+            new_head, new_tail, keep = head[route_i], tail[route_j], route_i
+        elif tail[route_j] == j and head[route_i] == i:
+            new_head, new_tail, keep = head[route_j], tail[route_i], route_j
+        elif tail[route_i] == i:  # Tail to tail: route_j is walked backwards
+            new_head, new_tail, keep = head[route_i], head[route_j], route_i
+        else:  # Head to head: route_j is walked backwards in front of route_i
+            new_head, new_tail, keep = tail[route_j], tail[route_i], route_j
+
+        for node, other in ((i, j), (j, i)):
+            if link_a[node] == -1:
+                link_a[node] = other
+            else:
+                link_b[node] = other
+                interior[node] = True
+
+        root, child = (route_i, route_j) if size[route_i] >= size[route_j] else (route_j, route_i)
+        parent[child] = root
+        size[root] += size[child]
+        load[root] = load[route_i] + load[route_j]
+        label[root] = label[keep]
+        head[root] = new_head
+        tail[root] = new_tail
+        routes_left -= 1
+
+    routes = _walk_routes(parent, head, label, link_a, link_b)
+
+    if stats is not None:
+        stats.count("pairs_scanned", scanned)
+        stats.count("merges_accepted", m - routes_left)
+        stats.count("merges_rejected_capacity", rejected)
+    return routes
+
+def clark_wright(distance_matrix, demands, max_capacity, neighbors=None, savings_params=None, stats=None):
     """
     Implement the Clark-Wright Savings Algorithm to calculate routes.
+
+    Pass `neighbors` to run in granular mode, which keeps only that many best
+    savings per customer: smaller values use less memory at some cost in
+    route quality. `savings_params` is a dict of lam/mu/nu for the
+    parameterized savings (see savings_formula and sweep.sweep_clark_wright).
+    A SolverStats passed as `stats` receives the "savings" and "merge" phase
+    times and the merge counters.
     """
-    if not demands:
+    if len(demands) == 0:
         return []
-    
-    savings = calculate_savings(distance_matrix)
+
+    params = dict(savings_params or {})
+    with timed(stats, "savings"):
+        if neighbors is None:
+            first, second, _ = calculate_savings(distance_matrix, demands=demands, **params)
+        else:
+            first, second, _ = calculate_granular_savings(distance_matrix, neighbors, demands=demands, **params)
+    if stats is not None:
+        stats.count("savings_evaluated", len(first))
     n = len(distance_matrix)
-    routes = {i: [i] for i in range(n - 1)}  # Exclude depot from individual routes
-    route_map = {i: i for i in range(n - 1)}
-    capacities = {i: demands[i] for i in range(n - 1)}
-
-    for i, j, saving in savings:
-        route_i = route_map[i]
-        route_j = route_map[j]
-
-        if route_i != route_j:
-            if (capacities[route_i] + capacities[route_j]) <= max_capacity:
-                if routes[route_i][-1] == i and routes[route_j][0] == j:
-                    routes[route_i].extend(routes[route_j])
-                    capacities[route_i] += capacities[route_j]
-                    for node in routes[route_j]:
-                        route_map[node] = route_i
-                    del routes[route_j]
-                elif routes[route_j][-1] == j and routes[route_i][0] == i:
-                    routes[route_j].extend(routes[route_i])
-                    capacities[route_j] += capacities[route_i]
-                    for node in routes[route_i]:
-                        route_map[node] = route_j
-                    del routes[route_i]
-
-    return list(routes.values())
+    with timed(stats, "merge"):
+        return merge_routes(first, second, list(demands[:n - 1]), max_capacity, stats)
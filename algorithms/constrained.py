@@ -0,0 +1,269 @@
+import numpy as np
+from algorithms.clark_wright import _walk_routes, calculate_granular_savings, calculate_savings
+from algorithms.stats import timed
+
+INF = float('inf')
+
+def _join(first, travel, second):
+    """
+    Concatenate two feasible route segments summarised as (duration, earliest, latest).
+
+    `duration` is the shortest time from starting the first node's service
+    to finishing the last one (travel, service and waiting), and
+    [earliest, latest] is the window of start times that achieve it, as in
+    Vidal et al.'s segment concatenation. Returns the summary of the joined
+    segment, or None when the second segment would be reached too late;
+    None inputs (segments that are infeasible in that direction) give None.
+    """
+    if first is None or second is None:
+        return None
+    duration_1, earliest_1, latest_1 = first
+    duration_2, earliest_2, latest_2 = second
+    delta = duration_1 + travel
+    if earliest_1 + delta > latest_2:
+        return None
+    wait = max(earliest_2 - delta - latest_1, 0.0)
+    return (
+        duration_1 + duration_2 + travel + wait,
+        max(earliest_2 - delta, earliest_1) - wait,
+        min(latest_2 - delta, latest_1),
+    )
+
+def _windows(time_windows, n):
+    """
+    Return per-node (earliest, latest) lists; None means always open.
+    """
+    if time_windows is None:
+        return [0.0] * n, [INF] * n
+    windows = np.asarray(time_windows, dtype=np.float64)
+    if windows.shape != (n, 2):
+        raise ValueError(f"Time windows must have shape ({n}, 2), one row per node with the depot last.")
+    if np.any(windows[:, 0] > windows[:, 1]):
+        raise ValueError("Every time window must open before it closes.")
+    return windows[:, 0].tolist(), windows[:, 1].tolist()
+
+def route_timing(route, travel_times, time_windows=None, service_times=None):
+    """
+    Timing summary of one depot -> route -> depot tour.
+
+    Returns (duration, earliest departure, latest departure) for the
+    shortest-duration schedule, or None when a time window cannot be met.
+    The depot is the last node; waiting at a customer before its window
+    opens counts towards the duration.
+    """
+    t = np.asarray(travel_times, dtype=np.float64)
+    n = len(t)
+    depot = n - 1
+    earliest, latest = _windows(time_windows, n)
+    service = [0.0] * n if service_times is None else np.asarray(service_times, dtype=np.float64).tolist()
+
+    summary = (0.0, earliest[depot], latest[depot])
+    previous = depot
+    for node in list(route) + [depot]:
+        summary = _join(summary, t[previous, node], (service[node] if node != depot else 0.0, earliest[node], latest[node]))
+        if summary is None:
+            return None
+        previous = node
+    return summary
+
+def assign_vehicles(loads, fleet):
+    """
+    Give each route the smallest vehicle type that fits its load.
+
+    `fleet` is a list of {"name", "capacity", "count"} dicts; a missing or
+    None count means unlimited vehicles of that type. Routes are matched to
+    the smallest adequate type with one searchsorted; types that run out
+    pass their largest loads up to the next larger type, one vectorized
+    step per type. Returns an array of indices into `fleet`, -1 for routes
+    left without a vehicle.
+    """
+    loads = np.asarray(loads, dtype=np.float64)
+    capacities = np.array([vehicle["capacity"] for vehicle in fleet], dtype=np.float64)
+    counts = np.array([
+        np.inf if vehicle.get("count") is None else vehicle["count"] for vehicle in fleet
+    ], dtype=np.float64)
+    order = np.argsort(capacities, kind="stable")
+
+    # Position of the smallest adequate type in capacity order (len(fleet) = none fits)
+    position = np.searchsorted(capacities[order], loads, side="left")
+    for rank in range(len(fleet)):
+        assigned = np.flatnonzero(position == rank)
+        excess = len(assigned) - counts[order[rank]]
+        if excess > 0:
+            bumped = assigned[np.argsort(-loads[assigned], kind="stable")[:int(excess)]]
+            position[bumped] = rank + 1
+
+    vehicles = np.full(len(loads), -1, dtype=np.int64)
+    served = position < len(fleet)
+    vehicles[served] = order[position[served]]
+    return vehicles
+
+def merge_routes_constrained(first, second, demands, max_capacity, travel_times,
+                             time_windows=None, service_times=None, max_duration=None, stats=None):
+    """
+    Merge routes like merge_routes, also enforcing time windows and a maximum route duration.
+
+    Each route keeps its load and the (duration, earliest, latest) summary
+    of its customers in both directions, so testing a merge in any of the
+    four orientations, and its reverse, is a constant number of _join
+    calls: no route is ever walked. The depot (last node) window bounds the
+    departure and return times. Raises ValueError when a customer cannot be
+    served even on its own route.
+    """
+    t = np.asarray(travel_times, dtype=np.float64)
+    n = len(t)
+    depot = n - 1
+    m = len(demands)
+    earliest, latest = _windows(time_windows, n)
+    service = [0.0] * n if service_times is None else np.asarray(service_times, dtype=np.float64).tolist()
+    from_depot = t[depot, :m].tolist()
+    to_depot = t[:m, depot].tolist()
+    travel = t.item
+    limit = INF if max_duration is None else float(max_duration)
+    depot_segment = (0.0, earliest[depot], latest[depot])
+
+    def closed(segment, head_node, tail_node):
+        """
+        Duration of depot -> segment -> depot, infinite if a window is missed.
+        """
+        tour = _join(depot_segment, from_depot[head_node], segment)
+        if tour is not None:
+            tour = _join(tour, to_depot[tail_node], depot_segment)
+        return INF if tour is None else tour[0]
+
+    forward = [(service[node], earliest[node], latest[node]) for node in range(m)]
+    backward = list(forward)
+    alone = [closed(forward[node], node, node) for node in range(m)]
+    unserved = [
+        node for node in range(m)
+        if demands[node] > max_capacity or alone[node] == INF or alone[node] > limit
+    ]
+    if unserved:
+        raise ValueError(f"{len(unserved)} customers cannot be served on their own route, e.g. node {unserved[0]}.")
+
+    parent = list(range(m))
+    size = [1] * m
+    head = list(range(m))
+    tail = list(range(m))
+    load = list(demands)
+    label = list(range(m))
+    link_a = [-1] * m
+    link_b = [-1] * m
+    interior = [False] * m
+    routes_left = m
+    rejected_capacity = rejected_window = rejected_duration = 0
+
+    def find(node):
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    for i, j in zip(first.tolist(), second.tolist()):
+        if routes_left == 1:
+            break
+        if interior[i] or interior[j]:
+            continue
+        route_i = find(i)
+        route_j = find(j)
+        if route_i == route_j:
+            continue
+        if load[route_i] + load[route_j] > max_capacity:
+            rejected_capacity += 1
+            continue
+
+        # Merged route in the orientation of merge_routes, as (segment, reversed segment, head, tail, keep)
+        fwd_i, bwd_i, fwd_j, bwd_j = forward[route_i], backward[route_i], forward[route_j], backward[route_j]
+        if tail[route_i] == i and head[route_j] == j:
+            segment = _join(fwd_i, travel(i, j), fwd_j)
+            reverse = _join(bwd_j, travel(j, i), bwd_i)
+            new_head, new_tail, keep = head[route_i], tail[route_j], route_i
+        elif tail[route_j] == j and head[route_i] == i:
+            segment = _join(fwd_j, travel(j, i), fwd_i)
+            reverse = _join(bwd_i, travel(i, j), bwd_j)
+            new_head, new_tail, keep = head[route_j], tail[route_i], route_j
+        elif tail[route_i] == i:
+            segment = _join(fwd_i, travel(i, j), bwd_j)
+            reverse = _join(fwd_j, travel(j, i), bwd_i)
+            new_head, new_tail, keep = head[route_i], head[route_j], route_i
+        else:
+            segment = _join(bwd_j, travel(j, i), fwd_i)
+            reverse = _join(bwd_i, travel(i, j), fwd_j)
+            new_head, new_tail, keep = tail[route_j], tail[route_i], route_j
+
+        # Keep the orientation of merge_routes unless only the reversed route can be driven
+        duration = closed(segment, new_head, new_tail)
+        if duration == INF or duration > limit:
+            duration_reverse = closed(reverse, new_tail, new_head)
+            if duration_reverse == INF or duration_reverse > limit:
+                if duration == INF and duration_reverse == INF:
+                    rejected_window += 1
+                else:
+                    rejected_duration += 1
+                continue
+            segment, reverse, new_head, new_tail = reverse, segment, new_tail, new_head
+
+        for node, other in ((i, j), (j, i)):
+            if link_a[node] == -1:
+                link_a[node] = other
+            else:
+                link_b[node] = other
+                interior[node] = True
+
+        root, child = (route_i, route_j) if size[route_i] >= size[route_j] else (route_j, route_i)
+        parent[child] = root
+        size[root] += size[child]
+        load[root] = load[route_i] + load[route_j]
+        label[root] = label[keep]
+        head[root] = new_head
+        tail[root] = new_tail
+        forward[root] = segment
+        backward[root] = reverse
+        routes_left -= 1
+
+    if stats is not None:
+        stats.count("merges_accepted", m - routes_left)
+        stats.count("merges_rejected_capacity", rejected_capacity)
+        stats.count("merges_rejected_time_window", rejected_window)
+        stats.count("merges_rejected_duration", rejected_duration)
+    return _walk_routes(parent, head, label, link_a, link_b)
+
+def constrained_clark_wright(distance_matrix, demands, fleet, travel_times=None, time_windows=None,
+                             service_times=None, max_duration=None, neighbors=None, savings_params=None, stats=None):
+    """
+    Clark-Wright with a heterogeneous fleet, time windows and a maximum route duration.
+
+    Merges are limited by the largest vehicle capacity, the customers' time
+    windows and `max_duration`; `travel_times` default to the distances.
+    Vehicle types are assigned after merging with assign_vehicles. Returns
+    (routes, vehicles) where vehicles[k] indexes `fleet` (-1: no vehicle left).
+    """
+    if len(demands) == 0:
+        return [], np.empty(0, dtype=np.int64)
+    available = [vehicle["capacity"] for vehicle in fleet if vehicle.get("count") is None or vehicle["count"] > 0]
+    if not available:
+        raise ValueError("The fleet needs at least one vehicle type.")
+    n = len(distance_matrix)
+    customer_demands = list(np.asarray(demands, dtype=np.float64)[:n - 1].tolist())
+    max_capacity = max(available)
+
+    params = dict(savings_params or {})
+    with timed(stats, "savings"):
+        if neighbors is None:
+            first, second, _ = calculate_savings(distance_matrix, demands=demands, **params)
+        else:
+            first, second, _ = calculate_granular_savings(distance_matrix, neighbors, demands=demands, **params)
+    if stats is not None:
+        stats.count("savings_evaluated", len(first))
+    with timed(stats, "merge"):
+        routes = merge_routes_constrained(
+            first, second, customer_demands, max_capacity,
+            distance_matrix if travel_times is None else travel_times,
+            time_windows, service_times, max_duration, stats,
+        )
+    with timed(stats, "vehicle assignment"):
+        loads = np.array([sum(customer_demands[node] for node in route) for route in routes], dtype=np.float64)
+        vehicles = assign_vehicles(loads, fleet)
+    return routes, vehicles
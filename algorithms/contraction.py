@@ -0,0 +1,282 @@
+import heapq
+import random
+import numpy as np
+from algorithms.dijkstra import csr_dijkstra
+from algorithms.graph import CSRGraph
+
+# Witness searches are local: they give up after this many settled nodes and
+# may then add a shortcut that is not strictly needed, which is always safe.
+WITNESS_SETTLE_LIMIT = 200
+
+def _csr_arrays(rows, n):
+    """
+    Pack per-node lists of (neighbor, weight, middle) into CSR arrays.
+    """
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in rows], out=indptr[1:])
+    edges = [edge for row in rows for edge in row]
+    indices = np.array([edge[0] for edge in edges], dtype=np.int32)
+    weights = np.array([edge[1] for edge in edges], dtype=np.float64)
+    middles = np.array([edge[2] for edge in edges], dtype=np.int32)
+    return indptr, indices, weights, middles
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy for fast repeated shortest-path queries on a static graph.
+
+    Nodes are contracted one at a time in order of importance (edge
+    difference plus contracted neighbours, updated lazily). Shortcut edges
+    keep the distances between the remaining nodes intact. A query is a
+    bidirectional search that only follows edges towards higher-ranked
+    nodes, and shortcuts are unpacked into original edges afterwards.
+    """
+
+    ARRAYS = (
+        "rank",
+        "up_indptr", "up_indices", "up_weights", "up_middles",
+        "down_indptr", "down_indices", "down_weights", "down_middles",
+    )
+
+    def __init__(self, names, rank, up, down):
+        self.names = list(names)
+        self.index = {name: node for node, name in enumerate(self.names)}
+        self.rank = np.asarray(rank, dtype=np.int32)
+        # up: edges v -> w with rank[w] > rank[v]; down: original edges u -> v
+        # with rank[u] > rank[v], stored reversed as v -> u for the backward search
+        self.up_indptr, self.up_indices, self.up_weights, self.up_middles = up
+        self.down_indptr, self.down_indices, self.down_weights, self.down_middles = down
+
+    @property
+    def num_shortcuts(self):
+        return int(np.count_nonzero(self.up_middles >= 0) + np.count_nonzero(self.down_middles >= 0))
+
+    @classmethod
+    def build(cls, graph):
+        """
+        Preprocess a dict-of-dicts graph (the JSON format of the Dijkstra page) or a CSRGraph.
+        """
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_dict(graph)
+        n = len(graph)
+
+        # Remaining (uncontracted) graph: {neighbor: (weight, middle)} per node
+        out_edges = [{} for _ in range(n)]
+        in_edges = [{} for _ in range(n)]
+        for u in range(n):
+            neighbors, weights = graph.neighbors(u)
+            for v, weight in zip(neighbors.tolist(), weights.tolist()):
+                if v != u and weight < out_edges[u].get(v, (float('inf'),))[0]:
+                    out_edges[u][v] = (weight, -1)
+                    in_edges[v][u] = (weight, -1)
+
+        contracted = [False] * n
+        contracted_neighbors = [0] * n
+
+        def witness_distances(source, excluded, limit):
+            distances = {source: 0.0}
+            queue = [(0.0, source)]
+            settled = 0
+            while queue and settled < WITNESS_SETTLE_LIMIT:
+                distance, node = heapq.heappop(queue)
+                if distance > distances[node]:
+                    continue
+                if distance > limit:
+                    break
+                settled += 1
+                for neighbor, (weight, _) in out_edges[node].items():
+                    if neighbor == excluded:
+                        continue
+                    new_distance = distance + weight
+                    if new_distance < distances.get(neighbor, float('inf')):
+                        distances[neighbor] = new_distance
+                        heapq.heappush(queue, (new_distance, neighbor))
+            return distances
+
+        def shortcuts(node):
+            needed = []
+            for u, (weight_in, _) in in_edges[node].items():
+                targets = [(w, weight_in + weight_out) for w, (weight_out, _) in out_edges[node].items() if w != u]
+                if not targets:
+                    continue
+                distances = witness_distances(u, node, max(length for _, length in targets))
+                needed.extend(
+                    (u, w, length) for w, length in targets
+                    if distances.get(w, float('inf')) > length
+                )
+            return needed
+
+        def priority(node):
+            edge_difference = len(shortcuts(node)) - len(in_edges[node]) - len(out_edges[node])
+            return 2 * edge_difference + contracted_neighbors[node]
+
+        queue = [(priority(node), node) for node in range(n)]
+        heapq.heapify(queue)
+        rank = np.empty(n, dtype=np.int32)
+        up_rows = [[] for _ in range(n)]
+        down_rows = [[] for _ in range(n)]
+        order = 0
+
+        while queue:
+            _, node = heapq.heappop(queue)
+            if contracted[node]:
+                continue
+            # Lazy update: re-queue the node if it is no longer the cheapest
+            current = priority(node)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, node))
+                continue
+
+            added = shortcuts(node)
+            rank[node] = order
+            order += 1
+            contracted[node] = True
+            up_rows[node] = [(w, weight, middle) for w, (weight, middle) in out_edges[node].items()]
+            down_rows[node] = [(u, weight, middle) for u, (weight, middle) in in_edges[node].items()]
+
+            for w in out_edges[node]:
+                del in_edges[w][node]
+                contracted_neighbors[w] += 1
+            for u in in_edges[node]:
+                del out_edges[u][node]
+                contracted_neighbors[u] += 1
+            out_edges[node] = {}
+            in_edges[node] = {}
+            for u, w, length in added:
+                if length < out_edges[u].get(w, (float('inf'),))[0]:
+                    out_edges[u][w] = (length, node)
+                    in_edges[w][u] = (length, node)
+
+        return cls(graph.names, rank, _csr_arrays(up_rows, n), _csr_arrays(down_rows, n))
+
+    def save(self, path):
+        """
+        Write the hierarchy to an .npz file.
+
+        Node names are stored as strings, so load() returns string names.
+        """
+        arrays = {name: getattr(self, name) for name in self.ARRAYS}
+        np.savez(path, names=np.array([str(name) for name in self.names]), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a hierarchy written by save().
+        """
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in cls.ARRAYS}
+            names = data["names"].tolist()
+        up = tuple(arrays[f"up_{part}"] for part in ("indptr", "indices", "weights", "middles"))
+        down = tuple(arrays[f"down_{part}"] for part in ("indptr", "indices", "weights", "middles"))
+        return cls(names, arrays["rank"], up, down)
+
+    def _middle(self, u, w):
+        """
+        Return the middle node of the hierarchy edge u -> w (-1 for an original edge).
+        """
+        if self.rank[u] < self.rank[w]:
+            indptr, indices, middles, row, column = self.up_indptr, self.up_indices, self.up_middles, u, w
+        else:
+            indptr, indices, middles, row, column = self.down_indptr, self.down_indices, self.down_middles, w, u
+        start, stop = indptr[row], indptr[row + 1]
+        position = start + int(np.flatnonzero(indices[start:stop] == column)[0])
+        return int(middles[position])
+
+    def _unpack(self, u, w):
+        """
+        Expand the hierarchy edge u -> w into the node ids of the original path, excluding u.
+        """
+        path = []
+        stack = [(u, w)]
+        while stack:
+            a, b = stack.pop()
+            middle = self._middle(a, b)
+            if middle == -1:
+                path.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+        return path
+
+    def query_ids(self, source, target):
+        """
+        Calculate the shortest path between node ids. Returns (distance, path of ids).
+        """
+        if source == target:
+            return 0.0, [source]
+
+        sides = (
+            (self.up_indptr, self.up_indices, self.up_weights),
+            (self.down_indptr, self.down_indices, self.down_weights),
+        )
+        distances = ({source: 0.0}, {target: 0.0})
+        predecessors = ({source: -1}, {target: -1})
+        queues = ([(0.0, source)], [(0.0, target)])
+        best, meeting = float('inf'), -1
+
+        while True:
+            active = [side for side in (0, 1) if queues[side] and queues[side][0][0] < best]
+            if not active:
+                break
+            side = min(active, key=lambda s: queues[s][0][0])
+            distance, node = heapq.heappop(queues[side])
+            own, other = distances[side], distances[1 - side]
+            if distance > own[node]:
+                continue
+            if node in other and distance + other[node] < best:
+                best, meeting = distance + other[node], node
+
+            indptr, indices, weights = sides[side]
+            start, stop = indptr[node], indptr[node + 1]
+            for neighbor, weight in zip(indices[start:stop].tolist(), weights[start:stop].tolist()):
+                new_distance = distance + weight
+                if new_distance < own.get(neighbor, float('inf')):
+                    own[neighbor] = new_distance
+                    predecessors[side][neighbor] = node
+                    heapq.heappush(queues[side], (new_distance, neighbor))
+
+        if meeting == -1:
+            return float('inf'), []
+
+        upward = []
+        node = meeting
+        while node != -1:
+            upward.append(node)
+            node = predecessors[0][node]
+        upward.reverse()
+        downward = []
+        node = meeting
+        while predecessors[1][node] != -1:
+            downward.append((node, predecessors[1][node]))
+            node = predecessors[1][node]
+
+        path = [source]
+        for u, w in zip(upward, upward[1:]):
+            path.extend(self._unpack(u, w))
+        for u, w in downward:
+            path.extend(self._unpack(u, w))
+        return best, path
+
+    def query(self, start_node, end_node):
+        """
+        Calculate the shortest path between start and end nodes, like dijkstra.
+        """
+        distance, path = self.query_ids(self.index[start_node], self.index[end_node])
+        return distance, [self.names[node] for node in path]
+
+    def validate(self, graph, queries=100, seed=0, tolerance=1e-9):
+        """
+        Compare random queries against plain Dijkstra on `graph`.
+
+        Returns the list of (start, end, expected, got) mismatches, empty when valid.
+        """
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_dict(graph)
+        rng = random.Random(seed)
+        mismatches = []
+        for _ in range(queries):
+            source, target = rng.randrange(len(graph)), rng.randrange(len(graph))
+            expected, _ = csr_dijkstra(graph, source, target)
+            got, _ = self.query(graph.names[source], graph.names[target])
+            if not (expected == got or abs(expected - got) <= tolerance * max(1.0, abs(expected))):
+                mismatches.append((graph.names[source], graph.names[target], expected, got))
+        return mismatches
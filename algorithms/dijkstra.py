@@ -1,42 +1,333 @@
-import streamlit as st
 import heapq
+from array import array
+import numpy as np
+from algorithms.graph import CSRGraph
+from algorithms.stats import timed
 
-def dijkstra(graph, start_node, end_node):
+def _search(graph, source, targets=None, stats=None):
     """
-    Calculate the shortest path between start and end nodes.
+    Grow a shortest-path tree from node id `source` on a CSRGraph.
+
+    The search stops as soon as every id in `targets` is settled, or runs to
+    exhaustion when `targets` is None. Returns the typed distance and
+    predecessor arrays, indexed by node id (-1 marks no predecessor).
+    With a SolverStats, nodes settled and heap pushes and pops are counted.
     """
-    distances = {node: float('inf') for node in graph}
-    distances[start_node] = 0
-    priority_queue = [(0, start_node)]
-    path = {node: None for node in graph}
+    n = len(graph)
+    distances = array('d', [float('inf')]) * n
+    predecessors = array('q', [-1]) * n
+    indptr = memoryview(graph.indptr)
+    indices = memoryview(graph.indices)
+    weights = memoryview(graph.weights)
+    remaining = None if targets is None else set(targets)
+
+    distances[source] = 0
+    priority_queue = [(0.0, source)]
+    # Only pops and stale entries are tallied; pushes follow from the queue size
+    pops = 0
+    stale = 0
 
     while priority_queue:
         current_distance, current_node = heapq.heappop(priority_queue)
-
-        # Stop searching if we reach the end_node
-        if current_node == end_node:
-            break
+        pops += 1
 
         # Skip processing if this distance is not optimal
         if current_distance > distances[current_node]:
+            stale += 1
             continue
 
-        for neighbor, weight in graph[current_node].items():
+        # Stop searching once every target is settled
+        if remaining is not None:
+            remaining.discard(current_node)
+            if not remaining:
+                break
+
+        start, stop = indptr[current_node], indptr[current_node + 1]
+        for neighbor, weight in zip(indices[start:stop], weights[start:stop]):
             new_distance = current_distance + weight
             if new_distance < distances[neighbor]:
                 distances[neighbor] = new_distance
-                path[neighbor] = current_node
+                predecessors[neighbor] = current_node
                 heapq.heappush(priority_queue, (new_distance, neighbor))
 
-    # Backtrack to find the path, if reachable
-    shortest_path = []
-    current = end_node
-    while current and distances[current] != float('inf'):
-        shortest_path.insert(0, current)
-        current = path[current]
+    if stats is not None:
+        stats.count("nodes_settled", pops - stale)
+        stats.count("heap_pops", pops)
+        stats.count("heap_pushes", pops + len(priority_queue) - 1)
+    return distances, predecessors
+
+def _backtrack(predecessors, target):
+    """
+    Follow predecessor ids back from `target` and return the path of ids.
+    """
+    path = []
+    current = target
+    while current != -1:
+        path.append(current)
+        current = predecessors[current]
+    path.reverse()
+    return path
+
+def csr_dijkstra(graph, source, target, stats=None):
+    """
+    Calculate the shortest path between node ids on a CSRGraph.
+
+    Distances and predecessors live in preallocated typed arrays indexed by
+    node id. Returns (distance, path as a list of node ids).
+    """
+    distances, predecessors = _search(graph, source, (target,), stats)
+
+    # If the target is unreachable, return an empty path
+    if distances[target] == float('inf'):
+        return float('inf'), []
+    return distances[target], _backtrack(predecessors, target)
+
+def csr_bidirectional_dijkstra(graph, source, target):
+    """
+    Calculate the shortest path between node ids by searching from both ends.
+
+    The forward search runs on `graph` and the backward search on its reversed
+    graph, always expanding the side with the smaller tentative distance. The
+    search stops once the two frontiers together cannot beat the best meeting
+    point found, which settles far fewer nodes than a one-sided search on
+    long trips. Returns (distance, path as a list of node ids).
+    """
+    if source == target:
+        return 0.0, [source]
+
+    n = len(graph)
+    sides = (graph, graph.reversed_graph)
+    csr = [(memoryview(g.indptr), memoryview(g.indices), memoryview(g.weights)) for g in sides]
+    distances = [array('d', [float('inf')]) * n for _ in sides]
+    predecessors = [array('q', [-1]) * n for _ in sides]
+    queues = [[(0.0, source)], [(0.0, target)]]
+    distances[0][source] = 0
+    distances[1][target] = 0
+    best, meeting = float('inf'), -1
+
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        current_distance, current_node = heapq.heappop(queues[side])
+        own, other = distances[side], distances[1 - side]
+        if current_distance > own[current_node]:
+            continue
+
+        indptr, indices, weights = csr[side]
+        start, stop = indptr[current_node], indptr[current_node + 1]
+        for neighbor, weight in zip(indices[start:stop], weights[start:stop]):
+            new_distance = current_distance + weight
+            if new_distance < own[neighbor]:
+                own[neighbor] = new_distance
+                predecessors[side][neighbor] = current_node
+                heapq.heappush(queues[side], (new_distance, neighbor))
+            if own[neighbor] + other[neighbor] < best:
+                best, meeting = own[neighbor] + other[neighbor], neighbor
 
-    # If the end_node is unreachable, return an empty path
-    if distances[end_node] == float('inf'):
+    if meeting == -1:
         return float('inf'), []
+    # The backward predecessors point towards the target
+    path = _backtrack(predecessors[0], meeting)
+    current = predecessors[1][meeting]
+    while current != -1:
+        path.append(current)
+        current = predecessors[1][current]
+    return best, path
+
+def csr_astar(graph, source, target, heuristic):
+    """
+    Calculate the shortest path between node ids with A* search.
+
+    `heuristic(target)` must return an array of n lower bounds on the
+    distance from every node id to `target`; see euclidean_heuristic,
+    haversine_heuristic and LandmarkHeuristic. With an admissible heuristic
+    the distance equals Dijkstra's. Returns (distance, path of node ids).
+    """
+    n = len(graph)
+    estimates = memoryview(np.ascontiguousarray(heuristic(target), dtype=np.float64))
+    distances = array('d', [float('inf')]) * n
+    predecessors = array('q', [-1]) * n
+    indptr = memoryview(graph.indptr)
+    indices = memoryview(graph.indices)
+    weights = memoryview(graph.weights)
+
+    distances[source] = 0
+    priority_queue = [(estimates[source], 0.0, source)]
+
+    while priority_queue:
+        _, current_distance, current_node = heapq.heappop(priority_queue)
+        if current_node == target:
+            break
+        if current_distance > distances[current_node]:
+            continue
+
+        start, stop = indptr[current_node], indptr[current_node + 1]
+        for neighbor, weight in zip(indices[start:stop], weights[start:stop]):
+            new_distance = current_distance + weight
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                predecessors[neighbor] = current_node
+                heapq.heappush(priority_queue, (new_distance + estimates[neighbor], new_distance, neighbor))
+
+    if distances[target] == float('inf'):
+        return float('inf'), []
+    return distances[target], _backtrack(predecessors, target)
+
+def _coordinate_array(graph, coordinates):
+    return np.array([coordinates[name] for name in graph.names], dtype=np.float64)
 
-    return distances[end_node], shortest_path
\ No newline at end of file
+def euclidean_heuristic(graph, coordinates, scale=1.0):
+    """
+    A* heuristic from planar node coordinates {name: (x, y)}.
+
+    `scale` converts coordinate units into edge-weight units; it must not
+    overestimate (e.g. use the minimum weight per unit of distance).
+    """
+    points = _coordinate_array(graph, coordinates)
+
+    def heuristic(target):
+        return scale * np.hypot(*(points - points[target]).T)
+    return heuristic
+
+def haversine_heuristic(graph, coordinates, radius=6371.0):
+    """
+    A* heuristic from node coordinates {name: (latitude, longitude)} in degrees.
+
+    Returns great-circle distances in the units of `radius` (kilometres by
+    default), which bound road distances from below.
+    """
+    points = np.radians(_coordinate_array(graph, coordinates))
+
+    def heuristic(target):
+        lat, lon = points[:, 0], points[:, 1]
+        lat_t, lon_t = points[target]
+        a = np.sin((lat - lat_t) / 2) ** 2 + np.cos(lat) * np.cos(lat_t) * np.sin((lon - lon_t) / 2) ** 2
+        return 2 * radius * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+    return heuristic
+
+class LandmarkHeuristic:
+    """
+    ALT heuristic: lower bounds from precomputed landmark distances.
+
+    For every landmark L the distances from L and to L are stored, and the
+    triangle inequality gives d(v, t) >= max(d(L, t) - d(L, v), d(v, L) - d(t, L)).
+    Landmarks are picked by farthest-point selection unless given as node ids.
+    """
+
+    def __init__(self, graph, count=8, landmarks=None, seed=0):
+        if landmarks is None:
+            landmarks = self.select_landmarks(graph, count, seed)
+        self.landmarks = list(landmarks)
+        self.from_landmark = np.array([np.frombuffer(_search(graph, l)[0]) for l in self.landmarks])
+        self.to_landmark = np.array([np.frombuffer(_search(graph.reversed_graph, l)[0]) for l in self.landmarks])
+
+    @staticmethod
+    def select_landmarks(graph, count, seed=0):
+        """
+        Pick up to `count` node ids, each the farthest reachable from those chosen so far.
+        """
+        rng = np.random.default_rng(seed)
+        landmarks = [int(rng.integers(len(graph)))]
+        nearest = np.frombuffer(_search(graph, landmarks[0])[0]).copy()
+        while len(landmarks) < min(count, len(graph)):
+            candidates = np.where(np.isfinite(nearest), nearest, -1.0)
+            candidates[landmarks] = -1.0
+            landmark = int(np.argmax(candidates))
+            if candidates[landmark] <= 0:
+                break
+            landmarks.append(landmark)
+            nearest = np.minimum(nearest, np.frombuffer(_search(graph, landmark)[0]))
+        return landmarks
+
+    def __call__(self, target):
+        with np.errstate(invalid='ignore'):
+            forward = self.from_landmark[:, [target]] - self.from_landmark
+            backward = self.to_landmark - self.to_landmark[:, [target]]
+            bounds = np.fmax(forward, backward).max(axis=0)
+        return np.maximum(np.nan_to_num(bounds, nan=0.0, neginf=0.0), 0.0)
+
+def one_to_many(graph, source, targets=None, return_predecessors=False, stats=None):
+    """
+    Calculate distances from one source to many targets with a single search.
+
+    `targets` defaults to every node. Returns a float array of distances in
+    the order of `targets` (inf when unreachable) and, if requested, the
+    predecessor id array of the whole tree (see CSRGraph.names for ids).
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_dict(graph)
+    target_ids = None if targets is None else [graph.index[node] for node in targets]
+
+    distances, predecessors = _search(graph, graph.index[source], target_ids, stats)
+    all_distances = np.frombuffer(distances, dtype=np.float64)
+    result = all_distances.copy() if target_ids is None else all_distances[target_ids]
+    if return_predecessors:
+        return result, np.frombuffer(predecessors, dtype=np.int64)
+    return result
+
+def shortest_path_matrix(graph, sources, targets=None, return_predecessors=False):
+    """
+    Calculate the N x M matrix of shortest distances from sources to targets.
+
+    Each source costs one search that stops once all targets are settled.
+    With the depot as the last entry of `sources` and `targets` left as None,
+    the result is a distance matrix that clark_wright consumes directly.
+    If requested, also returns the N x len(graph) predecessor id matrix.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_dict(graph)
+    if targets is None:
+        targets = sources
+    target_ids = np.array([graph.index[node] for node in targets], dtype=np.int64)
+    search_targets = set(target_ids.tolist())
+
+    matrix = np.empty((len(sources), len(target_ids)), dtype=np.float64)
+    predecessor_matrix = np.empty((len(sources), len(graph)), dtype=np.int64) if return_predecessors else None
+    for row, source in enumerate(sources):
+        distances, predecessors = _search(graph, graph.index[source], search_targets)
+        matrix[row] = np.frombuffer(distances, dtype=np.float64)[target_ids]
+        if return_predecessors:
+            predecessor_matrix[row] = np.frombuffer(predecessors, dtype=np.int64)
+
+    if return_predecessors:
+        return matrix, predecessor_matrix
+    return matrix
+
+def dijkstra(graph, start_node, end_node, stats=None):
+    """
+    Calculate the shortest path between start and end nodes.
+
+    `graph` is a dict-of-dicts {node: {neighbor: weight}} or a CSRGraph; dict
+    graphs are converted once per call. A SolverStats passed as `stats`
+    receives the "graph conversion" and "search" phases and the search counters.
+    """
+    if not isinstance(graph, CSRGraph):
+        with timed(stats, "graph conversion"):
+            graph = CSRGraph.from_dict(graph)
+
+    with timed(stats, "search"):
+        distance, path = csr_dijkstra(graph, graph.index[start_node], graph.index[end_node], stats)
+    return distance, [graph.names[node] for node in path]
+
+def bidirectional_dijkstra(graph, start_node, end_node):
+    """
+    Calculate the shortest path between start and end nodes searching from both ends.
+
+    Same inputs and result as dijkstra.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_dict(graph)
+
+    distance, path = csr_bidirectional_dijkstra(graph, graph.index[start_node], graph.index[end_node])
+    return distance, [graph.names[node] for node in path]
+
+def astar(graph, start_node, end_node, heuristic):
+    """
+    Calculate the shortest path between start and end nodes with A* search.
+
+    `graph` must be the CSRGraph the heuristic was built for. Same result as
+    dijkstra.
+    """
+    distance, path = csr_astar(graph, graph.index[start_node], graph.index[end_node], heuristic)
+    return distance, [graph.names[node] for node in path]
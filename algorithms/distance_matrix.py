@@ -0,0 +1,80 @@
+import numpy as np
+
+def complete_symmetric_matrix(matrix):
+    """
+    Fill the missing half of a distance matrix from its transpose.
+
+    Missing cells (NaN) take the value of their mirrored cell and a missing
+    diagonal is set to 0. Returns the completed float array together with the
+    (row, column) positions that are still missing afterwards.
+    """
+    values = np.asarray(matrix, dtype=float)
+    if values.ndim != 2 or values.shape[0] != values.shape[1]:
+        raise ValueError(f"The distance matrix must be square, got shape {values.shape}.")
+
+    values = np.where(np.isnan(values), values.T, values)
+
+    # Self-distances must be zero; an empty diagonal is filled in
+    diagonal = values.diagonal()
+    if np.any(diagonal[~np.isnan(diagonal)] != 0):
+        raise ValueError("The diagonal of the distance matrix (self-distances) must be 0.")
+    np.fill_diagonal(values, 0)
+
+    missing = np.argwhere(np.isnan(values))
+    return values, missing
+
+def complete_symmetric_inplace(values, block_size=1024):
+    """
+    Same as complete_symmetric_matrix, but fills `values` in place.
+
+    Rows are processed in blocks, so no full-size temporary is allocated;
+    use it for large float32 arrays. Returns the still-missing positions.
+    """
+    n = len(values)
+    if values.ndim != 2 or values.shape[1] != n:
+        raise ValueError(f"The distance matrix must be square, got shape {values.shape}.")
+
+    for start in range(0, n, block_size):
+        rows = values[start:start + block_size]
+        mask = np.isnan(rows)
+        if mask.any():
+            rows[mask] = values[:, start:start + block_size].T[mask]
+
+    diagonal = values.diagonal()
+    if np.any(diagonal[~np.isnan(diagonal)] != 0):
+        raise ValueError("The diagonal of the distance matrix (self-distances) must be 0.")
+    np.fill_diagonal(values, 0)
+
+    return missing_cells(values, block_size)
+
+def missing_cells(values, block_size=1024):
+    """
+    Return the (row, column) positions of NaN cells, scanning `values` in row blocks.
+    """
+    missing = [
+        np.argwhere(np.isnan(values[start:start + block_size])) + [start, 0]
+        for start in range(0, len(values), block_size)
+    ]
+    return np.concatenate(missing) if missing else np.empty((0, 2), dtype=np.int64)
+
+def transform_to_complete_matrix(df):
+    """
+    Transform the uploaded matrix into a complete symmetric matrix.
+
+    Returns the completed distance matrix, the demands taken from the last
+    column and a list of (row, column) labels that are still missing.
+    """
+    import pandas as pd
+
+    # Extract the demand column and remove it from the distance matrix
+    demands = df.iloc[:, -1].tolist()
+
+    # Drop columns with missing or unnamed headers
+    df = df.loc[:, ~df.columns.str.contains('^Unnamed', na=False)]
+    df = df.loc[:, ~df.columns.isnull()]
+
+    distance_matrix = df.iloc[:, :-1]
+    values, missing = complete_symmetric_matrix(distance_matrix.to_numpy(dtype=float))
+    missing_labels = [(distance_matrix.index[i], distance_matrix.columns[j]) for i, j in missing]
+
+    return pd.DataFrame(values, index=distance_matrix.index, columns=distance_matrix.columns), demands, missing_labels
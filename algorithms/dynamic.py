@@ -0,0 +1,171 @@
+import heapq
+
+class DynamicShortestPaths:
+    """
+    Shortest paths from one source, kept up to date while edge weights change.
+
+    Edits go through set_edge, remove_edge or a batched apply. Only the part
+    of the shortest-path tree that an edit can affect is repaired, in the
+    style of Ramalingam and Reps. The subtree under an edge that got longer
+    or was removed is reset and re-attached from its unaffected in-neighbours.
+    Shorter and new edges start a Dijkstra from the improved node. The work
+    is proportional to the nodes whose distance changes, not to the graph.
+    With `undirected=True` every edit applies to both directions, as on the
+    Dijkstra page.
+    """
+
+    def __init__(self, graph, source, undirected=False):
+        self.source = source
+        self.undirected = undirected
+        self.out_edges = {}
+        self.in_edges = {}
+        self.distances = {}
+        self.predecessors = {}
+        self.children = {}
+        for node, neighbors in graph.items():
+            self._add_node(node)
+            for neighbor, weight in neighbors.items():
+                self._add_node(neighbor)
+                self.out_edges[node][neighbor] = weight
+                self.in_edges[neighbor][node] = weight
+        self._add_node(source)
+
+        self.distances[source] = 0
+        # Number of nodes whose distance was recomputed by the last repair
+        self.last_repair_size = self._propagate([(0, source)], {})
+
+    def _add_node(self, node):
+        if node not in self.out_edges:
+            self.out_edges[node] = {}
+            self.in_edges[node] = {}
+            self.distances[node] = float('inf')
+            self.predecessors[node] = None
+            self.children[node] = set()
+
+    def _set_parent(self, node, parent):
+        old = self.predecessors[node]
+        if old is not None:
+            self.children[old].discard(node)
+        self.predecessors[node] = parent
+        if parent is not None:
+            self.children[parent].add(node)
+
+    def _propagate(self, queue, before):
+        """
+        Run Dijkstra from the given (distance, node) entries; returns the settled count.
+
+        The previous distance of every node it lowers is recorded in `before`.
+        """
+        heapq.heapify(queue)
+        settled = 0
+        distances = self.distances
+        while queue:
+            current_distance, current_node = heapq.heappop(queue)
+            if current_distance > distances[current_node]:
+                continue
+            settled += 1
+            for neighbor, weight in self.out_edges[current_node].items():
+                new_distance = current_distance + weight
+                if new_distance < distances[neighbor]:
+                    before.setdefault(neighbor, distances[neighbor])
+                    distances[neighbor] = new_distance
+                    self._set_parent(neighbor, current_node)
+                    heapq.heappush(queue, (new_distance, neighbor))
+        return settled
+
+    def set_edge(self, u, v, weight):
+        """
+        Insert edge u -> v or change its weight, then repair the tree.
+        """
+        return self.apply([(u, v, weight)])
+
+    def remove_edge(self, u, v):
+        """
+        Delete edge u -> v, then repair the tree.
+        """
+        return self.apply([(u, v, None)])
+
+    def apply(self, edits):
+        """
+        Apply a batch of (u, v, weight) edits, where weight None deletes the edge.
+
+        Returns the set of nodes whose distance changed. Only the last edit
+        of each edge counts, so the repair sees the edges' final state.
+        """
+        if self.undirected:
+            edits = [edit for u, v, weight in edits for edit in ((u, v, weight), (v, u, weight))]
+        final = {}
+        for u, v, weight in edits:
+            final.pop((u, v), None)
+            final[(u, v)] = weight
+
+        before = {}
+        roots = []
+        improved = []
+        for (u, v), weight in final.items():
+            self._add_node(u)
+            self._add_node(v)
+            old = self.out_edges[u].get(v)
+            if weight is None:
+                self.out_edges[u].pop(v, None)
+                self.in_edges[v].pop(u, None)
+            else:
+                self.out_edges[u][v] = weight
+                self.in_edges[v][u] = weight
+            if self.predecessors[v] == u and (weight is None or (old is not None and weight > old)):
+                roots.append(v)
+            elif weight is not None:
+                improved.append((u, v, weight))
+
+        # Reset every node below an edge that got longer or disappeared
+        affected = set()
+        stack = [root for root in roots if root != self.source]
+        while stack:
+            node = stack.pop()
+            if node in affected:
+                continue
+            affected.add(node)
+            stack.extend(self.children[node])
+        for node in affected:
+            before.setdefault(node, self.distances[node])
+            self.distances[node] = float('inf')
+            self._set_parent(node, None)
+
+        # Re-attach affected nodes through their best unaffected in-neighbour
+        queue = []
+        for node in affected:
+            best, parent = float('inf'), None
+            for neighbor, weight in self.in_edges[node].items():
+                if neighbor not in affected and self.distances[neighbor] + weight < best:
+                    best, parent = self.distances[neighbor] + weight, neighbor
+            if parent is not None:
+                self.distances[node] = best
+                self._set_parent(node, parent)
+                queue.append((best, node))
+
+        # Edges that got shorter or were added can only improve their head
+        for u, v, weight in improved:
+            if self.distances[u] + weight < self.distances[v]:
+                before.setdefault(v, self.distances[v])
+                self.distances[v] = self.distances[u] + weight
+                self._set_parent(v, u)
+                queue.append((self.distances[v], v))
+
+        self.last_repair_size = len(affected) + self._propagate(queue, before)
+        return {node for node, distance in before.items() if self.distances[node] != distance}
+
+    def distance(self, node):
+        return self.distances[node]
+
+    def path(self, node):
+        """
+        Return the current shortest path from the source to `node` ([] if unreachable).
+        """
+        if self.distances.get(node, float('inf')) == float('inf'):
+            return []
+        path = []
+        while node is not None:
+            path.append(node)
+            node = self.predecessors[node]
+        path.reverse()
+        return path
@@ -0,0 +1,90 @@
+import numpy as np
+from algorithms.clark_wright import granular_savings
+
+METRICS = ("haversine", "euclidean")
+
+# Mean Earth radius in kilometres, the unit of haversine distances
+EARTH_RADIUS = 6371.0
+
+# Coordinate inputs above this many nodes skip the full distance matrix and
+# keep only the savings of each node's COORDINATE_NEIGHBORS nearest candidates
+COORDINATE_MATRIX_LIMIT = 2000
+COORDINATE_NEIGHBORS = 30
+
+def _haversine(lat1, lon1, lat2, lon2, radius=EARTH_RADIUS):
+    """
+    Great-circle distance between points given in radians; broadcasts like NumPy.
+    """
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * radius * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+def _euclidean(x1, y1, x2, y2):
+    return np.hypot(x2 - x1, y2 - y1)
+
+def _prepare(points, metric):
+    """
+    Return the two coordinate columns and the distance kernel for `metric`.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}'. Use one of: {', '.join(METRICS)}.")
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError(f"Coordinates must have shape (n, 2), got {points.shape}.")
+    if metric == "haversine":
+        points = np.radians(points)
+        return points[:, 0], points[:, 1], _haversine
+    return points[:, 0], points[:, 1], _euclidean
+
+def pairwise_distances(points, metric="haversine", block_size=1024, dtype=np.float32):
+    """
+    Compute the full distance matrix of (lat, lon) or (x, y) points.
+
+    Rows are computed in blocks of `block_size` so temporaries stay small and
+    cache friendly, and the result is stored as `dtype` (float32 halves the
+    memory of float64). Haversine distances are in kilometres.
+    """
+    first, second, kernel = _prepare(points, metric)
+    n = len(first)
+    distances = np.empty((n, n), dtype=dtype)
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        distances[start:stop] = kernel(first[start:stop, None], second[start:stop, None], first[None, :], second[None, :])
+    np.fill_diagonal(distances, 0)
+    return distances
+
+def coordinate_savings(points, neighbors, metric="haversine", block_size=256):
+    """
+    Granular Clark-Wright savings straight from coordinates, with the depot last.
+
+    Distances are computed block by block and only the best `neighbors`
+    savings per customer are kept, so the n x n matrix is never stored.
+    Returns (first, second, savings) for clark_wright.merge_routes.
+    """
+    first, second, kernel = _prepare(points, metric)
+    customers = len(first) - 1
+    to_depot = kernel(first[:customers], second[:customers], first[customers], second[customers])
+
+    def distance_rows(start, stop):
+        return kernel(
+            first[start:stop, None], second[start:stop, None],
+            first[None, :customers], second[None, :customers],
+        )
+
+    return granular_savings(to_depot, distance_rows, neighbors, block_size)
+
+def route_lengths(points, routes, metric="haversine"):
+    """
+    Length of each depot -> route -> depot tour, computed from coordinates.
+
+    `routes` are lists of customer indices and the depot is the last point.
+    """
+    first, second, kernel = _prepare(points, metric)
+    depot = len(first) - 1
+    if not routes:
+        return np.empty(0)
+    tours = [np.concatenate(([depot], route, [depot])).astype(np.int64) for route in routes]
+    sequence = np.concatenate(tours)
+    legs = kernel(first[sequence[:-1]], second[sequence[:-1]], first[sequence[1:]], second[sequence[1:]])
+    starts = np.cumsum([0] + [len(tour) for tour in tours[:-1]])
+    # The leg joining two tours runs depot -> depot and adds nothing
+    return np.add.reduceat(legs, starts)
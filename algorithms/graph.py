@@ -0,0 +1,94 @@
+from functools import cached_property
+import numpy as np
+
+class CSRGraph:
+    """
+    Directed weighted graph stored as compressed sparse row (CSR) arrays.
+
+    Node names are mapped to integer ids once; the neighbours of node `u` are
+    indices[indptr[u]:indptr[u + 1]] with matching weights. A 1M-edge graph
+    takes about 12 bytes per edge instead of a dict entry per edge.
+    """
+
+    def __init__(self, names, indptr, indices, weights):
+        self.indptr = np.ascontiguousarray(indptr, dtype=np.int64)
+        self.indices = np.ascontiguousarray(indices, dtype=np.int32)
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+        # Without names the node ids double as names
+        self.names = range(len(self.indptr) - 1) if names is None else list(names)
+
+    @cached_property
+    def index(self):
+        """
+        Map of node name to node id, built on first use.
+        """
+        return {name: node for node, name in enumerate(self.names)}
+
+    @classmethod
+    def from_dict(cls, graph):
+        """
+        Build a CSRGraph from a dict-of-dicts graph {node: {neighbor: weight}}.
+
+        Nodes that only appear as neighbours are included. Ids follow the
+        sorted node names when they are sortable, so ties between equal
+        distances break the same way as with name-keyed heaps.
+        """
+        names = list(dict.fromkeys(
+            [*graph, *(neighbor for neighbors in graph.values() for neighbor in neighbors)]
+        ))
+        try:
+            names.sort()
+        except TypeError:
+            pass
+        index = {name: node for node, name in enumerate(names)}
+
+        degrees = np.fromiter((len(graph.get(name, ())) for name in names), dtype=np.int64, count=len(names))
+        indptr = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        edges = int(indptr[-1])
+        indices = np.fromiter(
+            (index[neighbor] for name in names for neighbor in graph.get(name, ())),
+            dtype=np.int32, count=edges,
+        )
+        weights = np.fromiter(
+            (weight for name in names for weight in graph.get(name, {}).values()),
+            dtype=np.float64, count=edges,
+        )
+        return cls(names, indptr, indices, weights)
+
+    @cached_property
+    def reversed_graph(self):
+        """
+        The graph with every edge reversed (the CSR transpose), built on first use.
+        """
+        n = len(self)
+        sources = np.repeat(np.arange(n, dtype=np.int32), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind="stable")
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=n), out=indptr[1:])
+        names = None if isinstance(self.names, range) else self.names
+        return CSRGraph(names, indptr, sources[order], self.weights[order])
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def num_edges(self):
+        return len(self.indices)
+
+    def neighbors(self, node):
+        """
+        Return the (neighbour ids, weights) arrays of node id `node`.
+        """
+        start, stop = self.indptr[node], self.indptr[node + 1]
+        return self.indices[start:stop], self.weights[start:stop]
+
+    def to_dict(self):
+        """
+        Convert back to the dict-of-dicts format used by the pages.
+        """
+        graph = {}
+        for node, name in enumerate(self.names):
+            neighbors, weights = self.neighbors(node)
+            graph[name] = {self.names[v]: w for v, w in zip(neighbors.tolist(), weights.tolist())}
+        return graph
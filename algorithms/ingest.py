@@ -0,0 +1,190 @@
+import os
+import numpy as np
+from algorithms.distance_matrix import complete_symmetric_inplace, missing_cells
+from algorithms.stats import timed
+
+FORMATS = ("csv", "parquet", "npy", "npz")
+
+# Rows read per chunk for CSV and Parquet input
+CHUNK_ROWS = 1024
+
+def default_names(n):
+    """
+    Node names of the CSV template: Node 1 .. Node n-1 followed by the Depot.
+    """
+    return [f"Node {i}" for i in range(1, n)] + ["Depot"]
+
+def detect_format(source, fmt=None):
+    """
+    Return the input format from `fmt` or from the file name suffix.
+    """
+    if fmt is None:
+        name = getattr(source, "name", source)
+        fmt = os.path.splitext(str(name))[1].lstrip(".").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported distance matrix format '{fmt}'. Use one of: {', '.join(FORMATS)}.")
+    return fmt
+
+def read_distance_matrix(source, fmt=None, dtype=np.float32, chunk_rows=CHUNK_ROWS, stats=None):
+    """
+    Load a distance matrix with demands from a file path or file-like object.
+
+    Supported formats:
+      - csv: the template layout (names, one column per node, Demand last),
+        read in chunks of `chunk_rows` straight into one preallocated array.
+      - parquet: the same layout, read batch by batch through pyarrow.
+      - npy: an (n, n + 1) array whose last column holds the demands. Paths
+        are opened with np.load(mmap_mode='r'), so nothing is copied; the
+        stored dtype is kept and the matrix must already be complete.
+      - npz: `distances` (n, n) or `triu` (packed upper triangle, diagonal
+        included, see write_upper_triangular), plus `demands` and optional
+        `names`.
+
+    Missing CSV/Parquet cells are completed symmetrically in place. Returns
+    (names, distances, demands, missing) where `distances` is the single
+    array the solver should use and `missing` lists still-missing positions.
+    A SolverStats passed as `stats` receives the "parse" and "complete" phases.
+    """
+    fmt = detect_format(source, fmt)
+    reader = {"csv": _read_csv, "parquet": _read_parquet, "npy": _read_npy, "npz": _read_npz}[fmt]
+    with timed(stats, "parse"):
+        names, distances, demands = reader(source, dtype, chunk_rows)
+
+    # Memory-mapped and other read-only input is only checked, never modified
+    with timed(stats, "complete"):
+        if distances.flags.writeable:
+            missing = complete_symmetric_inplace(distances)
+        else:
+            missing = missing_cells(distances)
+    if stats is not None:
+        stats.count("missing_cells", len(missing))
+    return names, distances, demands, missing
+
+def read_coordinates(source):
+    """
+    Load a node table: names, two coordinate columns and Demand, with the depot last.
+
+    Coordinates are (latitude, longitude) in degrees for haversine distances
+    or (x, y) for Euclidean ones. Returns (names, points, demands).
+    """
+    import pandas as pd
+
+    df = pd.read_csv(source, index_col=0)
+    df = df.loc[:, ~df.columns.str.contains('^Unnamed', na=False)]
+    if df.shape[1] != 3:
+        raise ValueError("The coordinates file needs two coordinate columns and a Demand column.")
+    values = df.to_numpy(dtype=np.float64)
+    if np.isnan(values).any():
+        raise ValueError("Every node needs both coordinates and a demand.")
+    return df.index.tolist(), values[:, :2], values[:, 2]
+
+def _read_csv(source, dtype, chunk_rows):
+    import pandas as pd
+
+    distances = demands = None
+    names = []
+    row = 0
+    for chunk in pd.read_csv(source, index_col=0, chunksize=chunk_rows):
+        chunk = chunk.loc[:, ~chunk.columns.str.contains('^Unnamed', na=False)]
+        if distances is None:
+            n = chunk.shape[1] - 1
+            distances = np.empty((n, n), dtype=dtype)
+            demands = np.empty(n, dtype=np.float64)
+        values = chunk.to_numpy(dtype=dtype)
+        stop = row + len(chunk)
+        if stop > len(distances):
+            raise ValueError("The distance matrix has more rows than node columns.")
+        distances[row:stop] = values[:, :-1]
+        demands[row:stop] = values[:, -1]
+        names.extend(chunk.index.tolist())
+        row = stop
+
+    if distances is None or row != len(distances):
+        raise ValueError("The distance matrix must have one row per node column.")
+    return names, distances, demands
+
+def _read_parquet(source, dtype, chunk_rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(source)
+    schema = parquet.schema_arrow
+    metadata = schema.pandas_metadata or {}
+    index_columns = [column for column in metadata.get("index_columns", []) if isinstance(column, str)]
+    value_columns = [column for column in schema.names if column not in index_columns]
+    if not index_columns:
+        # Without a stored index the node names are the first column, when it is not numeric
+        first = schema.field(value_columns[0]).type
+        if not (pa.types.is_integer(first) or pa.types.is_floating(first)):
+            index_columns, value_columns = value_columns[:1], value_columns[1:]
+
+    n = len(value_columns) - 1
+    distances = np.empty((n, n), dtype=dtype)
+    demands = np.empty(n, dtype=np.float64)
+    names = []
+    row = 0
+    for batch in parquet.iter_batches(batch_size=chunk_rows, columns=index_columns + value_columns):
+        stop = row + batch.num_rows
+        if stop > n:
+            raise ValueError("The distance matrix has more rows than node columns.")
+        for column, name in enumerate(value_columns):
+            values = batch.column(name).to_numpy(zero_copy_only=False)
+            if column < n:
+                distances[row:stop, column] = values
+            else:
+                demands[row:stop] = values
+        if index_columns:
+            names.extend(batch.column(index_columns[0]).to_pylist())
+        row = stop
+
+    if row != n:
+        raise ValueError("The distance matrix must have one row per node column.")
+    return names or default_names(n), distances, demands
+
+def _read_npy(source, dtype, chunk_rows):
+    path = isinstance(source, (str, os.PathLike))
+    array = np.load(source, mmap_mode="r" if path else None, allow_pickle=False)
+    if array.ndim != 2 or array.shape[1] != array.shape[0] + 1:
+        raise ValueError("A .npy distance matrix must have shape (n, n + 1), with the demands in the last column.")
+    if not path:
+        array.setflags(write=False)
+    return default_names(len(array)), array[:, :-1], np.asarray(array[:, -1], dtype=np.float64)
+
+def _read_npz(source, dtype, chunk_rows):
+    with np.load(source, allow_pickle=False) as data:
+        demands = np.asarray(data["demands"], dtype=np.float64)
+        n = len(demands)
+        if "triu" in data:
+            distances = expand_upper_triangular(data["triu"], n, dtype)
+        else:
+            distances = np.asarray(data["distances"], dtype=dtype)
+        names = data["names"].tolist() if "names" in data else default_names(n)
+    return names, distances, demands
+
+def expand_upper_triangular(packed, n, dtype=np.float32):
+    """
+    Expand a packed upper triangle (row by row, diagonal included) into an n x n array.
+    """
+    if len(packed) != n * (n + 1) // 2:
+        raise ValueError(f"A packed upper triangle of {n} nodes must hold {n * (n + 1) // 2} values.")
+    distances = np.empty((n, n), dtype=dtype)
+    offset = 0
+    for row in range(n):
+        values = packed[offset:offset + n - row]
+        distances[row, row:] = values
+        distances[row:, row] = values
+        offset += n - row
+    return distances
+
+def write_upper_triangular(path, distances, demands, names=None):
+    """
+    Save a symmetric distance matrix in the compact npz layout read by read_distance_matrix.
+    """
+    distances = np.asarray(distances)
+    arrays = {
+        "triu": distances[np.triu_indices(len(distances))],
+        "demands": np.asarray(demands, dtype=np.float64),
+    }
+    if names is not None:
+        arrays["names"] = np.array([str(name) for name in names])
+    np.savez(path, **arrays)
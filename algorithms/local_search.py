@@ -0,0 +1,228 @@
+import time
+import numpy as np
+from algorithms.routes import route_costs, route_loads
+
+PHASES = ("2-opt", "or-opt", "relocate", "swap")
+
+# Moves must gain more than this to count, which keeps rounding noise from cycling
+EPSILON = 1e-9
+
+def _two_opt(d, tour):
+    """
+    Best 2-opt move on one tour (depot at both ends). Returns (delta, i, j) reversing tour[i:j + 1].
+    """
+    inner = len(tour) - 2
+    if inner < 2:
+        return 0.0, 0, 0
+    positions = np.arange(1, inner + 1)
+    before, at, after = tour[positions - 1], tour[positions], tour[positions + 1]
+    # Reversing also flips the inner edges, which matters for asymmetric matrices
+    flip = np.concatenate(([0.0], np.cumsum(d[tour[2:-1], tour[1:-2]] - d[tour[1:-2], tour[2:-1]])))
+    delta = (
+        d[before[:, None], at[None, :]] + d[at[:, None], after[None, :]]
+        - d[before, at][:, None] - d[at, after][None, :]
+        + flip[None, :] - flip[:, None]
+    )
+    delta[np.tril_indices(inner)] = np.inf
+    i, j = np.unravel_index(np.argmin(delta), delta.shape)
+    return float(delta[i, j]), int(i) + 1, int(j) + 1
+
+def _or_opt(d, tour, max_segment=3):
+    """
+    Best move of a segment of up to `max_segment` customers elsewhere in the same tour.
+
+    Returns (delta, new tour or None).
+    """
+    best, best_tour = 0.0, None
+    inner = len(tour) - 2
+    for size in range(1, min(max_segment, inner - 1) + 1):
+        for start in range(1, inner - size + 2):
+            stop = start + size
+            segment = tour[start:stop]
+            rest = np.concatenate((tour[:start], tour[stop:]))
+            gain = d[tour[start - 1], segment[0]] + d[segment[-1], tour[stop]] - d[tour[start - 1], tour[stop]]
+            insert = d[rest[:-1], segment[0]] + d[segment[-1], rest[1:]] - d[rest[:-1], rest[1:]]
+            gap = int(np.argmin(insert))
+            delta = float(insert[gap] - gain)
+            if delta < best - EPSILON:
+                best, best_tour = delta, np.concatenate((rest[:gap + 1], segment, rest[gap + 1:]))
+    return best, best_tour
+
+class _Plan:
+    """
+    Mutable routes with positions, loads and costs kept in NumPy arrays for O(1) deltas.
+    """
+
+    def __init__(self, d, routes, demands):
+        self.d = d
+        self.depot = len(d) - 1
+        self.demands = demands
+        self.routes = [list(route) for route in routes]
+        self.route_of = np.full(self.depot, -1, dtype=np.int64)
+        self.position = np.zeros(self.depot, dtype=np.int64)
+        self.loads = route_loads(self.routes, demands)
+        self.costs = route_costs(d, self.routes)
+        for index in range(len(self.routes)):
+            self.reindex(index)
+
+    def reindex(self, index):
+        route = self.routes[index]
+        self.route_of[route] = index
+        self.position[route] = np.arange(len(route))
+
+    def neighbours(self, node):
+        """
+        Return the nodes before and after `node` on its tour (the depot at the ends).
+        """
+        route = self.routes[self.route_of[node]]
+        position = self.position[node]
+        before = route[position - 1] if position > 0 else self.depot
+        after = route[position + 1] if position + 1 < len(route) else self.depot
+        return before, after
+
+    def set_route(self, index, route):
+        self.routes[index] = route
+        self.loads[index] = self.demands[route].sum() if route else 0.0
+        self.costs[index] = route_costs(self.d, [route])[0]
+        self.reindex(index)
+
+def improve_routes(routes, distance_matrix, demands, max_capacity, time_budget=None, neighbors=20):
+    """
+    Improve Clark-Wright routes with 2-opt, Or-opt, relocate and swap moves.
+
+    Intra-route moves (2-opt, Or-opt) are evaluated on whole tours with
+    vectorized delta arrays; inter-route moves (relocate, swap) only try each
+    customer's `neighbors` nearest customers and respect `max_capacity`.
+    Rounds of all four phases repeat until none improves or `time_budget`
+    seconds have passed. Returns (routes, report) where the report holds the
+    initial and final cost and the moves, improvement and time of each phase.
+    """
+    d = np.asarray(distance_matrix, dtype=np.float64)
+    customers = len(d) - 1
+    demands = np.asarray(demands, dtype=np.float64)[:customers]
+    deadline = time.perf_counter() + time_budget if time_budget else float('inf')
+    plan = _Plan(d, routes, demands)
+
+    # Neighbour lists: the k nearest other customers, found in row blocks
+    k = max(min(neighbors, customers - 1), 0)
+    nearest = np.empty((customers, k), dtype=np.int64)
+    for start in range(0, customers if k else 0, 256):
+        rows = np.arange(start, min(start + 256, customers))
+        block = d[rows, :customers].copy()
+        block[rows - start, rows] = np.inf
+        nearest[rows] = np.argpartition(block, k - 1, axis=1)[:, :k]
+
+    report = {
+        "initial_cost": float(plan.costs.sum()),
+        "phases": {phase: {"moves": 0, "improvement": 0.0, "seconds": 0.0} for phase in PHASES},
+        "rounds": 0,
+        "timed_out": False,
+    }
+
+    def record(phase, delta):
+        report["phases"][phase]["moves"] += 1
+        report["phases"][phase]["improvement"] -= float(delta)
+
+    def intra_route():
+        improved = False
+        for index, route in enumerate(plan.routes):
+            if len(route) < 3:
+                continue
+            tour = np.array([plan.depot, *route, plan.depot], dtype=np.int64)
+            while time.perf_counter() < deadline:
+                delta, i, j = _two_opt(d, tour)
+                if delta >= -EPSILON:
+                    break
+                tour[i:j + 1] = tour[i:j + 1][::-1].copy()
+                record("2-opt", delta)
+                improved = True
+            plan.set_route(index, tour[1:-1].tolist())
+        return improved
+
+    def or_opt():
+        improved = False
+        for index, route in enumerate(plan.routes):
+            if len(route) < 3:
+                continue
+            tour = np.array([plan.depot, *route, plan.depot], dtype=np.int64)
+            while time.perf_counter() < deadline:
+                delta, new_tour = _or_opt(d, tour)
+                if new_tour is None:
+                    break
+                tour = new_tour
+                record("or-opt", delta)
+                improved = True
+            plan.set_route(index, tour[1:-1].tolist())
+        return improved
+
+    def relocate():
+        improved = False
+        for u in range(customers):
+            if time.perf_counter() >= deadline:
+                break
+            source = plan.route_of[u]
+            before, after = plan.neighbours(u)
+            gain = d[before, u] + d[u, after] - d[before, after]
+            best = (-EPSILON, None, None)
+            for v in nearest[u].tolist():
+                target = plan.route_of[v]
+                if target == source or plan.loads[target] + demands[u] > max_capacity:
+                    continue
+                v_before, v_after = plan.neighbours(v)
+                for left, right, slot in ((v_before, v, 0), (v, v_after, 1)):
+                    delta = d[left, u] + d[u, right] - d[left, right] - gain
+                    if delta < best[0]:
+                        best = (delta, target, plan.position[v] + slot)
+            delta, target, slot = best
+            if target is not None:
+                source_route = [node for node in plan.routes[source] if node != u]
+                target_route = plan.routes[target][:slot] + [u] + plan.routes[target][slot:]
+                plan.set_route(source, source_route)
+                plan.set_route(target, target_route)
+                record("relocate", delta)
+                improved = True
+        return improved
+
+    def swap():
+        improved = False
+        for u in range(customers):
+            if time.perf_counter() >= deadline:
+                break
+            for v in nearest[u].tolist():
+                route_u, route_v = plan.route_of[u], plan.route_of[v]
+                if route_u == route_v:
+                    continue
+                if (plan.loads[route_u] - demands[u] + demands[v] > max_capacity
+                        or plan.loads[route_v] - demands[v] + demands[u] > max_capacity):
+                    continue
+                u_before, u_after = plan.neighbours(u)
+                v_before, v_after = plan.neighbours(v)
+                delta = (
+                    d[u_before, v] + d[v, u_after] - d[u_before, u] - d[u, u_after]
+                    + d[v_before, u] + d[u, v_after] - d[v_before, v] - d[v, v_after]
+                )
+                if delta < -EPSILON:
+                    position_u, position_v = plan.position[u], plan.position[v]
+                    first, second = list(plan.routes[route_u]), list(plan.routes[route_v])
+                    first[position_u], second[position_v] = v, u
+                    plan.set_route(route_u, first)
+                    plan.set_route(route_v, second)
+                    record("swap", delta)
+                    improved = True
+                    break
+        return improved
+
+    steps = (("2-opt", intra_route), ("or-opt", or_opt), ("relocate", relocate), ("swap", swap))
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        report["rounds"] += 1
+        for phase, step in steps:
+            started = time.perf_counter()
+            improved |= step()
+            report["phases"][phase]["seconds"] += time.perf_counter() - started
+    report["timed_out"] = time.perf_counter() >= deadline
+
+    final_routes = [route for route in plan.routes if route]
+    report["final_cost"] = float(route_costs(d, final_routes).sum())
+    return final_routes, report
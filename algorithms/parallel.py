@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+import numpy as np
+from algorithms.dijkstra import _search, shortest_path_matrix
+from algorithms.graph import CSRGraph
+
+# Per-process state of pool workers, set once by the pool initializer
+_worker_blocks = []
+_worker_graph = None
+_worker_targets = None
+
+@contextmanager
+def shared_arrays(arrays):
+    """
+    Copy a dict of NumPy arrays into shared memory for the duration of a block.
+
+    Yields a picklable spec that attach_arrays turns back into zero-copy
+    views in another process. The blocks are unlinked on exit.
+    """
+    blocks = []
+    spec = {}
+    try:
+        for name, values in arrays.items():
+            values = np.ascontiguousarray(values)
+            block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            blocks.append(block)
+            np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[...] = values
+            spec[name] = (block.name, values.shape, values.dtype.str)
+        yield spec
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+def attach_arrays(spec):
+    """
+    Attach to arrays shared by shared_arrays.
+
+    Returns (blocks, arrays); keep the blocks referenced for as long as the
+    arrays are in use.
+    """
+    blocks = []
+    arrays = {}
+    for name, (block_name, shape, dtype) in spec.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    return blocks, arrays
+
+def _init_matrix_worker(spec):
+    global _worker_blocks, _worker_graph, _worker_targets
+    _worker_blocks, arrays = attach_arrays(spec)
+    _worker_graph = CSRGraph(None, arrays["indptr"], arrays["indices"], arrays["weights"])
+    _worker_targets = arrays["targets"]
+
+def _matrix_rows(start, source_ids):
+    targets = set(_worker_targets.tolist())
+    rows = np.empty((len(source_ids), len(_worker_targets)), dtype=np.float64)
+    for row, source in enumerate(source_ids):
+        distances, _ = _search(_worker_graph, source, targets)
+        rows[row] = np.frombuffer(distances, dtype=np.float64)[_worker_targets]
+    return start, rows
+
+def parallel_shortest_path_matrix(graph, sources, targets=None, workers=None, chunk_size=None):
+    """
+    Build the shortest_path_matrix of sources x targets on a process pool.
+
+    The CSR arrays are placed in shared memory once and every worker attaches
+    to them at start-up, so no graph is pickled per task. Sources are sharded
+    into chunks of `chunk_size` rows (default: about four chunks per worker).
+    The result is identical to the serial shortest_path_matrix.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_dict(graph)
+    if targets is None:
+        targets = sources
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(sources) <= 1:
+        return shortest_path_matrix(graph, sources, targets)
+
+    source_ids = [graph.index[node] for node in sources]
+    target_ids = np.array([graph.index[node] for node in targets], dtype=np.int64)
+    chunk_size = chunk_size or max(1, -(-len(source_ids) // (workers * 4)))
+
+    matrix = np.empty((len(source_ids), len(target_ids)), dtype=np.float64)
+    arrays = {
+        "indptr": graph.indptr,
+        "indices": graph.indices,
+        "weights": graph.weights,
+        "targets": target_ids,
+    }
+    with shared_arrays(arrays) as spec:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_matrix_worker, initargs=(spec,)) as pool:
+            chunks = [
+                pool.submit(_matrix_rows, start, source_ids[start:start + chunk_size])
+                for start in range(0, len(source_ids), chunk_size)
+            ]
+            for chunk in chunks:
+                start, rows = chunk.result()
+                matrix[start:start + len(rows)] = rows
+    return matrix
@@ -0,0 +1,140 @@
+import heapq
+from array import array
+from collections import OrderedDict
+from algorithms.dijkstra import _backtrack
+from algorithms.graph import CSRGraph
+
+class _PartialTree:
+    """
+    A shortest-path tree from one source whose search can be resumed.
+
+    Every settled node has been fully expanded, so the saved queue is a valid
+    frontier and the search can continue towards any later target.
+    """
+
+    def __init__(self, graph, source):
+        n = len(graph)
+        self.distances = array('d', [float('inf')]) * n
+        self.predecessors = array('q', [-1]) * n
+        self.settled = bytearray(n)
+        self.distances[source] = 0
+        self.queue = [(0.0, source)]
+
+    @property
+    def nbytes(self):
+        # Typed arrays plus a rough 64 bytes per queued (distance, node) tuple
+        return (
+            self.distances.itemsize * len(self.distances)
+            + self.predecessors.itemsize * len(self.predecessors)
+            + len(self.settled)
+            + 64 * len(self.queue)
+        )
+
+    def settle(self, graph, target, stats=None):
+        """
+        Resume the search until `target` is settled or the frontier is empty.
+        """
+        if self.settled[target]:
+            return
+        distances, predecessors, settled, queue = self.distances, self.predecessors, self.settled, self.queue
+        indptr = memoryview(graph.indptr)
+        indices = memoryview(graph.indices)
+        weights = memoryview(graph.weights)
+        queued = len(queue)
+        pops = 0
+        stale = 0
+
+        while queue:
+            current_distance, current_node = heapq.heappop(queue)
+            pops += 1
+            if settled[current_node] or current_distance > distances[current_node]:
+                stale += 1
+                continue
+            settled[current_node] = 1
+
+            start, stop = indptr[current_node], indptr[current_node + 1]
+            for neighbor, weight in zip(indices[start:stop], weights[start:stop]):
+                new_distance = current_distance + weight
+                if new_distance < distances[neighbor]:
+                    distances[neighbor] = new_distance
+                    predecessors[neighbor] = current_node
+                    heapq.heappush(queue, (new_distance, neighbor))
+
+            if current_node == target:
+                break
+
+        if stats is not None:
+            stats.count("nodes_settled", pops - stale)
+            stats.count("heap_pops", pops)
+            stats.count("heap_pushes", pops + len(queue) - queued)
+
+class ShortestPathCache:
+    """
+    LRU cache of complete or partial shortest-path trees, keyed by source.
+
+    A query from a cached source whose target is already settled is answered
+    by walking predecessors, in O(path length). Otherwise the saved search
+    resumes from its frontier. The cache is bounded by `max_entries` trees
+    and, optionally, by `max_bytes` of tree state; call invalidate() whenever
+    the graph changes.
+    """
+
+    def __init__(self, graph, max_entries=32, max_bytes=None):
+        self.graph = graph if isinstance(graph, CSRGraph) else CSRGraph.from_dict(graph)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._trees = OrderedDict()
+
+    def __len__(self):
+        return len(self._trees)
+
+    @property
+    def nbytes(self):
+        return sum(tree.nbytes for tree in self._trees.values())
+
+    def invalidate(self, graph=None):
+        """
+        Drop every cached tree, optionally switching to a new graph.
+        """
+        if graph is not None:
+            self.graph = graph if isinstance(graph, CSRGraph) else CSRGraph.from_dict(graph)
+        self._trees.clear()
+
+    def _evict(self):
+        while len(self._trees) > self.max_entries:
+            self._trees.popitem(last=False)
+        if self.max_bytes is not None:
+            while len(self._trees) > 1 and self.nbytes > self.max_bytes:
+                self._trees.popitem(last=False)
+
+    def query_ids(self, source, target, stats=None):
+        """
+        Calculate the shortest path between node ids. Returns (distance, path of ids).
+        """
+        tree = self._trees.get(source)
+        hit = tree is not None
+        if hit:
+            self.hits += 1
+            self._trees.move_to_end(source)
+        else:
+            self.misses += 1
+            tree = self._trees[source] = _PartialTree(self.graph, source)
+        if stats is not None:
+            stats.count("cache_hits" if hit else "cache_misses")
+
+        tree.settle(self.graph, target, stats)
+        self._evict()
+
+        if tree.distances[target] == float('inf'):
+            return float('inf'), []
+        return tree.distances[target], _backtrack(tree.predecessors, target)
+
+    def query(self, start_node, end_node, stats=None):
+        """
+        Calculate the shortest path between start and end nodes, like dijkstra.
+        """
+        graph = self.graph
+        distance, path = self.query_ids(graph.index[start_node], graph.index[end_node], stats)
+        return distance, [graph.names[node] for node in path]
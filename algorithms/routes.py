@@ -0,0 +1,65 @@
+from itertools import chain
+import numpy as np
+
+def flatten_routes(routes):
+    """
+    Pack a list of routes into one int64 array of customers.
+
+    Returns (nodes, owner, lengths): the concatenated customers, the route
+    index of each of them and the number of stops on each route.
+    """
+    lengths = np.fromiter(map(len, routes), dtype=np.int64, count=len(routes))
+    nodes = np.fromiter(chain.from_iterable(routes), dtype=np.int64, count=int(lengths.sum()))
+    owner = np.repeat(np.arange(len(routes)), lengths)
+    return nodes, owner, lengths
+
+def route_costs(distance_matrix, routes):
+    """
+    Cost of each depot -> route -> depot tour, with the depot as the last node.
+
+    All tours are costed at once: the legs inside routes are read with one
+    fancy-indexing lookup d[nodes[:-1], nodes[1:]] and summed per route, then
+    the depot legs are added. Empty routes cost 0.
+    """
+    d = np.asarray(distance_matrix)
+    depot = len(d) - 1
+    nodes, owner, lengths = flatten_routes(routes)
+    costs = np.zeros(len(routes), dtype=np.float64)
+    if not len(nodes):
+        return costs
+
+    same = owner[:-1] == owner[1:]
+    costs += np.bincount(
+        owner[:-1][same], weights=d[nodes[:-1][same], nodes[1:][same]], minlength=len(routes)
+    )
+    ends = np.cumsum(lengths)
+    used = lengths > 0
+    costs[used] += d[depot, nodes[(ends - lengths)[used]]] + d[nodes[ends[used] - 1], depot]
+    return costs
+
+def route_loads(routes, demands):
+    """
+    Total demand served by each route.
+    """
+    nodes, owner, _ = flatten_routes(routes)
+    demands = np.asarray(demands, dtype=np.float64)
+    return np.bincount(owner, weights=demands[nodes], minlength=len(routes))
+
+def evaluate_routes(distance_matrix, routes, demands, max_capacity, costs=None):
+    """
+    Evaluate a plan: cost, load, stop count and capacity utilization of every route.
+
+    Returns a dict of arrays with one entry per route. Pass `costs` to reuse
+    tour costs computed elsewhere (such as geo.route_lengths); the distance
+    matrix is then not needed and may be None.
+    """
+    _, _, stops = flatten_routes(routes)
+    if costs is None:
+        costs = route_costs(distance_matrix, routes)
+    loads = route_loads(routes, demands)
+    return {
+        "cost": np.asarray(costs, dtype=np.float64),
+        "load": loads,
+        "stops": stops,
+        "utilization": loads / max_capacity,
+    }
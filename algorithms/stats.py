@@ -0,0 +1,109 @@
+import time
+from contextlib import contextmanager, nullcontext
+
+PROFILE_MODES = ("cprofile", "tracemalloc")
+
+# Lines of the cProfile report kept in SolverStats.profile
+PROFILE_LINES = 25
+
+_DISABLED = nullcontext()
+
+class SolverStats:
+    """
+    Phase timings and counters collected while solving.
+
+    Pass an instance as `stats=` to clark_wright, merge_routes, dijkstra,
+    read_distance_matrix and friends; each adds its phases ("savings",
+    "merge", "search", ...) and counters ("merges_accepted", "nodes_settled",
+    ...). Counters are tallied in plain local integers and added once per
+    call, and functions called with stats=None skip all of it, so leaving
+    instrumentation off costs close to nothing.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.counters = {}
+        self.profile = None
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Add the wall-clock time of the block to the timing of `name`.
+        """
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - started
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def update(self, other):
+        """
+        Add the timings and counters of another SolverStats.
+        """
+        for name, seconds in other.timings.items():
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+        for name, amount in other.counters.items():
+            self.count(name, amount)
+        if other.profile is not None:
+            self.profile = other.profile
+        return self
+
+    def as_dict(self):
+        return {"timings": dict(self.timings), "counters": dict(self.counters), "profile": self.profile}
+
+    def __repr__(self):
+        return f"SolverStats(timings={self.timings}, counters={self.counters})"
+
+def timed(stats, name):
+    """
+    stats.phase(name), or a shared no-op context when `stats` is None.
+    """
+    return _DISABLED if stats is None else stats.phase(name)
+
+@contextmanager
+def profiling(stats, mode=None):
+    """
+    Wrap a block in cProfile or tracemalloc and store the result on `stats`.
+
+    "cprofile" keeps the top functions by cumulative time as text in
+    stats.profile; "tracemalloc" records the peak allocation as the
+    `peak_bytes` counter. Mode None does nothing.
+    """
+    if mode is None:
+        yield stats
+        return
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode '{mode}'. Use one of: {', '.join(PROFILE_MODES)}.")
+
+    # The profilers are imported on demand to keep them out of solver start-up
+    if mode == "cprofile":
+        import cProfile
+        import io
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield stats
+        finally:
+            profiler.disable()
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(PROFILE_LINES)
+            stats.profile = report.getvalue()
+    else:
+        import tracemalloc
+
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        try:
+            yield stats
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            if not tracing:
+                tracemalloc.stop()
+            stats.count("peak_bytes", peak)
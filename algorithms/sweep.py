@@ -0,0 +1,77 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from algorithms.clark_wright import clark_wright
+from algorithms.parallel import attach_arrays, shared_arrays
+from algorithms.routes import route_costs
+
+# Per-process state of pool workers, set once by the pool initializer
+_worker_blocks = []
+_worker_matrix = None
+_worker_demands = None
+_worker_capacity = None
+_worker_neighbors = None
+
+def default_grid():
+    """
+    The 50 savings parameter sets tried by default: lam 0.2..2.0 by 0.2 x mu 0..2 by 0.5.
+    """
+    return [
+        {"lam": round(0.2 * step, 1), "mu": mu, "nu": 0.0}
+        for step in range(1, 11)
+        for mu in (0.0, 0.5, 1.0, 1.5, 2.0)
+    ]
+
+def _solve(distance_matrix, demands, max_capacity, neighbors, params):
+    routes = clark_wright(distance_matrix, demands, max_capacity, neighbors=neighbors, savings_params=params)
+    return routes, float(route_costs(distance_matrix, routes).sum())
+
+def _init_sweep_worker(spec, max_capacity, neighbors):
+    global _worker_blocks, _worker_matrix, _worker_demands, _worker_capacity, _worker_neighbors
+    _worker_blocks, arrays = attach_arrays(spec)
+    _worker_matrix = arrays["distances"]
+    _worker_demands = arrays["demands"]
+    _worker_capacity = max_capacity
+    _worker_neighbors = neighbors
+
+def _sweep_one(index, params):
+    routes, cost = _solve(_worker_matrix, _worker_demands, _worker_capacity, _worker_neighbors, params)
+    return index, routes, cost
+
+def sweep_clark_wright(distance_matrix, demands, max_capacity, grid=None, workers=None, neighbors=None):
+    """
+    Run clark_wright for every savings parameter set in `grid` and keep the cheapest plan.
+
+    `grid` is a list of lam/mu/nu dicts (default: default_grid()). The runs
+    are spread over a process pool whose workers attach to the distance
+    matrix and demands in shared memory, so the matrix is copied once and
+    never pickled per run; `workers=1` runs them in this process. Returns
+    (routes, params, results) where results lists (params, cost) for every
+    set in grid order. Ties go to the earliest set in the grid.
+    """
+    grid = default_grid() if grid is None else [dict(params) for params in grid]
+    if not grid:
+        raise ValueError("The savings parameter grid is empty.")
+    distance_matrix = np.asarray(distance_matrix)
+    demands = np.asarray(demands, dtype=np.float64)
+    workers = min(workers or os.cpu_count() or 1, len(grid))
+
+    outcomes = [None] * len(grid)
+    if workers == 1:
+        for index, params in enumerate(grid):
+            outcomes[index] = _solve(distance_matrix, demands, max_capacity, neighbors, params)
+    else:
+        arrays = {"distances": distance_matrix, "demands": demands}
+        with shared_arrays(arrays) as spec:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_sweep_worker, initargs=(spec, max_capacity, neighbors),
+            ) as pool:
+                futures = [pool.submit(_sweep_one, index, params) for index, params in enumerate(grid)]
+                for future in futures:
+                    index, routes, cost = future.result()
+                    outcomes[index] = (routes, cost)
+
+    costs = [cost for _, cost in outcomes]
+    best = int(np.argmin(costs))
+    results = [(params, cost) for params, cost in zip(grid, costs)]
+    return outcomes[best][0], grid[best], results
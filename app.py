@@ -1,6 +1,4 @@
 import streamlit as st
-from navigation.clark_wright_page import clark_wright_page
-from navigation.dijkstra_page import dijkstra_page
 
 # Main App
 st.markdown("#### Algorithm Selection")
@@ -18,9 +16,12 @@ if choice == "Home":
         """,
         unsafe_allow_html=True,
     )
+# Pages (and the pandas/NumPy stack behind them) are imported only once selected
 if choice == "Clark-Wright Savings Algorithm":
+    from navigation.clark_wright_page import clark_wright_page
     clark_wright_page()
 elif choice == "Dijkstra's Algorithm":
+    from navigation.dijkstra_page import dijkstra_page
     dijkstra_page()
 
 
@@ -0,0 +1,56 @@
+import argparse
+import json
+import sys
+from benchmarks.imports import IMPORT_TARGETS, run_import_benchmarks
+from benchmarks.suite import CASES, QUICK_SIZES, SIZES, compare, run_benchmarks, write_json
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Scaling benchmarks for the routing algorithms.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Time the benchmark cases and write the results as JSON.")
+    run.add_argument("--sizes", type=int, nargs="+", help=f"Instance sizes (default: {' '.join(map(str, SIZES))}).")
+    run.add_argument("--quick", action="store_true", help=f"Use the small sizes {' '.join(map(str, QUICK_SIZES))}.")
+    run.add_argument("--cases", nargs="+", choices=[case.name for case in CASES], help="Cases to run (default: all).")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--max-time", type=float, default=2.0, help="Seconds of timing per case and size.")
+    run.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak memory pass.")
+    run.add_argument("-o", "--output", default="benchmark_results.json")
+
+    imports = commands.add_parser("imports", help="Measure cold import times with python -X importtime.")
+    imports.add_argument("--modules", nargs="+", default=list(IMPORT_TARGETS), help="Modules to import.")
+    imports.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module; the best run is kept.")
+    imports.add_argument("-o", "--output", default="import_times.json")
+
+    diff = commands.add_parser("compare", help="Compare two result files, e.g. from two commits.")
+    diff.add_argument("baseline")
+    diff.add_argument("current")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "compare":
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        with open(args.current) as file:
+            current = json.load(file)
+        for row in compare(baseline, current):
+            memory = f"  memory x{row['memory_ratio']:.2f}" if "memory_ratio" in row else ""
+            print(f"{row['case']:<30} n={row['n']:<6} time x{row['time_ratio']:.2f}{memory}")
+        return 0
+
+    if args.command == "imports":
+        results = run_import_benchmarks(args.modules, args.repeat, log=sys.stderr)
+        write_json(results, args.output)
+        return 0
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    results = run_benchmarks(
+        sizes, args.cases, seed=args.seed, max_time=args.max_time, memory=not args.no_memory, log=sys.stderr,
+    )
+    write_json(results, args.output)
+    print(f"Wrote {len(results['results'])} results to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import io
+import numpy as np
+
+def euclidean_cvrp(n, seed=0, capacity_ratio=0.2):
+    """
+    Random Euclidean CVRP instance with `n` nodes, the depot last.
+
+    Points are uniform in the unit square and demands uniform in 1..9; the
+    capacity fits about `capacity_ratio` of the total demand, so a plan needs
+    roughly 1 / capacity_ratio tours. Returns (points, demands, capacity).
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.random((n, 2))
+    demands = np.append(rng.integers(1, 10, size=n - 1), 0).astype(np.float64)
+    capacity = max(float(demands.max()), float(np.ceil(demands.sum() * capacity_ratio)))
+    return points, demands, capacity
+
+def distance_matrix(points, dtype=np.float64):
+    """
+    Dense Euclidean distance matrix of the points, computed in row blocks.
+    """
+    n = len(points)
+    distances = np.empty((n, n), dtype=dtype)
+    for start in range(0, n, 1024):
+        block = points[start:start + 1024]
+        distances[start:start + len(block)] = np.hypot(*(block[:, None, :] - points[None, :, :]).transpose(2, 0, 1))
+    return distances
+
+def grid_graph(n, seed=0, low=1, high=10):
+    """
+    Square grid of about `n` nodes with random integer weights, as a dict-of-dicts graph.
+
+    Nodes are named "r,c" and every edge is present in both directions.
+    """
+    rng = np.random.default_rng(seed)
+    side = max(int(round(np.sqrt(n))), 1)
+    graph = {f"{r},{c}": {} for r in range(side) for c in range(side)}
+    for r in range(side):
+        for c in range(side):
+            for nr, nc in ((r + 1, c), (r, c + 1)):
+                if nr < side and nc < side:
+                    weight = int(rng.integers(low, high + 1))
+                    graph[f"{r},{c}"][f"{nr},{nc}"] = weight
+                    graph[f"{nr},{nc}"][f"{r},{c}"] = weight
+    return graph
+
+def road_graph(n, seed=0, degree=3):
+    """
+    Road-like sparse graph: random points joined to their `degree` nearest neighbours.
+
+    Weights are the Euclidean length times a random detour factor in
+    [1, 1.5], and every edge is present in both directions. Nodes are
+    named "N0".."N{n-1}".
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.random((n, 2))
+    names = [f"N{i}" for i in range(n)]
+    graph = {name: {} for name in names}
+    k = min(degree, n - 1)
+    for start in range(0, n if k else 0, 512):
+        block = points[start:start + 512]
+        distances = np.hypot(*(block[:, None, :] - points[None, :, :]).transpose(2, 0, 1))
+        distances[np.arange(len(block)), np.arange(start, start + len(block))] = np.inf
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        for row, neighbors in enumerate(nearest.tolist()):
+            u = start + row
+            for v in neighbors:
+                weight = float(distances[row, v] * rng.uniform(1.0, 1.5))
+                graph[names[u]][names[v]] = graph[names[v]][names[u]] = weight
+    return graph
+
+def template_csv(n, seed=0, missing=0.5):
+    """
+    CSV upload in the shape of the Clark-Wright page template, as bytes.
+
+    `n` nodes (Node 1 .. Node n-1 and the Depot) with a Demand column. A
+    `missing` share of the cells below the diagonal is left empty, as users
+    usually fill in only one triangle.
+    """
+    points, demands, _ = euclidean_cvrp(n, seed)
+    distances = np.round(distance_matrix(points) * 100, 1)
+    rng = np.random.default_rng(seed + 1)
+    lower = np.tril(rng.random((n, n)) < missing, k=-1)
+    distances[lower] = np.nan
+    names = [f"Node {i}" for i in range(1, n)] + ["Depot"]
+
+    out = io.StringIO()
+    out.write("Distance," + ",".join(names) + ",Demand\n")
+    for name, row, demand in zip(names, distances, demands):
+        cells = ",".join(map(repr, row.tolist())).replace("nan", "")
+        out.write(f"{name},{cells},{int(demand)}\n")
+    return out.getvalue().encode()
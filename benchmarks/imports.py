@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+import time
+from benchmarks.suite import environment
+
+# Modules whose cold import is measured, from the solver layer up to the pages
+IMPORT_TARGETS = (
+    "numpy",
+    "algorithms.clark_wright",
+    "algorithms.dijkstra",
+    "algorithms.ingest",
+    "algorithms.local_search",
+    "routing_app.batch",
+    "routing_app.service",
+    "navigation.clark_wright_page",
+    "navigation.dijkstra_page",
+)
+
+# Heavy dependencies reported when an import pulls them in
+HEAVY_MODULES = ("pandas", "pyarrow", "streamlit")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_importtime(output):
+    """
+    Parse `python -X importtime` output into {module: (self us, cumulative us)}.
+    """
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+def import_time(module, repeat=3):
+    """
+    Cold-import `module` in fresh interpreters; returns the best of `repeat` runs.
+
+    The result holds the cumulative import time reported by -X importtime,
+    the wall time of the whole interpreter, the number of modules loaded and
+    which HEAVY_MODULES came along.
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))}
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, env=env, cwd=ROOT,
+        )
+        wall = time.perf_counter() - started
+        if completed.returncode != 0:
+            raise ValueError(f"Importing {module} failed: {completed.stderr.strip().splitlines()[-1]}")
+        times = parse_importtime(completed.stderr)
+        result = {
+            "module": module,
+            "import_ms": times[module][1] / 1000,
+            "wall_ms": wall * 1000,
+            "modules_loaded": len(times),
+            "heavy": [name for name in HEAVY_MODULES if name in times],
+        }
+        if best is None or result["import_ms"] < best["import_ms"]:
+            best = result
+    return best
+
+def run_import_benchmarks(modules=IMPORT_TARGETS, repeat=3, log=None):
+    """
+    Measure every module in `modules`; returns a JSON-ready dict like run_benchmarks.
+    """
+    results = []
+    for module in modules:
+        result = import_time(module, repeat)
+        results.append(result)
+        if log is not None:
+            heavy = f"  (loads {', '.join(result['heavy'])})" if result["heavy"] else ""
+            print(f"{module:<30} {result['import_ms']:8.1f} ms import {result['wall_ms']:8.1f} ms wall{heavy}",
+                  file=log, flush=True)
+    return {"environment": environment(), "imports": results}
@@ -0,0 +1,221 @@
+import gc
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+from algorithms.clark_wright import calculate_savings, clark_wright, merge_routes
+from algorithms.constrained import constrained_clark_wright
+from algorithms.dijkstra import csr_dijkstra, dijkstra, one_to_many
+from algorithms.distance_matrix import transform_to_complete_matrix
+from algorithms.geo import coordinate_savings
+from algorithms.graph import CSRGraph
+from algorithms.ingest import read_distance_matrix
+from benchmarks.generators import distance_matrix, euclidean_cvrp, grid_graph, road_graph, template_csv
+
+SIZES = (10, 100, 1000, 5000, 20000)
+QUICK_SIZES = (10, 100, 500)
+
+# Timing stops after this many seconds per case and size, once MIN_ROUNDS are done
+MIN_ROUNDS = 3
+MAX_TIME = 2.0
+
+class Case:
+    """
+    One benchmarked function: setup(n, seed) builds the inputs once, run(inputs) is timed.
+
+    Sizes above `max_n` are skipped (dense n x n inputs do not fit in memory
+    at the top of the size range).
+    """
+
+    def __init__(self, name, setup, run, max_n=None):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.max_n = max_n
+
+def _cvrp(n, seed):
+    points, demands, capacity = euclidean_cvrp(n, seed)
+    return {"points": points, "distances": distance_matrix(points), "demands": demands, "capacity": capacity}
+
+def _constrained_cvrp(n, seed):
+    """
+    _cvrp with two vehicle types, 1.5-wide time windows opening in [0, 3] and a route duration limit.
+
+    Every customer fits a direct trip (distances in the unit square are below
+    1.5), so the instance is feasible at every size.
+    """
+    inputs = _cvrp(n, seed)
+    rng = np.random.default_rng(seed + 1)
+    opening = rng.uniform(0.0, 3.0, size=n)
+    opening[-1] = 0.0
+    closing = opening + 1.5
+    closing[-1] = np.inf
+    capacity = inputs["capacity"]
+    inputs.update(
+        fleet=[{"name": "large", "capacity": capacity}, {"name": "small", "capacity": capacity / 2}],
+        time_windows=np.column_stack([opening, closing]),
+        service_times=np.full(n, 0.01),
+    )
+    return inputs
+
+def _coordinates(n, seed):
+    points, demands, capacity = euclidean_cvrp(n, seed)
+    return {"points": points, "demands": demands, "capacity": capacity}
+
+def _upload(n, seed):
+    return {"data": template_csv(n, seed)}
+
+def _dataframe(n, seed):
+    import pandas as pd
+    return {"df": pd.read_csv(io.BytesIO(template_csv(n, seed)), index_col=0)}
+
+def _graph(generator):
+    def setup(n, seed):
+        graph = generator(n, seed)
+        csr = CSRGraph.from_dict(graph)
+        names = csr.names
+        return {"graph": graph, "csr": csr, "source": names[0], "target": names[-1]}
+    return setup
+
+def _coordinate_clark_wright(inputs):
+    first, second, _ = coordinate_savings(inputs["points"], 30, metric="euclidean")
+    return merge_routes(first, second, list(inputs["demands"][:-1]), inputs["capacity"])
+
+CASES = (
+    Case("calculate_savings", _cvrp, lambda inputs: calculate_savings(inputs["distances"]), max_n=5000),
+    Case("clark_wright", _cvrp,
+         lambda inputs: clark_wright(inputs["distances"], inputs["demands"], inputs["capacity"]), max_n=5000),
+    Case("clark_wright_granular", _cvrp,
+         lambda inputs: clark_wright(inputs["distances"], inputs["demands"], inputs["capacity"], neighbors=30),
+         max_n=5000),
+    Case("clark_wright_constrained", _constrained_cvrp,
+         lambda inputs: constrained_clark_wright(
+             inputs["distances"], inputs["demands"], inputs["fleet"], time_windows=inputs["time_windows"],
+             service_times=inputs["service_times"], max_duration=6.0,
+         ), max_n=5000),
+    Case("clark_wright_coordinates", _coordinates, _coordinate_clark_wright),
+    Case("read_csv_upload", _upload, lambda inputs: read_distance_matrix(io.BytesIO(inputs["data"]), fmt="csv"),
+         max_n=2000),
+    Case("transform_to_complete_matrix", _dataframe, lambda inputs: transform_to_complete_matrix(inputs["df"]),
+         max_n=2000),
+    Case("dijkstra_grid", _graph(grid_graph), lambda inputs: dijkstra(inputs["graph"], inputs["source"], inputs["target"])),
+    Case("dijkstra_road", _graph(road_graph), lambda inputs: dijkstra(inputs["graph"], inputs["source"], inputs["target"])),
+    Case("csr_dijkstra_road", _graph(road_graph),
+         lambda inputs: csr_dijkstra(inputs["csr"], 0, len(inputs["csr"]) - 1)),
+    Case("one_to_many_road", _graph(road_graph), lambda inputs: one_to_many(inputs["csr"], inputs["source"])),
+)
+
+def measure(function, min_rounds=MIN_ROUNDS, max_time=MAX_TIME):
+    """
+    Time repeated calls in the style of pytest-benchmark; returns the stats in seconds.
+
+    Runs at least `min_rounds` rounds and keeps going until `max_time`
+    seconds have passed. Garbage collection is off while timing.
+    """
+    timings = []
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        deadline = time.perf_counter() + max_time
+        while len(timings) < min_rounds or time.perf_counter() < deadline:
+            started = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - started)
+    finally:
+        if enabled:
+            gc.enable()
+    return {
+        "rounds": len(timings),
+        "min": min(timings),
+        "max": max(timings),
+        "mean": statistics.fmean(timings),
+        "median": statistics.median(timings),
+        "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+def peak_memory(function):
+    """
+    Peak bytes allocated by one call, measured with tracemalloc (NumPy buffers included).
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def environment():
+    """
+    Metadata stored with the results so runs from different commits can be compared.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "datetime": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+def run_benchmarks(sizes=SIZES, cases=None, seed=0, min_rounds=MIN_ROUNDS, max_time=MAX_TIME, memory=True, log=None):
+    """
+    Benchmark the selected cases (names, default all) at every size they support.
+
+    Returns a JSON-ready dict with the environment and one entry per
+    (case, n) holding the timing stats and, with `memory`, the tracemalloc peak.
+    """
+    selected = [case for case in CASES if cases is None or case.name in cases]
+    unknown = set(cases or ()) - {case.name for case in CASES}
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {', '.join(sorted(unknown))}.")
+
+    results = []
+    for case in selected:
+        for n in sizes:
+            if case.max_n is not None and n > case.max_n:
+                continue
+            inputs = case.setup(n, seed)
+            result = {"case": case.name, "n": n, "seed": seed, **measure(lambda: case.run(inputs), min_rounds, max_time)}
+            if memory:
+                result["peak_bytes"] = peak_memory(lambda: case.run(inputs))
+            results.append(result)
+            if log is not None:
+                print(f"{case.name:<30} n={n:<6} median {result['median'] * 1000:10.3f} ms", file=log, flush=True)
+            del inputs
+    return {"environment": environment(), "results": results}
+
+def compare(baseline, current):
+    """
+    Pair the results of two runs by (case, n); returns rows with the median time and peak memory ratios.
+
+    A ratio above 1 means `current` is slower (or uses more memory).
+    """
+    previous = {(result["case"], result["n"]): result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        before = previous.get((result["case"], result["n"]))
+        if before is None:
+            continue
+        row = {"case": result["case"], "n": result["n"], "time_ratio": result["median"] / before["median"]}
+        if "peak_bytes" in result and before.get("peak_bytes"):
+            row["memory_ratio"] = result["peak_bytes"] / before["peak_bytes"]
+        rows.append(row)
+    return rows
+
+def write_json(results, path):
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
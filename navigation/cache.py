@@ -0,0 +1,97 @@
+import hashlib
+from io import BytesIO
+import streamlit as st
+from algorithms.clark_wright import clark_wright, merge_routes
+from algorithms.geo import (
+    COORDINATE_MATRIX_LIMIT, COORDINATE_NEIGHBORS, coordinate_savings, pairwise_distances, route_lengths,
+)
+from algorithms.ingest import detect_format, read_coordinates, read_distance_matrix
+from algorithms.local_search import improve_routes
+from algorithms.stats import SolverStats, profiling
+
+# Bounds for the per-process caches shared by all sessions
+UPLOAD_CACHE_ENTRIES = 8
+SOLVE_CACHE_ENTRIES = 32
+CACHE_TTL_SECONDS = 60 * 60
+
+def content_hash(data):
+    """
+    Return a stable hash of uploaded file bytes, used as the cache key.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+@st.cache_resource(max_entries=UPLOAD_CACHE_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_distance_matrix(file_hash, file_name, _data):
+    """
+    Parse an uploaded distance matrix file and complete it.
+
+    Only `file_hash` and `file_name` are part of the cache key; the leading
+    underscore keeps Streamlit from hashing the raw bytes again. The arrays
+    are shared between reruns without copying, so they are made read-only.
+    Also returns the SolverStats of the parse.
+    """
+    stats = SolverStats()
+    names, distances, demands, missing = read_distance_matrix(
+        BytesIO(_data), fmt=detect_format(file_name), stats=stats,
+    )
+    distances.setflags(write=False)
+    demands.setflags(write=False)
+    return names, distances, demands, missing, stats
+
+@st.cache_data(max_entries=SOLVE_CACHE_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def solve_clark_wright(file_hash, max_capacity, improve_seconds, _distance_matrix, _demands, profile=None):
+    """
+    Run clark_wright once per (uploaded file, capacity, local search budget, profile mode).
+
+    With a positive `improve_seconds` the routes are polished by
+    improve_routes within that time. `profile` wraps the solve in cProfile
+    or tracemalloc (see algorithms.stats.profiling). Returns (routes, local
+    search report or None, SolverStats).
+    """
+    stats = SolverStats()
+    report = None
+    with profiling(stats, profile):
+        routes = clark_wright(_distance_matrix, _demands, max_capacity, stats=stats)
+        if improve_seconds > 0:
+            with stats.phase("local search"):
+                routes, report = improve_routes(
+                    routes, _distance_matrix, _demands, max_capacity, time_budget=improve_seconds,
+                )
+    return routes, report, stats
+
+@st.cache_resource(max_entries=UPLOAD_CACHE_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_coordinates(file_hash, _data):
+    """
+    Parse an uploaded node table of coordinates and demands.
+    """
+    names, points, demands = read_coordinates(BytesIO(_data))
+    points.setflags(write=False)
+    demands.setflags(write=False)
+    return names, points, demands
+
+@st.cache_resource(max_entries=UPLOAD_CACHE_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def coordinate_matrix(file_hash, metric, _points):
+    """
+    Compute the float32 distance matrix of uploaded coordinates.
+    """
+    distances = pairwise_distances(_points, metric=metric)
+    distances.setflags(write=False)
+    return distances
+
+@st.cache_data(max_entries=SOLVE_CACHE_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def solve_coordinates(file_hash, metric, max_capacity, _points, _demands, profile=None):
+    """
+    Run granular Clark-Wright on coordinates without building the distance matrix.
+
+    Returns the routes, their tour lengths and the SolverStats of the solve.
+    """
+    stats = SolverStats()
+    with profiling(stats, profile):
+        with stats.phase("savings"):
+            first, second, _ = coordinate_savings(_points, COORDINATE_NEIGHBORS, metric=metric)
+        stats.count("savings_evaluated", len(first))
+        with stats.phase("merge"):
+            routes = merge_routes(first, second, list(_demands[:-1]), max_capacity, stats)
+        with stats.phase("route lengths"):
+            lengths = route_lengths(_points, routes, metric=metric).tolist()
+    return routes, lengths, stats
@@ -2,7 +2,15 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from io import BytesIO
-from algorithms.clark_wright import clark_wright
+from algorithms.ingest import FORMATS
+from algorithms.routes import evaluate_routes
+from algorithms.stats import SolverStats
+from navigation.cache import (
+    COORDINATE_MATRIX_LIMIT, COORDINATE_NEIGHBORS, content_hash, coordinate_matrix, load_coordinates,
+    load_distance_matrix, solve_clark_wright, solve_coordinates,
+)
+from navigation.performance import performance_options, show_performance
+from navigation.tables import PAGE_ROWS, page_window, paginated_matrix, tours_table
 
 # ------- Clark_wright_page -------
 def clark_wright_page():
@@ -15,38 +23,15 @@ def clark_wright_page():
         Includes a Demand column at the end and a distance matrix.
         """
         nodes = [f'Node {i}' for i in range(1, max_nodes + 1)] + ['Depot']
-        data = {node: [np.nan] * len(nodes) for node in nodes}
-        template_df = pd.DataFrame(data, index=nodes)
+        data = np.full((len(nodes), len(nodes)), np.nan)
+        np.fill_diagonal(data, 0)  # Set diagonal to 0 (self-distances)
+        template_df = pd.DataFrame(data, index=nodes, columns=nodes)
         template_df.index.name = 'Distance'
-        np.fill_diagonal(template_df.values, 0)  # Set diagonal to 0 (self-distances)
         
         # Add Demand column at the end
         template_df['Demand'] = [10] * max_nodes + [0]  # Example demands
         return template_df
 
-    def transform_to_complete_matrix(df):
-        """
-        Transform the uploaded matrix into a complete symmetric matrix.
-        """
-        # Extract the demand column and remove it from the distance matrix
-        demands = df.iloc[:,-1].tolist()
-
-        # Drop columns with missing or unnamed headers
-        df = df.loc[:, ~df.columns.str.contains('^Unnamed', na=False)]
-        df = df.loc[:, ~df.columns.isnull()]
-        
-        distance_matrix = df.iloc[:, :-1]
-        
-        # Fill missing values symmetrically
-        for i in range(len(distance_matrix)):
-            for j in range(len(distance_matrix)):
-                if pd.isna(distance_matrix.iloc[i, j]):
-                    distance_matrix.iloc[i, j] = distance_matrix.iloc[j, i]
-                elif pd.isna(distance_matrix.iloc[j, i]):
-                    distance_matrix.iloc[j, i] = distance_matrix.iloc[i, j]
-        
-        return distance_matrix, demands
-
     def display_matrix_with_dashes(matrix):
         """
         Replace NaN or None values with '--' for display purposes.
@@ -54,41 +39,48 @@ def clark_wright_page():
         display_matrix = matrix.copy()
         return display_matrix.fillna('--')
     
-    def calculate_route_distance(route_nodes, distance_matrix):
+    def create_coordinate_template(max_nodes=20):
         """
-        Calculate the total distance for a given route.
+        Create a CSV template of node coordinates and demands.
+        The Depot is the last row.
         """
-        depot_row = -1  # Assuming 'Depot' is the last row
-        depot_col = -2  # Assuming 'Depot' is the second-to-last column
-
-        return (
-            distance_matrix.iloc[depot_row, distance_matrix.columns.get_loc(route_nodes[0])]  # Depot to first node
-            + sum(
-                distance_matrix.iloc[
-                    distance_matrix.index.get_loc(route_nodes[j]),
-                    distance_matrix.columns.get_loc(route_nodes[j + 1])
-                ]
-                for j in range(len(route_nodes) - 1)  # Between nodes in the route
-            )
-            + distance_matrix.iloc[
-                distance_matrix.index.get_loc(route_nodes[-1]), depot_col
-            ]  # Last node to Depot
+        nodes = [f'Node {i}' for i in range(1, max_nodes + 1)] + ['Depot']
+        template_df = pd.DataFrame(
+            {'Latitude': np.nan, 'Longitude': np.nan, 'Demand': [10] * max_nodes + [0]},
+            index=nodes,
         )
-    
-    # Upload csv file
-    uploaded_file = st.sidebar.file_uploader("Upload your populated CSV file*", type=["csv"])
+        template_df.index.name = 'Node'
+        return template_df
+
+    # Choose between a distance matrix and node coordinates
+    input_mode = st.sidebar.radio("Input type:", ["Distance matrix", "Coordinates"], horizontal=True)
+    coordinate_mode = input_mode == "Coordinates"
+
+    if coordinate_mode:
+        uploaded_file = st.sidebar.file_uploader("Upload your populated coordinates CSV file*", type=["csv"])
+        metric_label = st.sidebar.selectbox(
+            "Distance metric:", ["Haversine (latitude/longitude, km)", "Euclidean (x/y)"]
+        )
+        metric = "haversine" if metric_label.startswith("Haversine") else "euclidean"
+        template_df = create_coordinate_template(max_nodes=20)
+        template_name = "coordinates_template.csv"
+    else:
+        # Upload csv file
+        uploaded_file = st.sidebar.file_uploader("Upload your populated CSV file*", type=list(FORMATS))
+        template_df = create_template(max_nodes=20)
+        template_name = "distance_template.csv"
 
     # Provide template download
-    template_df = create_template(max_nodes=20)
     csv_template = BytesIO()
     template_df.to_csv(csv_template)
     csv_template.seek(0)
-    
+
     # Download csv template
     st.sidebar.markdown(
         """
         *Use this template provided.\\
-            You may rename the headers, but ensure the order matches the template.
+            You may rename the headers, but ensure the order matches the template.\\
+            Large matrices can also be uploaded as Parquet, .npy or .npz files.
         """
     )
 
@@ -96,52 +88,99 @@ def clark_wright_page():
     st.sidebar.download_button(
         label="Download 🔻",
         data=csv_template,
-        file_name="distance_template.csv",
+        file_name=template_name,
         mime="text/csv",
     )
 
     # File handling and processing
     if uploaded_file:
         try:
-            # Ensure the uploaded file is a CSV
-            if not uploaded_file.name.endswith(".csv"):
-                raise ValueError("Only CSV files are supported. Please upload a valid CSV file.")
-
-            # Load the CSV into a Pandas DataFrame
-            df = pd.read_csv(uploaded_file, index_col=0)
-
-            # Transform the matrix to populate missing values symmetrically
-            complete_distance_matrix, demands = transform_to_complete_matrix(df)
-
-            # Add the Demand column back for display purposes
-            complete_distance_matrix['Demand'] = demands
-            complete_distance_matrix_display = display_matrix_with_dashes(complete_distance_matrix)
-
-            # Display the processed distance matrix
-            st.subheader("Complete Distance Matrix with Demands")
-            st.dataframe(complete_distance_matrix_display)
+            data = uploaded_file.getvalue()
+            file_hash = content_hash(data)
+
+            if coordinate_mode:
+                # Compute distances from coordinates; large instances never build the matrix
+                names, points, demands = load_coordinates(file_hash, data)
+                missing_cells = []
+                load_stats = None
+                if len(names) <= COORDINATE_MATRIX_LIMIT:
+                    distances = coordinate_matrix(file_hash, metric, points)
+                else:
+                    distances = None
+                    st.info(
+                        f"{len(names)} nodes: distances are computed on the fly for the "
+                        f"{COORDINATE_NEIGHBORS} nearest candidates of each node."
+                    )
+            else:
+                # Load the file and populate missing values symmetrically (cached by file content)
+                names, distances, demands, missing_cells, load_stats = load_distance_matrix(file_hash, uploaded_file.name, data)
+                if len(missing_cells):
+                    preview = ", ".join(f"{names[row]} -> {names[col]}" for row, col in missing_cells[:10])
+                    more = f" and {len(missing_cells) - 10} more" if len(missing_cells) > 10 else ""
+                    st.warning(f"{len(missing_cells)} distances are still missing: {preview}{more}.")
+
+            if distances is not None:
+                # Display one page of the processed distance matrix, with the Demand column
+                st.subheader("Complete Distance Matrix with Demands")
+                matrix_page = paginated_matrix(distances, names, "distance_matrix", {'Demand': demands})
+                st.dataframe(display_matrix_with_dashes(matrix_page))
 
             st.sidebar.markdown("---")
 
             # Ask for the maximum capacity
             max_capacity = st.sidebar.number_input("Enter the maximum capacity per tour:", min_value=1, value=50)
 
+            # Optional local search on top of the savings routes
+            improve_seconds = 0.0
+            if distances is not None:
+                improve_seconds = st.sidebar.number_input(
+                    "Local search time budget in seconds (0 = off):", min_value=0.0, max_value=60.0, value=0.0, step=0.5
+                )
+
+            # Optional performance panel and profiler
+            show_panel, profile = performance_options("clark_wright")
+
             # Perform the Clark-Wright Savings Algorithm
-            routes = clark_wright(complete_distance_matrix.iloc[:, :-1], demands, max_capacity)
-            total_distance = 0
-            # Display results
+            page_stats = SolverStats()
+            if distances is not None:
+                routes, improvement_report, solve_stats = solve_clark_wright(
+                    file_hash, max_capacity, improve_seconds, distances, demands, profile=profile,
+                )
+                with page_stats.phase("evaluate routes"):
+                    evaluation = evaluate_routes(distances, routes, demands, max_capacity)
+            else:
+                routes, lengths, solve_stats = solve_coordinates(
+                    file_hash, metric, max_capacity, points, demands, profile=profile,
+                )
+                with page_stats.phase("evaluate routes"):
+                    evaluation = evaluate_routes(None, routes, demands, max_capacity, costs=lengths)
+                improvement_report = None
+
+            # Display results: one table of tours, sent a page at a time
             st.subheader("Result")
             st.write(f"How many tours are needed? {len(routes)}")
-            for i, route in enumerate(routes):
-                route_nodes = [complete_distance_matrix.index[node] for node in route]
-                depot_name = complete_distance_matrix.columns[-2]
-                # Calculate total distance for the current route
-                subtotal_distance = calculate_route_distance(route_nodes, complete_distance_matrix)
-                total_distance += subtotal_distance
-
-                st.write(f"Tour {i + 1}: {depot_name} -> {' -> '.join(route_nodes)} -> {depot_name}. (Subtotal distance: {subtotal_distance:.2f})")
+            start, stop = page_window("Tours", len(routes), PAGE_ROWS, "tours_page")
+            st.dataframe(
+                tours_table(routes, names, evaluation, max_capacity, start, stop),
+                column_config={
+                    "Distance": st.column_config.NumberColumn(format="%.2f"),
+                    "Utilization": st.column_config.ProgressColumn(min_value=0.0, max_value=1.0, format="percent"),
+                },
+            )
             st.write(f"---")
-            st.write(f"Total distance traveled: {round(total_distance,2)}")
+            st.write(f"Total distance traveled: {round(float(evaluation['cost'].sum()), 2)}")
+
+            if improvement_report:
+                with st.expander("Local search improvement"):
+                    st.write(
+                        f"Savings routes: {improvement_report['initial_cost']:.2f} -> "
+                        f"improved: {improvement_report['final_cost']:.2f}"
+                        + (" (time budget reached)" if improvement_report["timed_out"] else "")
+                    )
+                    st.dataframe(pd.DataFrame(improvement_report["phases"]).T)
+
+            if show_panel:
+                show_performance(load_stats, solve_stats, page_stats)
 
         except Exception as e:
             # Handle any errors that occur during processing
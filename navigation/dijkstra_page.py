@@ -1,10 +1,17 @@
 import streamlit as st
+import pandas as pd
 import json
-from algorithms.dijkstra import dijkstra
+from algorithms.path_cache import ShortestPathCache
+from algorithms.stats import SolverStats, profiling
+from navigation.performance import performance_options, show_performance
+from navigation.tables import PAGE_ROWS, edge_frame, graph_from_edges, page_window
 
-def dijkstra_page():
-    MAX_NODES = 30  # Maximum allowable nodes for performance efficiency
+# Graphs up to this many nodes are also shown as JSON
+JSON_NODE_LIMIT = 30
+# Up to this many nodes are offered as select options; names of larger graphs are typed
+NODE_OPTION_LIMIT = 200
 
+def dijkstra_page():
     st.title("Dijkstra's Algorithm")
     st.markdown("##### Solve single-source shortest path problems with non-negative edge weights.")
 
@@ -15,6 +22,10 @@ def dijkstra_page():
         st.session_state["node_names"] = []
     if "confirm_reset" not in st.session_state:
         st.session_state["confirm_reset"] = False
+    if "path_cache" not in st.session_state:
+        st.session_state["path_cache"] = None
+    if "edge_version" not in st.session_state:
+        st.session_state["edge_version"] = 0
 
     # Reset session state
     def reset_state():
@@ -23,7 +34,15 @@ def dijkstra_page():
             "node_names": [],
             "uploaded_file": None,
             "confirm_reset": False,
+            "path_cache": None,
         })
+        graph_changed()
+
+    # Drop cached shortest-path trees and graph views whenever the graph is edited;
+    # a new edge version also gives the edge editor a fresh key
+    def graph_changed():
+        st.session_state["path_cache"] = None
+        st.session_state["edge_version"] += 1
     
     # Function to compute the bidirectional graph dynamically
     def compute_bidirectional_graph(graph):
@@ -38,27 +57,27 @@ def dijkstra_page():
                 bidirectional_graph.setdefault(neighbor, {})[node] = distance
         return bidirectional_graph
 
-    # Function to synchronize the graph when neighbors are selected/removed
-    def update_graph(node):
+    def graph_views():
         """
-        Updates the graph dynamically based on neighbors selected for a node.
+        Edge table, bidirectional graph and download JSON of the current graph.
+
+        They are kept in session state and rebuilt only after the graph
+        changes, so reruns that do not edit it cost the same for any size.
         """
-        selected_neighbors = st.session_state[f"neighbors_{node}"]
-
-        # Add or retain neighbors in the graph
-        for neighbor in selected_neighbors:
-            if neighbor not in st.session_state["graph"].get(node, {}):
-                # Ensure neighbor is initialized with a default distance
-                st.session_state["graph"].setdefault(node, {})[neighbor] = 1
-                st.session_state["graph"].setdefault(neighbor, {})[node] = 1
-
-        # Remove neighbors that are no longer selected
-        current_neighbors = list(st.session_state["graph"].get(node, {}).keys())
-        for old_neighbor in current_neighbors:
-            if old_neighbor not in selected_neighbors:
-                # Remove connection in both directions
-                st.session_state["graph"][node].pop(old_neighbor, None)
-                st.session_state["graph"][old_neighbor].pop(node, None)
+        graph = st.session_state["graph"]
+        views = st.session_state.get("graph_views")
+        if views is None or views["graph"] is not graph or views["version"] != st.session_state["edge_version"]:
+            bidirectional_graph = compute_bidirectional_graph(graph)
+            views = {
+                "graph": graph,
+                "version": st.session_state["edge_version"],
+                "edges": edge_frame(graph),
+                "bidirectional": bidirectional_graph,
+                "edge_count": sum(len(neighbors) for neighbors in bidirectional_graph.values()) // 2,
+                "json": json.dumps(bidirectional_graph, indent=2),
+            }
+            st.session_state["graph_views"] = views
+        return views
 
     # Upload JSON file
     uploaded_file = st.sidebar.file_uploader("Upload Graph JSON", type=["json"])
@@ -69,7 +88,11 @@ def dijkstra_page():
             # Initialize the graph with uploaded data (one-time operation)
             if not st.session_state["graph"]:
                 st.session_state["graph"] = uploaded_data
-                st.session_state["node_names"] = list(uploaded_data.keys())
+                graph_changed()
+                # Nodes that only appear as neighbours are nodes too
+                st.session_state["node_names"] = list(dict.fromkeys(
+                    [*uploaded_data, *(neighbor for neighbors in uploaded_data.values() for neighbor in neighbors)]
+                ))
 
             st.sidebar.success("JSON file loaded! You can now edit the graph dynamically.")
         except Exception as e:
@@ -78,7 +101,7 @@ def dijkstra_page():
     # Manual input for nodes and connections
     if not uploaded_file:
         num_nodes = st.sidebar.number_input(
-            "How many nodes are in the graph?", min_value=2, max_value=MAX_NODES, step=1, value=3
+            "How many nodes are in the graph?", min_value=2, step=1, value=3
         )
         node_names_input = st.sidebar.text_area(
             "Enter the names of the nodes (comma-separated, e.g., A,B,C):",
@@ -94,82 +117,88 @@ def dijkstra_page():
             else:
                 st.session_state["node_names"] = node_names
                 st.session_state["graph"] = {node: {} for node in node_names}
+                graph_changed()
                 st.sidebar.success("Node names added!")
     
-    # Main UI for defining nodes and connections
+    # Edge table: one editable page of edges instead of one widget per edge
     node_names = st.session_state["node_names"]
+    node_options = len(node_names) <= NODE_OPTION_LIMIT
     if node_names:
-        for node in node_names:
-            st.sidebar.markdown(f"### Define connections for {node}")
-
-            # Available neighbors are all nodes except the current node
-            available_neighbors = [n for n in node_names if n != node]
-
-            # Get default neighbors from the graph
-            default_neighbors = list(st.session_state["graph"].get(node, {}).keys())
-
-            # Multiselect for neighbors
-            neighbors = st.sidebar.multiselect(
-                f"Select neighbors for {node}:",
-                options=available_neighbors,
-                default=default_neighbors,
-                key=f"neighbors_{node}",
-                on_change=update_graph,
-                args=(node,),
-            )
-
-            # Input distances for each selected neighbor
-            for neighbor in neighbors:
-                distance_key = f"distance_{node}_{neighbor}"
-
-                # Initialize distance entry in the graph if not already set
-                if node not in st.session_state["graph"]:
-                    st.session_state["graph"][node] = {}
-                if neighbor not in st.session_state["graph"][node]:
-                    st.session_state["graph"][node][neighbor] = 1  # Default distance
-
-                # Use the number_input widget's return value directly
-                distance = st.sidebar.number_input(
-                    f"Distance from {node} to {neighbor}:",
-                    min_value=1,
-                    value=st.session_state["graph"][node][neighbor],
-                    key=distance_key,
-                )
-
-                # Update the graph dynamically with the new distance
-                st.session_state["graph"][node][neighbor] = distance
-                st.session_state["graph"].setdefault(neighbor, {})[node] = distance  # Ensure bidirectional consistency
+        st.markdown("### Edges")
+
+        def node_column(label):
+            if node_options:
+                return st.column_config.SelectboxColumn(label, options=node_names, required=True)
+            # Names of large graphs are typed; graph_from_edges rejects unknown ones when applied
+            return st.column_config.TextColumn(label, required=True)
+
+        edges = graph_views()["edges"]
+        start, stop = page_window("Edges", len(edges), PAGE_ROWS, "edges_page")
+        page = edges.iloc[start:stop].reset_index(drop=True)
+        form = st.form(f"edge_form_{st.session_state['edge_version']}")
+        edited = form.data_editor(
+            page,
+            num_rows="dynamic",
+            hide_index=True,
+            column_config={
+                "From": node_column("From"),
+                "To": node_column("To"),
+                "Distance": st.column_config.NumberColumn("Distance", min_value=0, required=True),
+            },
+            key=f"edge_editor_{st.session_state['edge_version']}",
+        )
+        submitted = form.form_submit_button("Apply edge changes")
+        if submitted:
+            graph, skipped = graph_from_edges(pd.concat([edges.iloc[:start], edited, edges.iloc[stop:]]), node_names)
+            st.session_state["graph"] = graph
+            # The new edge version drops the applied edits from the widget state
+            graph_changed()
+            st.session_state["edge_notice"] = skipped
+            st.rerun()
+        skipped = st.session_state.pop("edge_notice", 0)
+        if skipped:
+            st.warning(f"Skipped {skipped} edge rows with a missing or unknown node, a self-loop or a negative distance.")
 
     # Display the graph dynamically
     if st.session_state["graph"]:
-        # Compute the bidirectional graph dynamically
-        bidirectional_graph = compute_bidirectional_graph(st.session_state["graph"])
+        # The bidirectional graph is only rebuilt after an edit
+        views = graph_views()
+        bidirectional_graph = views["bidirectional"]
         st.markdown("### Graph Representation (Bidirectional)")
-        st.json(bidirectional_graph)
+        if len(bidirectional_graph) <= JSON_NODE_LIMIT:
+            st.json(bidirectional_graph)
+        else:
+            st.write(f"{len(bidirectional_graph)} nodes and {views['edge_count']} edges; download the JSON to see the whole graph.")
 
         # Download button for graph JSON
         st.download_button(
             label="Download Graph as JSON",
-            data=json.dumps(bidirectional_graph, indent=2),
+            data=views["json"],
             file_name="graph.json",
             mime="application/json",
         )
             
+    # Optional performance panel and profiler
+    show_panel, profile = performance_options("dijkstra")
+
     # Shortest path calculation
     if node_names and st.session_state["graph"]:
         st.markdown("### Shortest Path Calculation")
-        start_node = st.selectbox("Select the start node:", [""] + node_names)
-        end_node = st.selectbox(
-            "Select the end node:", [""] + [node for node in node_names if node != start_node]
-        )
+        if node_options:
+            start_node = st.selectbox("Select the start node:", [""] + node_names)
+            end_node = st.selectbox(
+                "Select the end node:", [""] + [node for node in node_names if node != start_node]
+            )
+        else:
+            # Large graphs take typed names instead of sending every node as an option
+            start_node = st.text_input("Type the start node:").strip()
+            end_node = st.text_input("Type the end node:").strip()
 
         if st.button("Calculate Shortest Path"):
             if not start_node or not end_node:
                 st.error("Please select both a start and end node.")
             else:
-                # Use the bidirectional graph for the calculation
-                bidirectional_graph = compute_bidirectional_graph(st.session_state["graph"])
-
+                # Reuse the bidirectional graph computed for display in this run
                 # Check if start and end nodes are connected
                 if start_node not in bidirectional_graph or end_node not in bidirectional_graph:
                     st.error("Start or end node not found in the graph!")
@@ -180,13 +209,24 @@ def dijkstra_page():
                 else:
                     try:
                         # Calculate shortest path
-                        distance, shortest_path = dijkstra(bidirectional_graph, start_node, end_node)
+                        # Reuse shortest-path trees from earlier queries on the same graph
+                        stats = SolverStats()
+                        with profiling(stats, profile):
+                            if st.session_state["path_cache"] is None:
+                                with stats.phase("graph conversion"):
+                                    st.session_state["path_cache"] = ShortestPathCache(bidirectional_graph)
+                            with stats.phase("search"):
+                                distance, shortest_path = st.session_state["path_cache"].query(
+                                    start_node, end_node, stats if show_panel else None,
+                                )
                         
                         # Handle unreachable nodes
                         if distance == float('infinity'):
                             st.error(f"No path exists between {start_node} and {end_node}.")
                         else:
-                            st.success(f"Shortest Path: {' → '.join(shortest_path)} (Distance: {distance})")
+                            st.success(f"Shortest Path: {' → '.join(shortest_path)} (Distance: {distance:g})")
+                        if show_panel:
+                            show_performance(stats)
                     except Exception as e:
                         st.error(f"Error during shortest path calculation: {e}")
                 
@@ -0,0 +1,43 @@
+import streamlit as st
+from algorithms.stats import SolverStats
+
+PROFILE_CHOICES = {"Off": None, "cProfile": "cprofile", "tracemalloc": "tracemalloc"}
+
+def performance_options(key):
+    """
+    Sidebar controls of the optional performance panel.
+
+    Returns (enabled, profile mode or None); `key` keeps the widgets of
+    different pages apart.
+    """
+    st.sidebar.markdown("---")
+    enabled = st.sidebar.checkbox("Show performance panel", key=f"{key}_performance")
+    if not enabled:
+        return False, None
+    choice = st.sidebar.selectbox("Profile the solve with:", list(PROFILE_CHOICES), key=f"{key}_profile")
+    return True, PROFILE_CHOICES[choice]
+
+def show_performance(*stats):
+    """
+    Render the phase timings, counters and profile of one or more SolverStats.
+    """
+    import pandas as pd
+
+    combined = SolverStats()
+    for part in stats:
+        if part is not None:
+            combined.update(part)
+
+    with st.expander("Performance", expanded=True):
+        if combined.timings:
+            st.dataframe(pd.DataFrame(
+                {"milliseconds": [seconds * 1000 for seconds in combined.timings.values()]},
+                index=pd.Index(list(combined.timings), name="phase"),
+            ))
+        if combined.counters:
+            st.dataframe(pd.DataFrame(
+                {"value": list(combined.counters.values())},
+                index=pd.Index(list(combined.counters), name="counter"),
+            ))
+        if combined.profile:
+            st.code(combined.profile)
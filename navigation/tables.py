@@ -0,0 +1,107 @@
+import streamlit as st
+import pandas as pd
+
+# Rows and columns of a table sent to the browser at once
+PAGE_ROWS = 100
+PAGE_COLUMNS = 30
+
+def page_slice(total, page, size):
+    """
+    Return (start, stop, pages) of the 1-based `page` of `size` items, clamped to the existing pages.
+    """
+    pages = max(-(-total // size), 1)
+    page = min(max(int(page), 1), pages)
+    start = (page - 1) * size
+    return start, min(start + size, total), pages
+
+def page_window(label, total, size, key, container=st):
+    """
+    Page picker for `total` items; returns the (start, stop) of the chosen page.
+
+    No widget is shown when everything fits on one page.
+    """
+    if total <= size:
+        return 0, total
+    pages = -(-total // size)
+    page = container.number_input(f"{label} page (1-{pages}):", min_value=1, max_value=pages, value=1, key=key)
+    start, stop, _ = page_slice(total, page, size)
+    container.caption(f"{label} {start + 1}-{stop} of {total}")
+    return start, stop
+
+def paginated_matrix(matrix, names, key, extra_columns=None, rows=PAGE_ROWS, columns=PAGE_COLUMNS):
+    """
+    Return one page of a labelled square matrix as a DataFrame.
+
+    Only the visible block is copied out of `matrix`, so the work and the
+    browser payload depend on the page size, not on the matrix size.
+    `extra_columns` ({name: one value per row}) are appended to every
+    column page, e.g. the demands.
+    """
+    left, right = st.columns(2)
+    with left:
+        row_start, row_stop = page_window("Rows", len(names), rows, f"{key}_row_page")
+    with right:
+        column_start, column_stop = page_window("Columns", len(names), columns, f"{key}_column_page")
+    page = pd.DataFrame(
+        matrix[row_start:row_stop, column_start:column_stop],
+        index=names[row_start:row_stop], columns=names[column_start:column_stop],
+    )
+    for name, values in (extra_columns or {}).items():
+        page[name] = values[row_start:row_stop]
+    return page
+
+def tours_table(routes, names, evaluation, max_capacity, start=0, stop=None):
+    """
+    One row per tour: stops, route, distance, load and utilization.
+
+    Only tours start..stop are built, numbered from start + 1, so a page of
+    a long route list costs the page and not the whole list.
+    """
+    stop = len(routes) if stop is None else min(stop, len(routes))
+    depot_name = names[-1]
+    page = routes[start:stop]
+    return pd.DataFrame({
+        "Stops": [len(route) for route in page],
+        "Route": [" -> ".join([depot_name] + [names[node] for node in route] + [depot_name]) for route in page],
+        "Distance": evaluation["cost"][start:stop],
+        "Load": evaluation["load"][start:stop],
+        "Capacity": max_capacity,
+        "Utilization": evaluation["utilization"][start:stop],
+    }, index=pd.RangeIndex(start + 1, stop + 1, name="Tour"))
+
+def edge_frame(graph):
+    """
+    List the undirected edges of a dict-of-dicts graph as a From/To/Distance DataFrame.
+
+    Each edge appears once, in the direction it is first met; when both
+    directions are given with different distances the later one wins, as
+    in the bidirectional view of the page.
+    """
+    edges = {}
+    for node, neighbors in graph.items():
+        for neighbor, distance in neighbors.items():
+            edge = (neighbor, node) if (neighbor, node) in edges else (node, neighbor)
+            edges[edge] = distance
+    return pd.DataFrame(
+        [(first, second, distance) for (first, second), distance in edges.items()],
+        columns=["From", "To", "Distance"],
+    )
+
+def graph_from_edges(edges, node_names):
+    """
+    Build a bidirectional dict-of-dicts graph from a From/To/Distance table.
+
+    Rows with a missing or unknown node, a self-loop or a negative or
+    missing distance are skipped; zero-weight edges are kept, as Dijkstra
+    allows them. Returns (graph, number of skipped rows).
+    """
+    graph = {node: {} for node in node_names}
+    skipped = 0
+    for first, second, distance in edges[["From", "To", "Distance"]].itertuples(index=False):
+        if pd.isna(distance) or distance < 0 or first not in graph or second not in graph or first == second:
+            skipped += 1
+            continue
+        distance = distance.item() if hasattr(distance, "item") else distance
+        graph[first][second] = distance
+        graph[second][first] = distance
+    return graph, skipped
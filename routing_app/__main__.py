@@ -0,0 +1,84 @@
+import argparse
+import json
+import sys
+from routing_app.batch import INPUTS, OUTPUTS, load_instances, solve_many, write_results
+from routing_app.store import DEFAULT_MAX_BYTES, ResultStore
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m routing_app", description="Headless routing solver.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve = commands.add_parser("solve", help="Solve a directory or manifest of Clark-Wright instances.")
+    solve.add_argument("source", help="Directory of instance files, or a .json / .jsonl / .csv manifest.")
+    solve.add_argument("--capacity", type=float, help="Maximum capacity per tour, unless set per instance.")
+    solve.add_argument("--input", choices=INPUTS, default="matrix", help="Instance type (default: matrix).")
+    solve.add_argument("--metric", choices=("haversine", "euclidean"), default="haversine",
+                       help="Distance metric for coordinate instances.")
+    solve.add_argument("--improve", type=float, default=0.0, help="Local search seconds per instance (0 = off).")
+    solve.add_argument("--sweep", action="store_true", help="Keep the best plan of the savings parameter sweep.")
+    solve.add_argument("--max-duration", type=float,
+                       help="Maximum route duration, unless set per instance (uses the constrained merge).")
+    solve.add_argument("--workers", type=int, help="Worker processes (default: one per CPU).")
+    solve.add_argument("--output", choices=OUTPUTS, default="jsonl", help="Result format (default: jsonl).")
+    solve.add_argument("-o", "--out", help="Write results to this file instead of standard output.")
+    solve.add_argument("--store", help="SQLite result store; unchanged instances are answered from it.")
+    solve.add_argument("--store-matrices", action="store_true",
+                       help="Also keep completed distance matrices in the store, so unchanged files skip parsing.")
+    solve.add_argument("--store-max-mb", type=float, default=DEFAULT_MAX_BYTES / 1024 ** 2,
+                       help="Disk budget of the store; least recently used entries are evicted (default: 1024).")
+
+    serve = commands.add_parser("serve", help="Serve shortest paths and Clark-Wright routes over HTTP.")
+    serve.add_argument("--graph", help="Graph JSON {node: {neighbor: weight}}, as exported by the Dijkstra page.")
+    serve.add_argument("--matrix", help="Distance matrix with demands in any supported format.")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--workers", type=int, help="Worker processes (default: one per CPU).")
+    serve.add_argument("--batch-window-ms", type=float, default=2.0,
+                       help="Shortest-path requests within this window share one search per source.")
+    serve.add_argument("--p99-target-ms", type=float, help="Latency target reported in /stats.")
+    return parser
+
+def run_service(args):
+    from algorithms.ingest import read_distance_matrix
+    from routing_app.service import RoutingService, serve
+
+    graph = None
+    if args.graph:
+        with open(args.graph) as file:
+            graph = json.load(file)
+    names = distances = demands = None
+    if args.matrix:
+        names, distances, demands, missing = read_distance_matrix(args.matrix)
+        if len(missing):
+            raise SystemExit(f"{len(missing)} distances are still missing in {args.matrix}.")
+    service = RoutingService(
+        graph, distances, demands, names, workers=args.workers, batch_window=args.batch_window_ms / 1000,
+        p99_target=None if args.p99_target_ms is None else args.p99_target_ms / 1000,
+    )
+    print(f"Serving on http://{args.host}:{args.port}", file=sys.stderr)
+    serve(service, args.host, args.port)
+    return 0
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "serve":
+        return run_service(args)
+    instances = load_instances(
+        args.source, capacity=args.capacity, input=args.input, metric=args.metric,
+        improve=args.improve, sweep=args.sweep, max_duration=args.max_duration,
+    )
+    store = None
+    if args.store:
+        store = ResultStore(args.store, max_bytes=int(args.store_max_mb * 1024 ** 2), keep_matrices=args.store_matrices)
+    records = solve_many(instances, workers=args.workers, store=store)
+    if args.out:
+        with open(args.out, "w", newline="") as file:
+            failed = write_results(records, file, args.output)
+    else:
+        failed = write_results(records, sys.stdout, args.output)
+    if failed:
+        print(f"{failed} of {len(instances)} instances failed.", file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+import csv
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from io import BytesIO
+import numpy as np
+from algorithms.clark_wright import clark_wright, merge_routes
+from algorithms.constrained import constrained_clark_wright
+from algorithms.geo import (
+    COORDINATE_MATRIX_LIMIT, COORDINATE_NEIGHBORS, coordinate_savings, pairwise_distances, route_lengths,
+)
+from algorithms.ingest import FORMATS, detect_format, read_coordinates, read_distance_matrix
+from algorithms.local_search import improve_routes
+from algorithms.routes import evaluate_routes
+from algorithms.sweep import sweep_clark_wright
+from routing_app.store import fingerprint
+
+INPUTS = ("matrix", "coordinates")
+OUTPUTS = ("jsonl", "csv")
+MANIFEST_SUFFIXES = (".json", ".jsonl", ".csv")
+
+# Instance fields that switch to the constrained merge; lists may be given as JSON strings (CSV manifests)
+CONSTRAINTS = ("fleet", "time_windows", "service_times", "max_duration")
+
+# Columns of the CSV output, one row per tour (or one row per failed instance)
+CSV_COLUMNS = ("id", "status", "tour", "stops", "load", "utilization", "cost", "route", "vehicle", "error")
+
+def discover_instances(directory, **defaults):
+    """
+    List the instance files of a directory (every supported matrix format), sorted by name.
+
+    `defaults` (capacity, input, metric, ...) are copied into every instance.
+    """
+    instances = []
+    for entry in sorted(os.listdir(directory)):
+        path = os.path.join(directory, entry)
+        stem, suffix = os.path.splitext(entry)
+        if os.path.isfile(path) and suffix.lstrip(".").lower() in FORMATS:
+            instances.append({**defaults, "id": stem, "path": path})
+    return instances
+
+def read_manifest(path, **defaults):
+    """
+    Read a manifest of instances from a .json list, a .jsonl file or a .csv table.
+
+    Each entry needs a `path`, relative to the manifest's directory, and may
+    override id, capacity, input, format, metric, improve and sweep, and set
+    the constraints fleet, time_windows, service_times and max_duration.
+    Missing fields fall back to `defaults`.
+    """
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix not in MANIFEST_SUFFIXES:
+        raise ValueError(f"Unsupported manifest '{path}'. Use one of: {', '.join(MANIFEST_SUFFIXES)}.")
+    with open(path, newline="") as file:
+        if suffix == ".json":
+            entries = json.load(file)
+        elif suffix == ".jsonl":
+            entries = [json.loads(line) for line in file if line.strip()]
+        else:
+            entries = [{key: value for key, value in row.items() if value not in (None, "")} for row in csv.DictReader(file)]
+
+    base = os.path.dirname(os.path.abspath(path))
+    instances = []
+    for number, entry in enumerate(entries, start=1):
+        if "path" not in entry:
+            raise ValueError(f"Manifest entry {number} has no path.")
+        instance = {**defaults, **entry, "path": os.path.join(base, entry["path"])}
+        instance.setdefault("id", os.path.splitext(os.path.basename(entry["path"]))[0])
+        instances.append(instance)
+    return instances
+
+def load_instances(path, **defaults):
+    """
+    Return the instances of a directory or of a manifest file.
+    """
+    if os.path.isdir(path):
+        return discover_instances(path, **defaults)
+    return read_manifest(path, **defaults)
+
+def _read_matrix(instance, store=None):
+    """
+    Read and complete an instance's matrix, reusing the completed copy of an unchanged file from the store.
+    """
+    if store is None or not store.keep_matrices:
+        names, distances, demands, missing = read_distance_matrix(instance["path"], fmt=instance.get("format"))
+    else:
+        with open(instance["path"], "rb") as file:
+            data = file.read()
+        fmt = detect_format(instance["path"], instance.get("format"))
+        source_key = f"{fmt}:{hashlib.sha256(data).hexdigest()}"
+        stored = store.load_matrix(source_key)
+        if stored is not None:
+            return stored
+        names, distances, demands, missing = read_distance_matrix(BytesIO(data), fmt=fmt)
+        if not len(missing):
+            store.save_matrix(source_key, names, distances, demands)
+    if len(missing):
+        raise ValueError(f"{len(missing)} distances are still missing.")
+    return names, distances, demands
+
+def _constraints(instance):
+    """
+    Return the instance's constrained_clark_wright arguments, or None when it sets no constraint.
+
+    Without a fleet, `capacity` becomes one type with unlimited vehicles.
+    """
+    constraints = {}
+    for field in CONSTRAINTS:
+        value = instance.get(field)
+        if value is not None and value != "":
+            constraints[field] = json.loads(value) if isinstance(value, str) and field != "max_duration" else value
+    if not constraints:
+        return None
+    if "max_duration" in constraints:
+        constraints["max_duration"] = float(constraints["max_duration"])
+    if "fleet" not in constraints:
+        if instance.get("capacity") is None:
+            raise ValueError("No capacity or fleet given for this instance.")
+        constraints["fleet"] = [{"name": "vehicle", "capacity": float(instance["capacity"])}]
+    return constraints
+
+def _solve(instance, store=None):
+    """
+    Solve one instance; returns (names, routes, evaluation, sweep parameters or None, cached).
+
+    With a ResultStore, an instance whose fingerprint is already stored is
+    answered from it, and new results are saved.
+    """
+    constraints = _constraints(instance)
+    capacity = instance.get("capacity")
+    if constraints is not None:
+        capacity = max(vehicle["capacity"] for vehicle in constraints["fleet"]) if constraints["fleet"] else 0
+    elif capacity is None:
+        raise ValueError("No capacity given for this instance.")
+    capacity = float(capacity)
+    improve = float(instance.get("improve") or 0)
+    sweep = str(instance.get("sweep", False)).lower() in ("1", "true", "yes")
+    input_type = instance.get("input") or "matrix"
+    if input_type not in INPUTS:
+        raise ValueError(f"Unknown input '{input_type}'. Use one of: {', '.join(INPUTS)}.")
+    if constraints is not None and (improve > 0 or sweep):
+        raise ValueError("Local search and the sweep ignore fleets, time windows and durations; turn them off.")
+
+    options = {"input": input_type, "improve": improve, "sweep": sweep}
+    if constraints is not None:
+        options["constraints"] = constraints
+    if input_type == "coordinates":
+        options["metric"] = metric = instance.get("metric") or "haversine"
+        names, points, demands = read_coordinates(instance["path"])
+        data = points
+    else:
+        names, distances, demands = _read_matrix(instance, store)
+        data = distances
+
+    key = None
+    if store is not None:
+        key = fingerprint(data, demands, capacity, options)
+        stored = store.lookup(key)
+        if stored is not None:
+            return (names, *stored, True)
+
+    params = None
+    if constraints is not None:
+        if input_type == "coordinates":
+            if len(names) > COORDINATE_MATRIX_LIMIT:
+                raise ValueError(f"Constrained instances need a distance matrix; use at most {COORDINATE_MATRIX_LIMIT} nodes.")
+            distances = pairwise_distances(points, metric=metric)
+        routes, vehicles = constrained_clark_wright(distances, demands, **constraints)
+        # Utilization is measured against the assigned vehicle, or the largest one when none is left
+        capacities = [constraints["fleet"][vehicle]["capacity"] if vehicle >= 0 else capacity for vehicle in vehicles.tolist()]
+        evaluation = evaluate_routes(distances, routes, demands, np.asarray(capacities, dtype=np.float64))
+        evaluation["vehicle"] = vehicles
+    elif input_type == "coordinates" and len(names) > COORDINATE_MATRIX_LIMIT:
+        first, second, _ = coordinate_savings(points, COORDINATE_NEIGHBORS, metric=metric)
+        routes = merge_routes(first, second, list(demands[:-1]), capacity)
+        costs = route_lengths(points, routes, metric=metric)
+        evaluation = evaluate_routes(None, routes, demands, capacity, costs=costs)
+    else:
+        if input_type == "coordinates":
+            distances = pairwise_distances(points, metric=metric)
+        if sweep:
+            routes, params, _ = sweep_clark_wright(distances, demands, capacity, workers=1)
+        else:
+            routes = clark_wright(distances, demands, capacity)
+        if improve > 0:
+            routes, _ = improve_routes(routes, distances, demands, capacity, time_budget=improve)
+        evaluation = evaluate_routes(distances, routes, demands, capacity)
+
+    if store is not None:
+        store.save(key, routes, evaluation, params)
+    return names, routes, evaluation, params, False
+
+def solve_instance(instance, store=None):
+    """
+    Solve one instance dict and return a JSON-ready result record.
+
+    Errors do not propagate: the record then has status "error" and the
+    message, so one bad file does not stop a batch. With a ResultStore as
+    `store`, the record says whether it was `cached`.
+    """
+    started = time.perf_counter()
+    record = {"id": instance.get("id"), "path": instance.get("path"), "status": "ok"}
+    try:
+        names, routes, evaluation, params, cached = _solve(instance, store)
+    except Exception as error:
+        record.update(status="error", error=f"{type(error).__name__}: {error}")
+    else:
+        record.update(
+            tours=len(routes),
+            total_cost=float(evaluation["cost"].sum()),
+            routes=[[str(names[node]) for node in route] for route in routes],
+            costs=evaluation["cost"].tolist(),
+            loads=evaluation["load"].tolist(),
+            utilization=evaluation["utilization"].tolist(),
+        )
+        if params is not None:
+            record["params"] = params
+        if "vehicle" in evaluation:
+            fleet = _constraints(instance)["fleet"]
+            record["vehicles"] = [
+                fleet[vehicle].get("name", str(vehicle)) if vehicle >= 0 else None for vehicle in evaluation["vehicle"].tolist()
+            ]
+        if store is not None:
+            record["cached"] = cached
+    record["seconds"] = time.perf_counter() - started
+    return record
+
+def solve_many(instances, workers=None, store=None):
+    """
+    Solve instances on a process pool, yielding result records in input order.
+
+    Records are yielded as soon as they and every earlier instance are done,
+    so output can be streamed. `workers=1` solves in this process. A
+    ResultStore is shared by all workers, each with its own connection.
+    """
+    instances = list(instances)
+    workers = min(workers or os.cpu_count() or 1, max(len(instances), 1))
+    solve = partial(solve_instance, store=store)
+    if workers == 1:
+        yield from map(solve, instances)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(solve, instances)
+
+def csv_rows(record):
+    """
+    Flatten a result record into CSV rows, one per tour.
+    """
+    if record["status"] != "ok":
+        return [{"id": record["id"], "status": record["status"], "error": record["error"]}]
+    vehicles = record.get("vehicles") or [None] * len(record["routes"])
+    return [
+        {
+            "id": record["id"], "status": "ok", "tour": number, "stops": len(route),
+            "load": load, "utilization": round(utilization, 6), "cost": cost, "route": " -> ".join(route),
+            "vehicle": vehicle,
+        }
+        for number, (route, cost, load, utilization, vehicle) in enumerate(
+            zip(record["routes"], record["costs"], record["loads"], record["utilization"], vehicles), start=1
+        )
+    ]
+
+def write_results(records, file, output="jsonl"):
+    """
+    Stream result records to an open text file as JSON Lines or CSV.
+
+    Returns the number of failed instances.
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f"Unknown output '{output}'. Use one of: {', '.join(OUTPUTS)}.")
+    failed = 0
+    writer = None
+    if output == "csv":
+        writer = csv.DictWriter(file, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+    for record in records:
+        failed += record["status"] != "ok"
+        if writer is None:
+            file.write(json.dumps(record) + "\n")
+        else:
+            writer.writerows(csv_rows(record))
+        file.flush()
+    return failed
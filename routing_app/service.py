@@ -0,0 +1,341 @@
+import asyncio
+import json
+import os
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+import numpy as np
+from algorithms.clark_wright import clark_wright
+from algorithms.dijkstra import _backtrack, _search
+from algorithms.graph import CSRGraph
+from algorithms.parallel import attach_arrays, shared_arrays
+from algorithms.routes import evaluate_routes
+
+# Shortest-path requests arriving within this many seconds share one search per source
+BATCH_WINDOW = 0.002
+# A batch is flushed early once this many requests are waiting
+MAX_BATCH = 256
+# Latency samples kept per endpoint for the percentiles of /stats
+LATENCY_SAMPLES = 10000
+# Request bodies above this size are rejected
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+# Paths with their own latency statistics; every other path is recorded as "other"
+ENDPOINTS = ("/health", "/stats", "/shortest-path", "/clark-wright")
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+# Per-process state of pool workers, set once by the pool initializer
+_worker_blocks = []
+_worker_graph = None
+_worker_matrix = None
+_worker_demands = None
+
+def _init_service_worker(spec):
+    global _worker_blocks, _worker_graph, _worker_matrix, _worker_demands
+    _worker_blocks, arrays = attach_arrays(spec)
+    if "indptr" in arrays:
+        _worker_graph = CSRGraph(None, arrays["indptr"], arrays["indices"], arrays["weights"])
+    _worker_matrix = arrays.get("distances")
+    _worker_demands = arrays.get("demands")
+
+def _paths_from(source, targets):
+    """
+    One search from `source` that stops once every target is settled; returns [(distance, path ids)].
+    """
+    distances, predecessors = _search(_worker_graph, source, set(targets))
+    return [
+        (distances[target], _backtrack(predecessors, target) if distances[target] != float('inf') else [])
+        for target in targets
+    ]
+
+def _solve_routes(max_capacity, distance_matrix=None, demands=None):
+    """
+    Run clark_wright on the given matrix, or on the warm one, and evaluate the routes.
+    """
+    if distance_matrix is None:
+        distance_matrix, demands = _worker_matrix, _worker_demands
+    routes = clark_wright(distance_matrix, demands, max_capacity)
+    evaluation = evaluate_routes(distance_matrix, routes, demands, max_capacity)
+    return routes, {key: values.tolist() for key, values in evaluation.items()}
+
+class LatencyStats:
+    """
+    Rolling request latencies per endpoint with p50/p95/p99 summaries.
+
+    With a `p99_target` in seconds, each summary also says whether the
+    endpoint's p99 is within it.
+    """
+
+    def __init__(self, samples=LATENCY_SAMPLES, p99_target=None):
+        self.samples = defaultdict(lambda: deque(maxlen=samples))
+        self.counts = defaultdict(int)
+        self.p99_target = p99_target
+
+    def record(self, endpoint, seconds):
+        self.samples[endpoint].append(seconds)
+        self.counts[endpoint] += 1
+
+    def summary(self):
+        summary = {}
+        for endpoint, samples in self.samples.items():
+            p50, p95, p99 = np.percentile(np.fromiter(samples, dtype=np.float64), [50, 95, 99]) * 1000
+            summary[endpoint] = {
+                "requests": self.counts[endpoint],
+                "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+            }
+            if self.p99_target is not None:
+                summary[endpoint]["within_p99_target"] = bool(p99 <= self.p99_target * 1000)
+        return summary
+
+class RoutingService:
+    """
+    Asyncio HTTP service for shortest paths and Clark-Wright routes on warm, in-process data.
+
+    The graph (CSRGraph or dict-of-dicts) and the optional distance matrix
+    are loaded once and shared with a process pool through shared memory, so
+    solves never block the event loop. Shortest-path requests that arrive
+    within `batch_window` seconds are grouped by source and answered by one
+    one-to-many search per source. Endpoints:
+
+    - POST /shortest-path {"source", "target"} -> {"distance", "path"}
+    - POST /clark-wright {"capacity", optional "distances" and "demands"} -> routes
+    - GET /health and GET /stats (latency percentiles and batching counters)
+
+    `p99_target` (seconds) is reported against the measured p99 in /stats.
+    """
+
+    def __init__(self, graph=None, distance_matrix=None, demands=None, names=None,
+                 workers=None, batch_window=BATCH_WINDOW, max_batch=MAX_BATCH, p99_target=None):
+        if graph is not None and not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_dict(graph)
+        self.graph = graph
+        self.distance_matrix = None if distance_matrix is None else np.asarray(distance_matrix)
+        self.demands = None if demands is None else np.asarray(demands, dtype=np.float64)
+        self.names = names
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.latency = LatencyStats(p99_target=p99_target)
+        self.searches = 0
+        self.batched_requests = 0
+        self._pending = defaultdict(list)
+        self._pending_count = 0
+        self._flush_handle = None
+        self._searches = set()
+        self._resources = ExitStack()
+        self._pool = None
+        self._server = None
+
+    def start_pool(self):
+        """
+        Copy the warm data into shared memory and start the worker processes.
+        """
+        arrays = {}
+        if self.graph is not None:
+            arrays.update(indptr=self.graph.indptr, indices=self.graph.indices, weights=self.graph.weights)
+        if self.distance_matrix is not None:
+            arrays.update(distances=self.distance_matrix, demands=self.demands)
+        with ExitStack() as resources:
+            spec = resources.enter_context(shared_arrays(arrays))
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_service_worker, initargs=(spec,))
+            resources.callback(pool.shutdown, cancel_futures=True)
+            # Start the workers now: forked later, they would inherit open client sockets
+            for future in [pool.submit(os.getpid) for _ in range(self.workers)]:
+                future.result()
+            # Only a fully started pool keeps its shared memory past this block
+            self._resources = resources.pop_all()
+        self._pool = pool
+
+    def close_pool(self):
+        """
+        Shut the workers down and release the shared memory.
+        """
+        self._pool = None
+        self._resources.close()
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """
+        Start the pool and listen; returns the asyncio server (port 0 picks a free port).
+        """
+        self.start_pool()
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        # Queries still inside the batch window would otherwise wait forever
+        for waiting in self._pending.values():
+            for _, future in waiting:
+                if not future.done():
+                    future.cancel()
+        self._pending = defaultdict(list)
+        self._pending_count = 0
+        for task in list(self._searches):
+            task.cancel()
+        await asyncio.gather(*self._searches, return_exceptions=True)
+        self.close_pool()
+
+    # ------- Shortest-path batching -------
+    async def shortest_path(self, source, target):
+        """
+        Queue one query for the next batch and wait for its (distance, path of names).
+        """
+        if self.graph is None:
+            raise ValueError("No graph is loaded.")
+        index = self.graph.index
+        for node in (source, target):
+            if node not in index:
+                raise ValueError(f"Unknown node '{node}'.")
+        future = asyncio.get_running_loop().create_future()
+        self._pending[index[source]].append((index[target], future))
+        self._pending_count += 1
+        if self._pending_count >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        distance, path = await future
+        return distance, [self.graph.names[node] for node in path]
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending, self._pending_count = self._pending, defaultdict(list), 0
+        for source, waiting in pending.items():
+            self.searches += 1
+            self.batched_requests += len(waiting)
+            # Keep a reference so the task is not collected mid-flight
+            task = asyncio.ensure_future(self._run_search(source, waiting))
+            self._searches.add(task)
+            task.add_done_callback(self._searches.discard)
+
+    async def _run_search(self, source, waiting):
+        targets = list(dict.fromkeys(target for target, _ in waiting))
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self._pool, _paths_from, source, targets)
+        except asyncio.CancelledError:
+            for _, future in waiting:
+                future.cancel()
+            raise
+        except Exception as error:
+            for _, future in waiting:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        by_target = dict(zip(targets, results))
+        for target, future in waiting:
+            if not future.done():
+                future.set_result(by_target[target])
+
+    # ------- Clark-Wright -------
+    async def clark_wright(self, capacity, distance_matrix=None, demands=None):
+        """
+        Solve on the warm matrix, or on one sent with the request, in the worker pool.
+        """
+        names = self.names
+        if distance_matrix is None:
+            if self.distance_matrix is None:
+                raise ValueError("No distance matrix is loaded; send distances and demands.")
+        else:
+            distance_matrix = np.asarray(distance_matrix, dtype=np.float64)
+            if demands is None or distance_matrix.ndim != 2 or len(distance_matrix) != len(demands):
+                raise ValueError("Send a square distances matrix and one demand per node, depot last.")
+            names = None
+        loop = asyncio.get_running_loop()
+        routes, evaluation = await loop.run_in_executor(
+            self._pool, _solve_routes, float(capacity), distance_matrix, demands,
+        )
+        if names is not None:
+            routes = [[names[node] for node in route] for route in routes]
+        return {"routes": routes, "total_cost": sum(evaluation["cost"]), **evaluation}
+
+    def stats(self):
+        return {
+            "latency": self.latency.summary(),
+            "searches": self.searches,
+            "batched_requests": self.batched_requests,
+            "mean_batch_size": self.batched_requests / self.searches if self.searches else 0.0,
+        }
+
+    # ------- HTTP -------
+    async def _route(self, method, path, body):
+        if path == "/health":
+            return 200, {"status": "ok", "nodes": 0 if self.graph is None else len(self.graph)}
+        if path == "/stats":
+            return 200, self.stats()
+        if path not in ("/shortest-path", "/clark-wright"):
+            return 404, {"error": f"No endpoint {path}."}
+        if method != "POST":
+            return 405, {"error": f"{path} expects POST."}
+        request = json.loads(body or b"{}")
+        if path == "/shortest-path":
+            distance, route = await self.shortest_path(request["source"], request["target"])
+            return 200, {"distance": None if distance == float('inf') else distance, "path": route}
+        return 200, await self.clark_wright(request["capacity"], request.get("distances"), request.get("demands"))
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                started = time.perf_counter()
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    status, payload = 400, {"error": "Request body is too large."}
+                    body = None
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    path = target.split("?", 1)[0]
+                    try:
+                        status, payload = await self._route(method, path, body)
+                    except (ValueError, KeyError, TypeError) as error:
+                        status, payload = 400, {"error": str(error) if not isinstance(error, KeyError) else f"Missing field {error}."}
+                    except Exception as error:
+                        status, payload = 500, {"error": f"{type(error).__name__}: {error}"}
+                    self.latency.record(path if path in ENDPOINTS else "other", time.perf_counter() - started)
+
+                data = json.dumps(payload).encode()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close" and body is not None
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+def serve(service, host="127.0.0.1", port=8080):
+    """
+    Run the service until interrupted.
+    """
+    async def run():
+        server = await service.start(host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await service.stop()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
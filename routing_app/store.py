@@ -0,0 +1,180 @@
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import time
+import numpy as np
+
+# Part of every fingerprint: bump it whenever a solver change alters the routes it returns
+ALGORITHM_VERSION = "1"
+# Disk budget of a store; least recently used entries are evicted beyond it
+DEFAULT_MAX_BYTES = 1024 ** 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    params TEXT
+)
+"""
+
+def _update_array(digest, values):
+    values = np.ascontiguousarray(values)
+    digest.update(f"{values.dtype.str}{values.shape}".encode())
+    digest.update(memoryview(values).cast("B"))
+
+def fingerprint(distances, demands, capacity, options=None, version=ALGORITHM_VERSION):
+    """
+    Hex key of one solve: the matrix (or coordinates), demands, capacity, solver options and version.
+
+    Arrays are hashed with their dtype and shape, so equal values stored
+    as float32 and float64 give different keys.
+    """
+    digest = hashlib.sha256()
+    _update_array(digest, distances)
+    _update_array(digest, np.asarray(demands, dtype=np.float64))
+    digest.update(json.dumps(
+        {"capacity": float(capacity), "options": options or {}, "version": version}, sort_keys=True,
+    ).encode())
+    return digest.hexdigest()
+
+def _pack(**arrays):
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+def _unpack(data):
+    with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+        return {name: arrays[name] for name in arrays.files}
+
+class ResultStore:
+    """
+    SQLite store of solved instances, looked up by fingerprint.
+
+    Routes and their evaluation are kept as compressed NumPy archives
+    (routes flattened to int32 nodes plus lengths). With `keep_matrices`,
+    parsed and completed distance matrices are kept too, keyed by the hash
+    of the raw file, so unchanged files skip parsing as well. Entries count
+    towards `max_bytes` together and the least recently used ones are
+    evicted after each save. The store can be pickled to pool workers:
+    every process opens its own connection.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, keep_matrices=False):
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.keep_matrices = keep_matrices
+        self._db = None
+        self._pid = None
+
+    def __getstate__(self):
+        return {"path": self.path, "max_bytes": self.max_bytes, "keep_matrices": self.keep_matrices}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _connection(self):
+        # Connections must not cross a fork, so a forked worker opens its own
+        if self._db is None or self._pid != os.getpid():
+            self._db = sqlite3.connect(self.path, timeout=60)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(SCHEMA)
+            self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            self._pid = os.getpid()
+        return self._db
+
+    def close(self):
+        if self._db is not None and self._pid == os.getpid():
+            self._db.close()
+        self._db = None
+
+    def _get(self, key, kind):
+        db = self._connection()
+        row = db.execute("SELECT data, params FROM entries WHERE key = ? AND kind = ?", (key, kind)).fetchone()
+        if row is not None:
+            with db:
+                db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        return row
+
+    def _put(self, key, kind, data, params=None):
+        db = self._connection()
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO entries (key, kind, accessed, size, data, params) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, time.time(), len(data), data, params),
+            )
+        self.evict()
+
+    def lookup(self, key):
+        """
+        Return the stored (routes, evaluation, params) of a fingerprint, or None.
+        """
+        row = self._get(key, "result")
+        if row is None:
+            return None
+        arrays = _unpack(row[0])
+        nodes = arrays.pop("nodes").tolist()
+        routes, start = [], 0
+        for length in arrays.pop("lengths").tolist():
+            routes.append(nodes[start:start + length])
+            start += length
+        return routes, arrays, None if row[1] is None else json.loads(row[1])
+
+    def save(self, key, routes, evaluation, params=None):
+        """
+        Store the routes, their evaluation arrays and the sweep parameters (if any) of a fingerprint.
+        """
+        data = _pack(
+            nodes=np.fromiter((node for route in routes for node in route), dtype=np.int32),
+            lengths=np.fromiter(map(len, routes), dtype=np.int32, count=len(routes)),
+            **{name: np.asarray(values) for name, values in evaluation.items()},
+        )
+        self._put(key, "result", data, None if params is None else json.dumps(params))
+
+    def load_matrix(self, source_key):
+        """
+        Return the stored (names, distances, demands) of a raw file hash, or None.
+        """
+        row = self._get(source_key, "matrix")
+        if row is None:
+            return None
+        arrays = _unpack(row[0])
+        return arrays["names"].tolist(), arrays["distances"], arrays["demands"]
+
+    def save_matrix(self, source_key, names, distances, demands):
+        """
+        Store a completed matrix; does nothing unless the store keeps matrices.
+        """
+        if self.keep_matrices:
+            self._put(source_key, "matrix", _pack(
+                names=np.asarray([str(name) for name in names]), distances=distances, demands=demands,
+            ))
+
+    def usage(self):
+        """
+        Return (entries, bytes) currently stored.
+        """
+        entries, size = self._connection().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return entries, size
+
+    def evict(self):
+        """
+        Drop least recently used entries until the store fits in max_bytes; returns how many were dropped.
+        """
+        db = self._connection()
+        _, size = self.usage()
+        if size <= self.max_bytes:
+            return 0
+        dropped = []
+        for key, entry_size in db.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            if size <= self.max_bytes:
+                break
+            dropped.append((key,))
+            size -= entry_size
+        with db:
+            db.executemany("DELETE FROM entries WHERE key = ?", dropped)
+        return len(dropped)
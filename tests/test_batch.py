@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+import subprocess
+import sys
+import numpy as np
+from routing_app.__main__ import main
+from routing_app.batch import load_instances, solve_instance, solve_many, write_results
+
+def write_instance(path, seed, customers=12):
+    rng = np.random.default_rng(seed)
+    points = rng.random((customers + 1, 2))
+    matrix = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+    demands = np.append(rng.integers(1, 10, size=customers), 0)
+    np.save(path, np.column_stack([matrix, demands]))
+
+def test_algorithms_do_not_import_streamlit():
+    """
+    Test that the solver modules load without Streamlit.
+    """
+    code = (
+        "import sys, algorithms.clark_wright, algorithms.dijkstra, routing_app.batch; "
+        "sys.exit('streamlit' in sys.modules)"
+    )
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+def test_load_instances_from_directory_and_manifest(tmp_path):
+    """
+    Test directory discovery and manifest paths relative to the manifest.
+    """
+    write_instance(tmp_path / "b.npy", 0)
+    write_instance(tmp_path / "a.npy", 1)
+    (tmp_path / "notes.txt").write_text("skip me")
+    (tmp_path / "manifest.jsonl").write_text(json.dumps({"path": "a.npy", "capacity": 15}) + "\n")
+
+    assert [instance["id"] for instance in load_instances(tmp_path, capacity=20)] == ["a", "b"]
+    [instance] = load_instances(str(tmp_path / "manifest.jsonl"), capacity=20)
+    assert instance["capacity"] == 15 and instance["path"] == str(tmp_path / "a.npy")
+
+def test_solve_many_matches_serial_and_reports_errors(tmp_path):
+    """
+    Test that pooled results come back in order and equal the in-process ones.
+    """
+    for seed in range(3):
+        write_instance(tmp_path / f"depot{seed}.npy", seed)
+    instances = load_instances(tmp_path, capacity=20) + [{"id": "missing", "path": str(tmp_path / "none.npy"), "capacity": 20}]
+
+    strip = lambda record: {key: value for key, value in record.items() if key != "seconds"}
+    pooled = [strip(record) for record in solve_many(instances, workers=2)]
+    assert pooled == [strip(solve_instance(instance)) for instance in instances]
+    assert [record["status"] for record in pooled] == ["ok", "ok", "ok", "error"]
+    assert all(max(record["loads"]) <= 20 for record in pooled[:3])
+
+def test_main_writes_csv(tmp_path):
+    """
+    Test the CLI end to end with one CSV row per tour.
+    """
+    write_instance(tmp_path / "depot.npy", 5)
+    out = tmp_path / "results.csv"
+
+    assert main(["solve", str(tmp_path), "--capacity", "25", "--workers", "1", "--output", "csv", "-o", str(out)]) == 0
+    rows = list(csv.DictReader(out.open()))
+    record = solve_instance({"id": "depot", "path": str(tmp_path / "depot.npy"), "capacity": 25})
+    assert len(rows) == record["tours"]
+    assert sum(float(row["cost"]) for row in rows) == record["total_cost"]
+
+    buffer = io.StringIO()
+    assert write_results(iter([record]), buffer) == 0
+    assert json.loads(buffer.getvalue())["routes"] == record["routes"]
+
+def test_constrained_instances(tmp_path):
+    """
+    Test that fleet and time window fields route a manifest instance through the constrained merge.
+    """
+    write_instance(tmp_path / "depot.npy", 7)
+    fleet = [{"name": "van", "capacity": 10, "count": 1}, {"name": "truck", "capacity": 25}]
+    windows = [[0, 100]] * 13
+    with open(tmp_path / "manifest.csv", "w", newline="") as file:
+        csv.writer(file).writerows([
+            ["path", "fleet", "time_windows", "max_duration"], ["depot.npy", json.dumps(fleet), json.dumps(windows), 10],
+        ])
+    [instance] = load_instances(str(tmp_path / "manifest.csv"))
+    record = solve_instance(instance)
+    assert record["status"] == "ok"
+    assert record["vehicles"].count("van") <= 1 and set(record["vehicles"]) <= {"van", "truck"}
+    assert max(record["loads"]) <= 25 and max(record["utilization"]) <= 1
+    assert sum(map(len, record["routes"])) == 12
+
+    buffer = io.StringIO()
+    write_results(iter([record]), buffer, "csv")
+    assert [row["vehicle"] for row in csv.DictReader(io.StringIO(buffer.getvalue()))] == record["vehicles"]
+
+    tight = solve_instance({**instance, "max_duration": 0.01})
+    assert tight["status"] == "error" and "cannot be served" in tight["error"]
+    assert solve_instance({**instance, "sweep": True})["status"] == "error"
@@ -0,0 +1,72 @@
+import io
+import numpy as np
+import pytest
+from algorithms.graph import CSRGraph
+from algorithms.ingest import read_distance_matrix
+from benchmarks.generators import euclidean_cvrp, grid_graph, road_graph, template_csv
+from benchmarks.imports import import_time, parse_importtime
+from benchmarks.suite import compare, measure, run_benchmarks
+
+def test_generators_are_seeded():
+    """
+    Test that equal seeds give equal instances and the depot comes last.
+    """
+    points, demands, capacity = euclidean_cvrp(50, seed=3)
+    again, _, _ = euclidean_cvrp(50, seed=3)
+    assert np.array_equal(points, again)
+    assert demands[-1] == 0 and capacity >= demands.max()
+    assert road_graph(40, seed=1) == road_graph(40, seed=1)
+
+def test_graph_generators_are_symmetric():
+    """
+    Test that grid and road graphs have every edge in both directions.
+    """
+    for graph in (grid_graph(100), road_graph(100)):
+        assert all(graph[v][u] == weight for u, edges in graph.items() for v, weight in edges.items())
+    assert len(CSRGraph.from_dict(grid_graph(100))) == 100
+
+def test_template_csv_matches_the_upload_shape():
+    """
+    Test that the generated upload completes to a symmetric matrix with demands.
+    """
+    names, distances, demands, missing = read_distance_matrix(io.BytesIO(template_csv(20, missing=0.7)), fmt="csv")
+    assert names[-1] == "Depot" and len(names) == 20
+    assert len(missing) == 0 and np.array_equal(distances, distances.T)
+    assert demands[-1] == 0
+
+def test_run_benchmarks_and_compare():
+    """
+    Test a tiny run: timing stats, peak memory and the comparison ratios.
+    """
+    stats = measure(lambda: sum(range(100)), min_rounds=5, max_time=0)
+    assert stats["rounds"] == 5 and stats["min"] <= stats["median"] <= stats["max"]
+
+    results = run_benchmarks([10, 20], ["clark_wright", "dijkstra_grid"], min_rounds=1, max_time=0)
+    assert [(result["case"], result["n"]) for result in results["results"]] == [
+        ("clark_wright", 10), ("clark_wright", 20), ("dijkstra_grid", 10), ("dijkstra_grid", 20),
+    ]
+    assert all(result["peak_bytes"] > 0 for result in results["results"])
+    assert "python" in results["environment"]
+    assert all(row["time_ratio"] == 1 for row in compare(results, results))
+    with pytest.raises(ValueError):
+        run_benchmarks([10], ["no_such_case"])
+
+def test_parse_importtime():
+    """
+    Test parsing of python -X importtime output.
+    """
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   heapq\n"
+        "import time:      4463 |     123454 | algorithms.clark_wright\n"
+    )
+    assert parse_importtime(output) == {"heapq": (120, 120), "algorithms.clark_wright": (4463, 123454)}
+
+def test_algorithm_layer_needs_only_numpy():
+    """
+    Test that the solver modules import without pandas, pyarrow or Streamlit.
+    """
+    for module in ("algorithms.clark_wright", "algorithms.dijkstra", "algorithms.ingest", "routing_app.batch"):
+        result = import_time(module, repeat=1)
+        assert result["heavy"] == [], module
+        assert result["import_ms"] > 0
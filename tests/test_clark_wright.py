@@ -1,6 +1,7 @@
 import pytest
+import numpy as np
 import pandas as pd
-from algorithms.clark_wright import clark_wright
+from algorithms.clark_wright import calculate_granular_savings, calculate_savings, clark_wright, merge_routes, savings_formula
 
 def test_clark_wright_basic_case():
     """
@@ -53,4 +54,136 @@ def test_clark_wright_empty_demands():
     expected_routes = []
 
     routes = clark_wright(distance_matrix, demands, max_capacity)
-    assert routes == expected_routes
\ No newline at end of file
+    assert routes == expected_routes
+
+def test_calculate_savings_sorted_arrays():
+    """
+    Test that savings come back as compact arrays sorted in descending order.
+    """
+    distance_matrix = pd.DataFrame([
+        [0, 10, 15, 20],
+        [10, 0, 35, 25],
+        [15, 35, 0, 30],
+        [20, 25, 30, 0]
+    ])
+
+    first, second, savings = calculate_savings(distance_matrix)
+    assert first.tolist() == [0, 0, 1]
+    assert second.tolist() == [1, 2, 2]
+    assert savings.tolist() == [35, 35, 20]
+    assert first.dtype == np.int32
+
+
+def test_calculate_savings_matches_pairwise_formula():
+    """
+    Test the vectorized savings against the pairwise formula on a random matrix.
+    """
+    rng = np.random.default_rng(0)
+    points = rng.random((12, 2))
+    matrix = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+    depot = len(matrix) - 1
+
+    first, second, savings = calculate_savings(matrix)
+    expected = sorted(
+        ((i, j, matrix[i, depot] + matrix[j, depot] - matrix[i, j])
+         for i in range(depot) for j in range(i + 1, depot)),
+        key=lambda x: x[2], reverse=True,
+    )
+    assert list(zip(first.tolist(), second.tolist())) == [(i, j) for i, j, _ in expected]
+    assert np.allclose(savings, [s for _, _, s in expected])
+
+
+def test_merge_routes_accepts_all_orientations():
+    """
+    Test that routes are linked head-to-head and tail-to-tail as well.
+    """
+    demands = [1, 1, 1, 1]
+
+    head_to_head = merge_routes(np.array([0, 2, 0]), np.array([1, 3, 2]), demands, 10)
+    tail_to_tail = merge_routes(np.array([0, 2, 1]), np.array([1, 3, 3]), demands, 10)
+    assert head_to_head == [[3, 2, 0, 1]]
+    assert tail_to_tail == [[0, 1, 3, 2]]
+
+
+def test_clark_wright_random_instance_is_feasible():
+    """
+    Test that every customer is routed exactly once within capacity.
+    """
+    rng = np.random.default_rng(1)
+    points = rng.random((60, 2))
+    matrix = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+    demands = rng.integers(1, 10, size=59).tolist() + [0]
+
+    routes = clark_wright(matrix, demands, 40)
+    assert sorted(node for route in routes for node in route) == list(range(59))
+    assert all(sum(demands[node] for node in route) <= 40 for route in routes)
+
+
+def test_granular_savings_keeps_best_pairs_per_customer():
+    """
+    Test that granular savings are a subset of the full savings list.
+    """
+    rng = np.random.default_rng(2)
+    points = rng.random((30, 2))
+    matrix = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+
+    full = calculate_savings(matrix)
+    first, second, savings = calculate_granular_savings(matrix, 3)
+    full_pairs = dict(zip(zip(full[0].tolist(), full[1].tolist()), full[2].tolist()))
+    assert first.dtype == np.int32 and savings.dtype == np.float32
+    assert len(first) <= 29 * 3
+    assert all(i < j for i, j in zip(first.tolist(), second.tolist()))
+    assert np.all(np.diff(savings) <= 0)
+    for i, j, saving in zip(first.tolist(), second.tolist(), savings.tolist()):
+        assert saving == pytest.approx(full_pairs[(i, j)], rel=1e-5)
+
+
+def test_granular_clark_wright_with_all_neighbors_matches_full():
+    """
+    Test that granular mode with every neighbour gives the full-mode routes.
+    """
+    distance_matrix = pd.DataFrame([
+        [0, 10, 15, 20],
+        [10, 0, 35, 25],
+        [15, 35, 0, 30],
+        [20, 25, 30, 0]
+    ])
+    demands = [5, 5, 5]
+
+    assert clark_wright(distance_matrix, demands, 30, neighbors=2) == clark_wright(distance_matrix, demands, 30)
+
+
+def test_parameterized_savings_formula():
+    """
+    Test the lam, mu and nu terms of the parameterized savings.
+    """
+    distance_matrix = np.array([
+        [0, 4, 3, 5],
+        [4, 0, 6, 9],
+        [3, 6, 0, 2],
+        [5, 9, 2, 0],
+    ], dtype=float)
+    demands = [1, 2, 3, 0]
+
+    first, second, savings = calculate_savings(distance_matrix, lam=0.5, mu=1.0, nu=2.0, demands=demands)
+    weights = np.array([1, 2, 3]) / 2
+    for i, j, saving in zip(first.tolist(), second.tolist(), savings.tolist()):
+        d_i, d_j = distance_matrix[i, 3], distance_matrix[j, 3]
+        expected = d_i + d_j - 0.5 * distance_matrix[i, j] + abs(d_i - d_j) + 2.0 * (weights[i] + weights[j])
+        assert saving == pytest.approx(expected)
+    assert savings_formula(5.0, 9.0, 2.0) == 12.0
+
+
+def test_default_savings_params_match_classic_routes():
+    """
+    Test that the classic parameters reproduce the default routes and that nu needs demands.
+    """
+    rng = np.random.default_rng(3)
+    points = rng.random((40, 2))
+    matrix = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+    demands = rng.integers(1, 10, size=39).tolist() + [0]
+
+    params = {"lam": 1.0, "mu": 0.0, "nu": 0.0}
+    assert clark_wright(matrix, demands, 30, savings_params=params) == clark_wright(matrix, demands, 30)
+    with pytest.raises(ValueError):
+        calculate_savings(matrix, nu=1.0)
@@ -0,0 +1,114 @@
+import pytest
+import numpy as np
+from algorithms.clark_wright import clark_wright
+from algorithms.constrained import assign_vehicles, constrained_clark_wright, route_timing
+
+def random_instance(n, seed):
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, 100, size=(n + 1, 2))
+    distances = np.sqrt(((points[:, None] - points[None, :]) ** 2).sum(axis=2))
+    demands = rng.integers(1, 10, size=n).astype(float)
+    return distances, demands
+
+def simulate(route, travel, windows, service):
+    """
+    Earliest-start schedule of a route leaving the depot at its opening time; None if a window is missed.
+    """
+    depot = len(travel) - 1
+    time, previous = windows[depot][0], depot
+    for node in route:
+        time = max(time + travel[previous][node], windows[node][0])
+        if time > windows[node][1]:
+            return None
+        time += service[node]
+        previous = node
+    time += travel[previous][depot]
+    return None if time > windows[depot][1] else time
+
+def test_constrained_matches_clark_wright_when_unconstrained():
+    """
+    Test that loose constraints and one vehicle type reproduce clark_wright.
+    """
+    distances, demands = random_instance(40, seed=1)
+    fleet = [{"name": "van", "capacity": 25}]
+    routes, vehicles = constrained_clark_wright(distances, demands, fleet)
+    assert routes == clark_wright(distances, demands, 25)
+    assert vehicles.tolist() == [0] * len(routes)
+
+def test_constrained_respects_time_windows():
+    """
+    Test that every route can be driven within the customers' time windows.
+    """
+    distances, demands = random_instance(60, seed=2)
+    rng = np.random.default_rng(3)
+    opens = rng.uniform(150, 450, size=61)
+    windows = np.column_stack([opens, opens + 60])
+    windows[-1] = [0, 1000]
+    service = np.full(61, 5.0)
+    routes, _ = constrained_clark_wright(
+        distances, demands, [{"name": "van", "capacity": 40}], time_windows=windows, service_times=service,
+    )
+    assert sorted(node for route in routes for node in route) == list(range(60))
+    assert len(routes) < 60
+    for route in routes:
+        assert route_timing(route, distances, windows, service) is not None
+        assert simulate(route, distances, windows, service) is not None
+
+def test_constrained_respects_max_duration():
+    """
+    Test that no route is longer than the maximum duration.
+    """
+    distances, demands = random_instance(50, seed=4)
+    routes, _ = constrained_clark_wright(distances, demands, [{"name": "van", "capacity": 1000}], max_duration=300)
+    assert len(routes) > 1
+    for route in routes:
+        duration, _, _ = route_timing(route, distances)
+        assert duration <= 300 + 1e-9
+
+def test_route_timing_counts_waiting():
+    """
+    Test that waiting for a window to open is part of the duration, and that the departure is pushed back instead.
+    """
+    travel = np.array([
+        [0, 10, 5],
+        [10, 0, 5],
+        [5, 5, 0],
+    ], dtype=float)
+    windows = np.array([[50, 60], [0, 100], [0, 1000]], dtype=float)
+    duration, earliest, latest = route_timing([0, 1], travel, windows, [2, 2, 0])
+    assert duration == 5 + 2 + 10 + 2 + 5
+    assert (earliest, latest) == (45, 55)
+    assert route_timing([1, 0], travel, windows, [2, 2, 0])[0] == 5 + 2 + 10 + 2 + 5
+    assert route_timing([0], travel, np.array([[50, 60], [0, 100], [0, 20]], dtype=float)) is None
+
+def test_assign_vehicles_smallest_adequate_type():
+    """
+    Test that routes get the smallest vehicle that fits and spill over to larger types when a type runs out.
+    """
+    fleet = [
+        {"name": "truck", "capacity": 30, "count": None},
+        {"name": "bike", "capacity": 5, "count": 1},
+        {"name": "van", "capacity": 15, "count": 2},
+    ]
+    vehicles = assign_vehicles([4, 5, 12, 3, 14, 20, 31], fleet)
+    # The one bike keeps the 3; 5 and 4 take the vans, so 12 and 14 spill over to trucks
+    assert vehicles.tolist() == [2, 2, 0, 1, 0, 0, -1]
+
+def test_constrained_rejects_unservable_customer():
+    """
+    Test that a customer whose window cannot be reached from the depot raises ValueError.
+    """
+    distances, demands = random_instance(5, seed=5)
+    windows = np.array([[0, 1000]] * 6, dtype=float)
+    windows[2] = [0, 0]
+    with pytest.raises(ValueError):
+        constrained_clark_wright(distances, demands, [{"name": "van", "capacity": 100}], time_windows=windows)
+
+@pytest.mark.parametrize("fleet", [[], [{"name": "van", "capacity": 10, "count": 0}]])
+def test_constrained_rejects_fleet_without_vehicles(fleet):
+    """
+    Test that an empty fleet, or one whose types all have count 0, raises ValueError.
+    """
+    distances, demands = random_instance(5, seed=6)
+    with pytest.raises(ValueError, match="at least one vehicle"):
+        constrained_clark_wright(distances, demands, fleet)
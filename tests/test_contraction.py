@@ -0,0 +1,58 @@
+import random
+import pytest
+from algorithms.contraction import ContractionHierarchy
+from algorithms.dijkstra import dijkstra
+
+def random_graph(seed, nodes=80, edges=240, directed=False):
+    rng = random.Random(seed)
+    names = [f"N{i}" for i in range(nodes)]
+    graph = {name: {} for name in names}
+    for _ in range(edges):
+        u, v = rng.sample(names, 2)
+        weight = rng.randint(1, 50)
+        graph[u][v] = weight
+        if not directed:
+            graph[v][u] = weight
+    return graph
+
+def test_contraction_hierarchy_simple_case():
+    graph = {
+        'A': {'B': 1, 'C': 4},
+        'B': {'A': 1, 'C': 2, 'D': 5},
+        'C': {'A': 4, 'B': 2, 'D': 1},
+        'D': {'B': 5, 'C': 1}
+    }
+
+    hierarchy = ContractionHierarchy.build(graph)
+    assert hierarchy.query('A', 'D') == (4, ['A', 'B', 'C', 'D'])
+    assert hierarchy.query('D', 'D') == (0, ['D'])
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_contraction_hierarchy_matches_dijkstra(directed):
+    graph = random_graph(9, directed=directed)
+    hierarchy = ContractionHierarchy.build(graph)
+
+    assert hierarchy.validate(graph, queries=300) == []
+    rng = random.Random(1)
+    for _ in range(50):
+        u, v = rng.sample(list(graph), 2)
+        distance, path = hierarchy.query(u, v)
+        assert distance == dijkstra(graph, u, v)[0]
+        if path:
+            assert path[0] == u and path[-1] == v
+            assert sum(graph[a][b] for a, b in zip(path, path[1:])) == distance
+
+def test_contraction_hierarchy_unreachable():
+    hierarchy = ContractionHierarchy.build({'A': {'B': 1}, 'B': {'A': 1}, 'C': {}})
+
+    assert hierarchy.query('A', 'C') == (float('inf'), [])
+
+def test_contraction_hierarchy_save_and_load(tmp_path):
+    graph = random_graph(10, nodes=40, edges=100)
+    hierarchy = ContractionHierarchy.build(graph)
+    path = tmp_path / "hierarchy.npz"
+
+    hierarchy.save(path)
+    loaded = ContractionHierarchy.load(path)
+    assert loaded.num_shortcuts == hierarchy.num_shortcuts
+    assert loaded.validate(graph, queries=100) == []
@@ -1,5 +1,11 @@
+import random
+import numpy as np
 import pytest
-from algorithms.dijkstra import dijkstra
+from algorithms.dijkstra import (
+    LandmarkHeuristic, astar, bidirectional_dijkstra, dijkstra, euclidean_heuristic,
+    haversine_heuristic, one_to_many, shortest_path_matrix,
+)
+from algorithms.graph import CSRGraph
 
 def test_dijkstra_simple_case():
     graph = {
@@ -38,4 +44,145 @@ def test_dijkstra_no_edges():
     end_node = 'B'
     distance, path = dijkstra(graph, start_node, end_node)
     assert distance == float('inf')
-    assert path == []
\ No newline at end of file
+    assert path == []
+
+def test_dijkstra_accepts_csr_graph():
+    graph = CSRGraph.from_dict({
+        'A': {'B': 1, 'C': 4},
+        'B': {'A': 1, 'C': 2, 'D': 5},
+        'C': {'A': 4, 'B': 2, 'D': 1},
+        'D': {'B': 5, 'C': 1}
+    })
+
+    distance, path = dijkstra(graph, 'A', 'D')
+    assert distance == 4
+    assert path == ['A', 'B', 'C', 'D']
+
+def test_dijkstra_matches_floyd_warshall_on_random_graph():
+    rng = random.Random(3)
+    nodes = [f"N{i}" for i in range(25)]
+    graph = {node: {} for node in nodes}
+    for _ in range(60):
+        u, v = rng.sample(nodes, 2)
+        graph[u][v] = rng.randint(1, 20)
+
+    best = {u: {v: (0 if u == v else float('inf')) for v in nodes} for u in nodes}
+    for u in nodes:
+        for v, weight in graph[u].items():
+            best[u][v] = min(best[u][v], weight)
+    for k in nodes:
+        for u in nodes:
+            for v in nodes:
+                best[u][v] = min(best[u][v], best[u][k] + best[k][v])
+
+    for u in nodes[:5]:
+        for v in nodes:
+            distance, path = dijkstra(graph, u, v)
+            assert distance == best[u][v]
+            if path:
+                assert path[0] == u and path[-1] == v
+                assert sum(graph[a][b] for a, b in zip(path, path[1:])) == distance
+
+def test_one_to_many_single_search():
+    graph = {
+        'A': {'B': 1, 'C': 4},
+        'B': {'A': 1, 'C': 2, 'D': 5},
+        'C': {'A': 4, 'B': 2, 'D': 1},
+        'D': {'B': 5, 'C': 1},
+        'E': {}
+    }
+
+    distances = one_to_many(graph, 'A', ['D', 'C', 'E'])
+    assert distances.tolist() == [4, 3, float('inf')]
+
+    all_distances, predecessors = one_to_many(graph, 'A', return_predecessors=True)
+    assert all_distances.tolist() == [0, 1, 3, 4, float('inf')]
+    assert predecessors.tolist() == [-1, 0, 1, 2, -1]
+
+def test_shortest_path_matrix_matches_pairwise_dijkstra():
+    rng = random.Random(4)
+    nodes = [f"N{i}" for i in range(15)]
+    graph = {node: {} for node in nodes}
+    for _ in range(40):
+        u, v = rng.sample(nodes, 2)
+        graph[u][v] = graph[v][u] = rng.randint(1, 9)
+
+    sources, targets = nodes[:4], nodes[5:]
+    matrix, predecessors = shortest_path_matrix(graph, sources, targets, return_predecessors=True)
+    assert matrix.shape == (4, 10)
+    assert predecessors.shape == (4, 15)
+    for row, u in enumerate(sources):
+        for col, v in enumerate(targets):
+            assert matrix[row, col] == dijkstra(graph, u, v)[0]
+
+    square = shortest_path_matrix(graph, nodes)
+    assert np.allclose(square, square.T)
+    assert np.all(square.diagonal() == 0)
+
+def geometric_graph(seed, nodes=60, directed=False):
+    rng = random.Random(seed)
+    coordinates = {f"N{i}": (rng.random() * 100, rng.random() * 100) for i in range(nodes)}
+    names = list(coordinates)
+    graph = {name: {} for name in names}
+    for _ in range(nodes * 3):
+        u, v = rng.sample(names, 2)
+        (x1, y1), (x2, y2) = coordinates[u], coordinates[v]
+        weight = ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5 * rng.uniform(1, 1.5)
+        graph[u][v] = weight
+        if not directed:
+            graph[v][u] = weight
+    return graph, coordinates
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_bidirectional_dijkstra_matches_dijkstra(directed):
+    graph, coordinates = geometric_graph(7, directed=directed)
+    csr = CSRGraph.from_dict(graph)
+    names = list(coordinates)
+
+    for u in names[:8]:
+        for v in names:
+            expected, _ = dijkstra(csr, u, v)
+            distance, path = bidirectional_dijkstra(csr, u, v)
+            assert distance == pytest.approx(expected)
+            if path:
+                assert path[0] == u and path[-1] == v
+                assert sum(graph[a][b] for a, b in zip(path, path[1:])) == pytest.approx(distance)
+            else:
+                assert expected == float('inf')
+
+def test_bidirectional_dijkstra_simple_case():
+    graph = {
+        'A': {'B': 1, 'C': 4},
+        'B': {'A': 1, 'C': 2, 'D': 5},
+        'C': {'A': 4, 'B': 2, 'D': 1},
+        'D': {'B': 5, 'C': 1}
+    }
+
+    assert bidirectional_dijkstra(graph, 'A', 'D') == (4, ['A', 'B', 'C', 'D'])
+    assert bidirectional_dijkstra(graph, 'A', 'A') == (0, ['A'])
+
+@pytest.mark.parametrize("make_heuristic", [
+    lambda csr, coordinates: euclidean_heuristic(csr, coordinates),
+    lambda csr, coordinates: LandmarkHeuristic(csr, count=4),
+])
+def test_astar_matches_dijkstra(make_heuristic):
+    graph, coordinates = geometric_graph(8, directed=True)
+    csr = CSRGraph.from_dict(graph)
+    heuristic = make_heuristic(csr, coordinates)
+    names = list(coordinates)
+
+    for u in names[:8]:
+        for v in names:
+            expected, _ = dijkstra(csr, u, v)
+            distance, path = astar(csr, u, v, heuristic)
+            assert distance == pytest.approx(expected)
+            if path:
+                assert sum(graph[a][b] for a, b in zip(path, path[1:])) == pytest.approx(distance)
+
+def test_haversine_heuristic_is_great_circle_distance():
+    graph = CSRGraph.from_dict({'Paris': {'London': 400}, 'London': {}})
+    heuristic = haversine_heuristic(graph, {'Paris': (48.8566, 2.3522), 'London': (51.5074, -0.1278)})
+
+    bounds = heuristic(graph.index['London'])
+    assert bounds[graph.index['London']] == 0
+    assert bounds[graph.index['Paris']] == pytest.approx(343.5, abs=1)
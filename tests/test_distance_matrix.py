@@ -0,0 +1,54 @@
+import pytest
+import numpy as np
+import pandas as pd
+from algorithms.distance_matrix import complete_symmetric_matrix, transform_to_complete_matrix
+
+def test_complete_symmetric_matrix_fills_from_transpose():
+    """
+    Test that missing cells are mirrored and an empty diagonal becomes 0.
+    """
+    matrix = np.array([
+        [np.nan, 10, 15],
+        [np.nan, 0, 35],
+        [np.nan, np.nan, 0],
+    ])
+
+    values, missing = complete_symmetric_matrix(matrix)
+    assert values.tolist() == [[0, 10, 15], [10, 0, 35], [15, 35, 0]]
+    assert len(missing) == 0
+
+def test_complete_symmetric_matrix_reports_missing_cells():
+    """
+    Test that cells missing on both sides are reported.
+    """
+    matrix = np.array([
+        [0, np.nan, 15],
+        [np.nan, 0, 35],
+        [15, 35, 0],
+    ])
+
+    _, missing = complete_symmetric_matrix(matrix)
+    assert missing.tolist() == [[0, 1], [1, 0]]
+
+def test_complete_symmetric_matrix_rejects_nonzero_diagonal():
+    """
+    Test that a non-zero self-distance is rejected.
+    """
+    with pytest.raises(ValueError):
+        complete_symmetric_matrix(np.array([[1.0, 2.0], [2.0, 0.0]]))
+
+def test_transform_to_complete_matrix_splits_demands():
+    """
+    Test the upload transform on a template-shaped DataFrame.
+    """
+    nodes = ['Node 1', 'Node 2', 'Depot']
+    df = pd.DataFrame(
+        [[0, 5, 7, 10], [np.nan, 0, 3, 20], [np.nan, np.nan, 0, 0]],
+        index=nodes, columns=nodes + ['Demand'],
+    )
+
+    distance_matrix, demands, missing = transform_to_complete_matrix(df)
+    assert demands == [10, 20, 0]
+    assert list(distance_matrix.columns) == nodes
+    assert distance_matrix.loc['Depot', 'Node 1'] == 7
+    assert missing == []
@@ -0,0 +1,86 @@
+import random
+import pytest
+from algorithms.dijkstra import dijkstra, one_to_many
+from algorithms.dynamic import DynamicShortestPaths
+
+GRAPH = {
+    'A': {'B': 1, 'C': 4},
+    'B': {'A': 1, 'C': 2, 'D': 5},
+    'C': {'A': 4, 'B': 2, 'D': 1},
+    'D': {'B': 5, 'C': 1},
+}
+
+def test_dynamic_initial_tree():
+    paths = DynamicShortestPaths(GRAPH, 'A')
+
+    assert paths.distance('D') == 4
+    assert paths.path('D') == ['A', 'B', 'C', 'D']
+
+def test_dynamic_weight_increase_and_removal():
+    paths = DynamicShortestPaths(GRAPH, 'A', undirected=True)
+
+    changed = paths.set_edge('B', 'C', 10)
+    assert changed == {'C', 'D'}
+    assert paths.distance('D') == 5
+    assert paths.path('C') == ['A', 'C']
+
+    paths.remove_edge('A', 'C')
+    assert paths.distance('C') == 7
+    assert paths.path('C') == ['A', 'B', 'D', 'C']
+
+def test_dynamic_weight_decrease_and_new_node():
+    paths = DynamicShortestPaths(GRAPH, 'A')
+
+    assert paths.apply([('A', 'D', 2), ('D', 'E', 1)]) == {'D', 'E'}
+    assert paths.path('E') == ['A', 'D', 'E']
+    assert paths.distance('E') == 3
+
+def test_dynamic_disconnect_and_unchanged_edit():
+    paths = DynamicShortestPaths({'A': {'B': 1}, 'B': {'C': 1}}, 'A')
+
+    assert paths.set_edge('A', 'C', 5) == set()
+    assert paths.remove_edge('A', 'B') == {'B', 'C'}
+    assert paths.distance('B') == float('inf')
+    assert paths.path('B') == []
+    assert paths.path('C') == ['A', 'C']
+
+@pytest.mark.parametrize("edits, expected_graph", [
+    ([('A', 'B', 3), ('A', 'B', None)], {'A': {}, 'B': {}}),
+    ([('A', 'B', 3), ('A', 'B', 10)], {'A': {'B': 10}, 'B': {}}),
+])
+def test_dynamic_repeated_edits_use_final_weight(edits, expected_graph):
+    paths = DynamicShortestPaths({'A': {'B': 5}}, 'A')
+    paths.apply(edits)
+
+    distance, path = dijkstra(expected_graph, 'A', 'B')
+    assert paths.distance('B') == distance
+    assert paths.path('B') == path
+
+@pytest.mark.parametrize("seed", range(5))
+def test_dynamic_matches_recomputation_under_random_edits(seed):
+    rng = random.Random(seed)
+    names = [f"N{i}" for i in range(30)]
+    graph = {name: {} for name in names}
+    for _ in range(90):
+        u, v = rng.sample(names, 2)
+        graph[u][v] = rng.randint(1, 20)
+    paths = DynamicShortestPaths(graph, 'N0')
+
+    for _ in range(40):
+        edits = []
+        for _ in range(rng.randint(1, 4)):
+            u, v = rng.sample(names, 2)
+            weight = None if rng.random() < 0.3 else rng.randint(1, 20)
+            edits.append((u, v, weight))
+            if weight is None:
+                graph[u].pop(v, None)
+            else:
+                graph[u][v] = weight
+        paths.apply(edits)
+
+        expected = one_to_many(graph, 'N0', names)
+        assert [paths.distance(name) for name in names] == expected.tolist()
+        for name in names:
+            path = paths.path(name)
+            if path:
+                assert sum(graph[a][b] for a, b in zip(path, path[1:])) == paths.distance(name)
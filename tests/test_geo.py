@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from algorithms.clark_wright import calculate_granular_savings, clark_wright, merge_routes
+from algorithms.geo import coordinate_savings, pairwise_distances, route_lengths
+
+POINTS = np.array([[0.0, 0.0], [3.0, 4.0], [6.0, 8.0], [0.0, 1.0]])
+
+def test_pairwise_euclidean_in_blocks():
+    distances = pairwise_distances(POINTS, metric="euclidean", block_size=3)
+
+    assert distances.dtype == np.float32
+    assert distances[0, 1] == 5 and distances[0, 2] == 10
+    assert np.allclose(distances, distances.T)
+    assert np.all(distances.diagonal() == 0)
+
+def test_pairwise_haversine_kilometres():
+    points = [[48.8566, 2.3522], [51.5074, -0.1278]]
+
+    distances = pairwise_distances(points, dtype=np.float64)
+    assert distances[0, 1] == pytest.approx(343.5, abs=1)
+
+def test_coordinate_savings_match_matrix_savings():
+    rng = np.random.default_rng(12)
+    points = rng.random((40, 2)) * 100
+    matrix = pairwise_distances(points, metric="euclidean", dtype=np.float64)
+
+    expected = calculate_granular_savings(matrix, 5)
+    got = coordinate_savings(points, 5, metric="euclidean", block_size=7)
+    assert np.array_equal(expected[0], got[0]) and np.array_equal(expected[1], got[1])
+    assert np.allclose(expected[2], got[2])
+
+def test_route_lengths_from_coordinates():
+    rng = np.random.default_rng(13)
+    points = rng.random((30, 2)) * 100
+    matrix = pairwise_distances(points, metric="euclidean", dtype=np.float64)
+    routes = clark_wright(matrix, [1] * 30, 6)
+
+    lengths = route_lengths(points, routes, metric="euclidean")
+    for route, length in zip(routes, lengths):
+        tour = [29] + route + [29]
+        assert length == pytest.approx(sum(matrix[a, b] for a, b in zip(tour, tour[1:])))
+
+def test_granular_routes_from_coordinates_are_feasible():
+    rng = np.random.default_rng(14)
+    points = rng.random((200, 2)) * 100
+
+    first, second, _ = coordinate_savings(points, 10, metric="euclidean")
+    routes = merge_routes(first, second, [1] * 199, 20)
+    assert sorted(node for route in routes for node in route) == list(range(199))
+    assert all(len(route) <= 20 for route in routes)
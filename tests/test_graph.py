@@ -0,0 +1,29 @@
+import pytest
+from algorithms.graph import CSRGraph
+
+def test_csr_graph_from_dict():
+    graph = {
+        'B': {'A': 1, 'C': 2},
+        'A': {'B': 1},
+        'C': {'D': 4},
+    }
+
+    csr = CSRGraph.from_dict(graph)
+    assert csr.names == ['A', 'B', 'C', 'D']
+    assert len(csr) == 4
+    assert csr.num_edges == 4
+    assert csr.indptr.tolist() == [0, 1, 3, 4, 4]
+    neighbors, weights = csr.neighbors(csr.index['B'])
+    assert [csr.names[v] for v in neighbors] == ['A', 'C']
+    assert weights.tolist() == [1.0, 2.0]
+
+def test_csr_graph_round_trip():
+    graph = {'A': {'B': 1.5}, 'B': {'A': 1.5, 'C': 3}, 'C': {}}
+
+    assert CSRGraph.from_dict(graph).to_dict() == graph
+
+def test_csr_graph_reversed_graph():
+    graph = {'A': {'B': 1, 'C': 2}, 'B': {'C': 3}, 'C': {}}
+
+    reversed_graph = CSRGraph.from_dict(graph).reversed_graph
+    assert reversed_graph.to_dict() == {'A': {}, 'B': {'A': 1.0}, 'C': {'A': 2.0, 'B': 3.0}}
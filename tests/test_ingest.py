@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+from algorithms.ingest import read_coordinates, read_distance_matrix, write_upper_triangular
+
+NODES = ['Node 1', 'Node 2', 'Depot']
+MATRIX = np.array([[0, 5, 7], [5, 0, 3], [7, 3, 0]], dtype=np.float32)
+DEMANDS = [10, 20, 0]
+
+def template_frame():
+    df = pd.DataFrame(
+        [[0, 5, 7, 10], [np.nan, 0, 3, 20], [np.nan, np.nan, 0, 0]],
+        index=NODES, columns=NODES + ['Demand'],
+    )
+    df.index.name = 'Distance'
+    return df
+
+def test_read_csv_in_chunks(tmp_path):
+    path = tmp_path / "matrix.csv"
+    template_frame().to_csv(path)
+
+    names, distances, demands, missing = read_distance_matrix(str(path), chunk_rows=2)
+    assert names == NODES
+    assert distances.dtype == np.float32
+    assert np.array_equal(distances, MATRIX)
+    assert demands.tolist() == DEMANDS
+    assert len(missing) == 0
+
+def test_read_csv_reports_missing(tmp_path):
+    path = tmp_path / "matrix.csv"
+    df = template_frame()
+    df.iloc[0, 1] = np.nan
+    df.to_csv(path)
+
+    _, _, _, missing = read_distance_matrix(path)
+    assert missing.tolist() == [[0, 1], [1, 0]]
+
+def test_read_parquet(tmp_path):
+    path = tmp_path / "matrix.parquet"
+    template_frame().to_parquet(path)
+
+    names, distances, demands, _ = read_distance_matrix(path, chunk_rows=1)
+    assert names == NODES
+    assert np.array_equal(distances, MATRIX)
+    assert demands.tolist() == DEMANDS
+
+def test_read_npy_is_memory_mapped(tmp_path):
+    path = tmp_path / "matrix.npy"
+    np.save(path, np.column_stack([MATRIX, DEMANDS]))
+
+    names, distances, demands, missing = read_distance_matrix(str(path))
+    assert names == NODES
+    assert isinstance(distances.base, np.memmap) or isinstance(distances, np.memmap)
+    assert not distances.flags.writeable
+    assert np.array_equal(distances, MATRIX)
+    assert demands.tolist() == DEMANDS
+    assert len(missing) == 0
+
+def test_read_npz_upper_triangular(tmp_path):
+    path = tmp_path / "matrix.npz"
+    write_upper_triangular(path, MATRIX, DEMANDS, names=['A', 'B', 'Depot'])
+
+    names, distances, demands, _ = read_distance_matrix(path)
+    assert names == ['A', 'B', 'Depot']
+    assert np.array_equal(distances, MATRIX)
+    assert demands.tolist() == DEMANDS
+
+def test_read_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        read_distance_matrix("matrix.xlsx")
+
+def test_read_coordinates(tmp_path):
+    path = tmp_path / "coordinates.csv"
+    pd.DataFrame(
+        {'Latitude': [48.85, 51.50, 50.0], 'Longitude': [2.35, -0.12, 1.0], 'Demand': [5, 7, 0]},
+        index=pd.Index(NODES, name='Node'),
+    ).to_csv(path)
+
+    names, points, demands = read_coordinates(path)
+    assert names == NODES
+    assert points.shape == (3, 2)
+    assert demands.tolist() == [5, 7, 0]
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from algorithms.clark_wright import clark_wright
+from algorithms.local_search import PHASES, improve_routes, route_costs
+
+def random_instance(seed, n=60):
+    rng = np.random.default_rng(seed)
+    points = rng.random((n, 2)) * 100
+    matrix = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+    demands = rng.integers(1, 10, size=n - 1).tolist() + [0]
+    return matrix, demands
+
+def test_route_costs():
+    matrix = np.array([
+        [0, 10, 15, 20],
+        [10, 0, 35, 25],
+        [15, 35, 0, 30],
+        [20, 25, 30, 0]
+    ])
+
+    assert route_costs(matrix, [[2, 0, 1], [0]]).tolist() == [30 + 15 + 10 + 25, 40]
+
+def test_two_opt_untangles_crossing_route():
+    points = np.array([[0, 0], [10, 10], [10, 0], [0, 10], [5, -5]], dtype=float)
+    matrix = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+
+    routes, report = improve_routes([[0, 1, 2, 3]], matrix, [1, 1, 1, 1, 0], 10)
+    assert report["final_cost"] < report["initial_cost"]
+    assert report["phases"]["2-opt"]["moves"] >= 1
+    assert route_costs(matrix, routes)[0] == pytest.approx(report["final_cost"])
+
+@pytest.mark.parametrize("seed", range(3))
+def test_improve_routes_keeps_plan_feasible(seed):
+    matrix, demands = random_instance(seed)
+    routes = clark_wright(matrix, demands, 40)
+
+    improved, report = improve_routes(routes, matrix, demands, 40, neighbors=10)
+    assert sorted(node for route in improved for node in route) == list(range(59))
+    assert all(sum(demands[node] for node in route) <= 40 for route in improved)
+    assert report["final_cost"] <= report["initial_cost"] + 1e-9
+    assert report["final_cost"] == pytest.approx(route_costs(matrix, improved).sum())
+    gained = sum(report["phases"][phase]["improvement"] for phase in PHASES)
+    assert gained == pytest.approx(report["initial_cost"] - report["final_cost"])
+
+def test_improve_routes_stops_at_time_budget():
+    matrix, demands = random_instance(4, n=120)
+    routes = [[node] for node in range(119)]
+
+    _, report = improve_routes(routes, matrix, demands, 60, time_budget=1e-6)
+    assert report["timed_out"]
@@ -2,7 +2,6 @@ import pytest
 from unittest.mock import patch
 import streamlit as st
 from streamlit.runtime.scriptrunner import RerunException
-from navigation.dijkstra_page import dijkstra_page
 from navigation.clark_wright_page import clark_wright_page
 
 
@@ -13,23 +12,33 @@ def mock_session_state():
         yield
 
 
-def test_dijkstra_page_renders(mock_session_state):
+def dijkstra_app():
+    """Dijkstra page on the graph passed in session state, for AppTest."""
+    from navigation.dijkstra_page import dijkstra_page
+
+    dijkstra_page()
+
+
+def run_dijkstra_page(state):
+    """Run the Dijkstra page once in AppTest, with `state` as the initial session state."""
+    from streamlit.testing.v1 import AppTest
+
+    # st.form needs a script run; AppTest gives each test its own
+    app = AppTest.from_function(dijkstra_app, default_timeout=30)
+    for key, value in state.items():
+        app.session_state[key] = value
+    return app.run()
+
+
+def test_dijkstra_page_renders():
     """Test if the Dijkstra's page runs without errors."""
-    with patch.dict(
-        st.session_state,
-        {"graph": {}, "node_names": [], "confirm_reset": False},
-        clear=True,
-    ):
-        try:
-            dijkstra_page()
-        except RerunException:
-            # Ignore rerun exceptions caused by session updates in Streamlit
-            pass
+    app = run_dijkstra_page({"graph": {}, "node_names": [], "confirm_reset": False})
+    assert not app.exception
 
-        # Assertions to ensure required keys are present in session state
-        assert "graph" in st.session_state
-        assert "node_names" in st.session_state
-        assert "confirm_reset" in st.session_state
+    # Assertions to ensure required keys are present in session state
+    assert "graph" in app.session_state
+    assert "node_names" in app.session_state
+    assert "confirm_reset" in app.session_state
 
 
 def test_clark_wright_page_renders(mock_session_state):
@@ -49,22 +58,14 @@ def test_clark_wright_page_renders(mock_session_state):
         assert True
 
 
-def test_dijkstra_page(mock_session_state):
+def test_dijkstra_page():
     """Populate graph and node names in session state."""
-    with patch.dict(
-        st.session_state,
-        {"graph": {"A": {"B": 1}, "B": {"A": 1}}, "node_names": ["A", "B"]},
-        clear=True,
-    ):
-        try:
-            dijkstra_page()
-        except RerunException:
-            # Ignore Streamlit's rerun exception
-            pass
+    app = run_dijkstra_page({"graph": {"A": {"B": 1}, "B": {"A": 1}}, "node_names": ["A", "B"]})
+    assert not app.exception
 
-        # Assertions to ensure session state is correctly initialized
-        assert st.session_state["graph"] == {"A": {"B": 1}, "B": {"A": 1}}
-        assert st.session_state["node_names"] == ["A", "B"]
+    # Assertions to ensure session state is correctly initialized
+    assert app.session_state["graph"] == {"A": {"B": 1}, "B": {"A": 1}}
+    assert app.session_state["node_names"] == ["A", "B"]
 
 
 def test_clark_wright_page(mock_session_state):
@@ -81,4 +82,24 @@ def test_clark_wright_page(mock_session_state):
             pass
 
         # Basic check to ensure no errors during execution
-        assert True
\ No newline at end of file
+        assert True
+
+
+def test_dijkstra_page_large_graph():
+    """Test that graphs above the former 30-node cap render a summary and one page of edges."""
+    from navigation.tables import PAGE_ROWS
+
+    names = [f"N{i}" for i in range(500)]
+    graph = {name: {} for name in names}
+    for first, second in zip(names, names[1:]):
+        graph[first][second] = 1
+        graph[second][first] = 1
+    app = run_dijkstra_page({"graph": graph, "node_names": names})
+    assert not app.exception
+    assert not app.json
+    assert any(text.value.startswith("500 nodes and 499 edges") for text in app.markdown)
+    [editor] = app.dataframe
+    assert len(editor.value) <= PAGE_ROWS
+    assert [caption.value for caption in app.caption] == [f"Edges 1-{PAGE_ROWS} of 499"]
+    # Large node lists are typed instead of sent as select options
+    assert not app.selectbox and len(app.text_input) == 2
@@ -0,0 +1,41 @@
+import random
+import numpy as np
+import pytest
+from algorithms.dijkstra import shortest_path_matrix
+from algorithms.graph import CSRGraph
+from algorithms.parallel import attach_arrays, parallel_shortest_path_matrix, shared_arrays
+
+def random_graph(seed, nodes=40, edges=120):
+    rng = random.Random(seed)
+    names = [f"N{i}" for i in range(nodes)]
+    graph = {name: {} for name in names}
+    for _ in range(edges):
+        u, v = rng.sample(names, 2)
+        graph[u][v] = graph[v][u] = rng.randint(1, 30)
+    return graph, names
+
+def test_shared_arrays_round_trip():
+    values = np.arange(12, dtype=np.float32).reshape(3, 4)
+
+    with shared_arrays({"values": values}) as spec:
+        blocks, arrays = attach_arrays(spec)
+        assert np.array_equal(arrays["values"], values)
+        del arrays
+        for block in blocks:
+            block.close()
+
+def test_parallel_matrix_matches_serial():
+    graph, names = random_graph(5)
+    csr = CSRGraph.from_dict(graph)
+
+    serial = shortest_path_matrix(csr, names[:25], names[10:])
+    parallel = parallel_shortest_path_matrix(csr, names[:25], names[10:], workers=2, chunk_size=3)
+    assert np.array_equal(serial, parallel)
+
+def test_parallel_matrix_single_worker_falls_back_to_serial():
+    graph, names = random_graph(6, nodes=10, edges=20)
+
+    assert np.array_equal(
+        parallel_shortest_path_matrix(graph, names, workers=1),
+        shortest_path_matrix(graph, names),
+    )
@@ -0,0 +1,50 @@
+import random
+import pytest
+from algorithms.dijkstra import dijkstra
+from algorithms.path_cache import ShortestPathCache
+
+GRAPH = {
+    'A': {'B': 1, 'C': 4},
+    'B': {'A': 1, 'C': 2, 'D': 5},
+    'C': {'A': 4, 'B': 2, 'D': 1},
+    'D': {'B': 5, 'C': 1},
+    'E': {},
+}
+
+def test_path_cache_reuses_trees():
+    cache = ShortestPathCache(GRAPH)
+
+    assert cache.query('A', 'B') == (1, ['A', 'B'])
+    assert cache.query('A', 'D') == (4, ['A', 'B', 'C', 'D'])
+    assert cache.query('A', 'E') == (float('inf'), [])
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert len(cache) == 1
+
+def test_path_cache_matches_dijkstra_on_random_queries():
+    rng = random.Random(11)
+    names = [f"N{i}" for i in range(40)]
+    graph = {name: {} for name in names}
+    for _ in range(100):
+        u, v = rng.sample(names, 2)
+        graph[u][v] = graph[v][u] = rng.randint(1, 20)
+    cache = ShortestPathCache(graph, max_entries=3)
+
+    for _ in range(200):
+        u, v = rng.choice(names[:5]), rng.choice(names)
+        assert cache.query(u, v)[0] == dijkstra(graph, u, v)[0]
+    assert len(cache) <= 3
+
+def test_path_cache_evicts_by_bytes():
+    cache = ShortestPathCache(GRAPH, max_entries=10, max_bytes=1)
+
+    cache.query('A', 'D')
+    cache.query('B', 'D')
+    assert len(cache) == 1
+
+def test_path_cache_invalidate_with_new_graph():
+    cache = ShortestPathCache(GRAPH)
+    cache.query('A', 'D')
+
+    cache.invalidate({'A': {'D': 2}, 'D': {'A': 2}})
+    assert len(cache) == 0
+    assert cache.query('A', 'D') == (2, ['A', 'D'])
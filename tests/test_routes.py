@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from algorithms.routes import evaluate_routes, flatten_routes, route_costs, route_loads
+
+matrix = np.array([
+    [0, 10, 15, 20],
+    [10, 0, 35, 25],
+    [15, 35, 0, 30],
+    [20, 25, 30, 0],
+], dtype=float)
+
+def test_flatten_routes():
+    """
+    Test that routes are packed into customers, owners and lengths.
+    """
+    nodes, owner, lengths = flatten_routes([[2, 0], [], [1]])
+    assert nodes.tolist() == [2, 0, 1]
+    assert owner.tolist() == [0, 0, 2]
+    assert lengths.tolist() == [2, 0, 1]
+
+def test_route_costs_match_hop_by_hop_sum():
+    """
+    Test the vectorized tour costs against a plain loop, including empty routes.
+    """
+    rng = np.random.default_rng(0)
+    d = rng.random((30, 30))
+    order = rng.permutation(29).tolist()
+    routes = [order[:5], [], order[5:6], order[6:20], order[20:]]
+
+    expected = [
+        sum(d[a, b] for a, b in zip([29, *route], [*route, 29])) if route else 0.0
+        for route in routes
+    ]
+    assert route_costs(d, routes) == pytest.approx(expected)
+    assert route_costs(matrix, []).tolist() == []
+
+def test_evaluate_routes():
+    """
+    Test cost, load, stops and utilization of each route.
+    """
+    demands = [5, 10, 15, 0]
+    evaluation = evaluate_routes(matrix, [[0, 1], [2]], demands, 20)
+
+    assert evaluation["cost"].tolist() == [20 + 10 + 25, 30 + 30]
+    assert evaluation["load"].tolist() == [15, 15]
+    assert evaluation["stops"].tolist() == [2, 1]
+    assert evaluation["utilization"].tolist() == [0.75, 0.75]
+    assert route_loads([[2, 1]], demands).tolist() == [25]
+    assert evaluate_routes(None, [[0]], demands, 10, costs=[7.5])["cost"].tolist() == [7.5]
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import random
+import numpy as np
+import pytest
+from algorithms.dijkstra import dijkstra
+from routing_app.service import RoutingService
+
+def random_graph(seed, nodes=60, edges=180):
+    rng = random.Random(seed)
+    names = [f"N{i}" for i in range(nodes)]
+    graph = {name: {} for name in names}
+    for _ in range(edges):
+        u, v = rng.sample(names, 2)
+        graph[u][v] = graph[v][u] = rng.randint(1, 30)
+    return graph, names
+
+async def request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"" if payload is None else json.dumps(payload).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, data = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(data)
+
+def run_service(service, scenario):
+    async def run():
+        server = await service.start(port=0)
+        try:
+            return await scenario(server.sockets[0].getsockname()[1])
+        finally:
+            await service.stop()
+    return asyncio.run(run())
+
+def test_concurrent_shortest_paths_are_coalesced():
+    """
+    Test that concurrent queries are answered correctly by fewer batched searches.
+    """
+    graph, names = random_graph(0)
+    rng = random.Random(1)
+    queries = [(rng.choice(names[:3]), rng.choice(names)) for _ in range(60)]
+    service = RoutingService(graph, workers=1, batch_window=0.05, p99_target=5.0)
+
+    async def scenario(port):
+        responses = await asyncio.gather(*[
+            request(port, "POST", "/shortest-path", {"source": source, "target": target})
+            for source, target in queries
+        ])
+        return responses, (await request(port, "GET", "/stats"))[1]
+
+    responses, stats = run_service(service, scenario)
+    for (source, target), (status, payload) in zip(queries, responses):
+        distance, path = dijkstra(graph, source, target)
+        assert status == 200
+        assert payload["distance"] == distance and payload["path"][0] == source and payload["path"][-1] == target
+    assert stats["batched_requests"] == 60
+    assert stats["searches"] < 60
+    latency = stats["latency"]["/shortest-path"]
+    assert latency["requests"] == 60 and latency["p99_ms"] >= latency["p50_ms"]
+    assert latency["within_p99_target"]
+
+def test_clark_wright_and_errors():
+    """
+    Test warm and inline Clark-Wright solves and the error responses.
+    """
+    distances = np.array([
+        [0, 10, 15, 20],
+        [10, 0, 35, 25],
+        [15, 35, 0, 30],
+        [20, 25, 30, 0],
+    ], dtype=float)
+    demands = [5, 10, 15, 0]
+    service = RoutingService(
+        random_graph(2)[0], distances, demands, names=["A", "B", "C", "Depot"], workers=1,
+    )
+
+    async def scenario(port):
+        return [
+            await request(port, "POST", "/clark-wright", {"capacity": 30}),
+            await request(port, "POST", "/clark-wright", {"capacity": 30, "distances": distances.tolist(), "demands": demands}),
+            await request(port, "POST", "/shortest-path", {"source": "N0", "target": "nowhere"}),
+            await request(port, "POST", "/shortest-path", {"source": "N0"}),
+            await request(port, "GET", "/clark-wright"),
+            await request(port, "GET", "/missing"),
+            await request(port, "GET", "/health"),
+        ]
+
+    warm, inline, unknown, missing, method, not_found, health = run_service(service, scenario)
+    assert warm[0] == 200 and warm[1]["routes"] == [["C", "A", "B"]]
+    assert warm[1]["total_cost"] == pytest.approx(30 + 15 + 10 + 25)
+    assert inline[1]["routes"] == [[2, 0, 1]] and inline[1]["load"] == [30]
+    assert unknown[0] == missing[0] == 400
+    assert (method[0], not_found[0]) == (405, 404)
+    assert health == (200, {"status": "ok", "nodes": 60})
+    assert set(service.latency.samples) == {"/clark-wright", "/shortest-path", "/health", "other"}
+
+def test_failed_pool_start_releases_shared_memory(monkeypatch):
+    """
+    Test that shared memory is unlinked when the worker pool cannot start.
+    """
+    from multiprocessing import shared_memory
+    import routing_app.service as service_module
+
+    def broken_pool(*args, **kwargs):
+        raise OSError("no workers")
+
+    monkeypatch.setattr(service_module, "ProcessPoolExecutor", broken_pool)
+    created = []
+    original = shared_memory.SharedMemory
+
+    def tracking(*args, **kwargs):
+        block = original(*args, **kwargs)
+        created.append(block.name)
+        return block
+
+    monkeypatch.setattr(shared_memory, "SharedMemory", tracking)
+    service = RoutingService(random_graph(2)[0], workers=1)
+    with pytest.raises(OSError):
+        service.start_pool()
+    assert created
+    for name in created:
+        with pytest.raises(FileNotFoundError):
+            original(name=name)
+
+def test_stop_cancels_pending_searches():
+    """
+    Test that stopping the service cancels queued and running searches and their waiting queries.
+    """
+    graph, names = random_graph(3)
+    service = RoutingService(graph, workers=1, batch_window=0.001)
+
+    async def run():
+        await service.start(port=0)
+        query = asyncio.ensure_future(service.shortest_path(names[0], names[1]))
+        await asyncio.sleep(0.01)  # Let the batch flush into a search task
+        await service.stop()
+        assert not service._searches
+        await asyncio.gather(query, return_exceptions=True)
+        return query
+
+    query = asyncio.run(run())
+    assert query.done()
+
+def test_stop_cancels_queries_inside_batch_window():
+    """
+    Test that stopping the service cancels queries still waiting for their batch to flush.
+    """
+    graph, names = random_graph(4)
+    service = RoutingService(graph, workers=1, batch_window=5.0)
+
+    async def run():
+        await service.start(port=0)
+        query = asyncio.ensure_future(service.shortest_path(names[0], names[1]))
+        await asyncio.sleep(0.01)  # Queued, but the window is still open
+        assert service._pending_count == 1
+        await service.stop()
+        await asyncio.wait_for(asyncio.gather(query, return_exceptions=True), timeout=1)
+        return query
+
+    query = asyncio.run(run())
+    assert query.cancelled()
+    assert not service._pending and service._pending_count == 0
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from algorithms.clark_wright import clark_wright
+from algorithms.dijkstra import dijkstra
+from algorithms.path_cache import ShortestPathCache
+from algorithms.stats import SolverStats, profiling, timed
+
+graph = {
+    'A': {'B': 1, 'C': 4},
+    'B': {'A': 1, 'C': 2, 'D': 5},
+    'C': {'A': 4, 'B': 2, 'D': 1},
+    'D': {'B': 5, 'C': 1},
+}
+
+def test_phases_counters_and_update():
+    """
+    Test that phases accumulate time, counters add up and stats merge.
+    """
+    stats = SolverStats()
+    for _ in range(2):
+        with stats.phase("work"):
+            sum(range(1000))
+    stats.count("items", 3)
+    stats.count("items")
+    other = SolverStats()
+    other.count("items", 6)
+
+    assert stats.timings["work"] > 0
+    assert stats.update(other).counters == {"items": 10}
+    with timed(None, "ignored"):
+        pass
+    assert "ignored" not in stats.timings
+
+def test_clark_wright_counters():
+    """
+    Test the savings and merge counters of a Clark-Wright solve.
+    """
+    rng = np.random.default_rng(0)
+    points = rng.random((30, 2))
+    matrix = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+    demands = rng.integers(1, 10, size=29).tolist() + [0]
+    stats = SolverStats()
+
+    routes = clark_wright(matrix, demands, 30, stats=stats)
+    assert routes == clark_wright(matrix, demands, 30)
+    assert set(stats.timings) == {"savings", "merge"}
+    assert stats.counters["savings_evaluated"] == 29 * 28 // 2
+    assert stats.counters["merges_accepted"] == 29 - len(routes)
+    assert stats.counters["merges_rejected_capacity"] > 0
+    assert stats.counters["pairs_scanned"] <= stats.counters["savings_evaluated"]
+
+def test_search_counters():
+    """
+    Test the heap and settle counters of Dijkstra and of the path cache.
+    """
+    stats = SolverStats()
+    assert dijkstra(graph, 'A', 'D', stats=stats) == (4, ['A', 'B', 'C', 'D'])
+    assert stats.counters["nodes_settled"] == 4
+    # C is pushed at 4 and again at 3; the stale entry is popped before D
+    assert stats.counters["heap_pops"] == 5
+    assert stats.counters["heap_pushes"] == 5
+
+    cache = ShortestPathCache(graph)
+    stats = SolverStats()
+    cache.query('A', 'D', stats)
+    cache.query('A', 'B', stats)
+    assert (stats.counters["cache_misses"], stats.counters["cache_hits"]) == (1, 1)
+
+def test_profiling_modes():
+    """
+    Test the cProfile report, the tracemalloc peak and bad modes.
+    """
+    stats = SolverStats()
+    with profiling(stats, "cprofile"):
+        dijkstra(graph, 'A', 'D')
+    assert "dijkstra" in stats.profile
+
+    with profiling(stats, "tracemalloc"):
+        np.ones(100000)
+    assert stats.counters["peak_bytes"] >= 800000
+
+    with pytest.raises(ValueError):
+        with profiling(stats, "perf"):
+            pass
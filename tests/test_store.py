@@ -0,0 +1,87 @@
+import json
+import numpy as np
+from routing_app.__main__ import main
+from routing_app.batch import load_instances, solve_instance, solve_many
+from routing_app.store import ResultStore, fingerprint
+
+def write_instance(path, seed, customers=12):
+    rng = np.random.default_rng(seed)
+    points = rng.random((customers + 1, 2))
+    matrix = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+    demands = np.append(rng.integers(1, 10, size=customers), 0)
+    np.save(path, np.column_stack([matrix, demands]))
+
+def test_fingerprint_changes_with_every_input():
+    """
+    Test that the matrix, demands, capacity, options and version all change the key.
+    """
+    distances = np.arange(9, dtype=np.float64).reshape(3, 3)
+    demands = [1, 2, 0]
+    key = fingerprint(distances, demands, 10, {"sweep": False})
+    assert key == fingerprint(distances.copy(), np.array(demands), 10.0, {"sweep": False})
+    changed = distances.copy()
+    changed[0, 1] += 1
+    assert key != fingerprint(changed, demands, 10, {"sweep": False})
+    assert key != fingerprint(distances, [1, 3, 0], 10, {"sweep": False})
+    assert key != fingerprint(distances, demands, 11, {"sweep": False})
+    assert key != fingerprint(distances, demands, 10, {"sweep": True})
+    assert key != fingerprint(distances, demands, 10, {"sweep": False}, version="0")
+    assert key != fingerprint(distances.astype(np.float32), demands, 10, {"sweep": False})
+
+def test_store_round_trip_and_eviction(tmp_path):
+    """
+    Test that stored routes come back unchanged and that the least recently used entry is evicted first.
+    """
+    store = ResultStore(tmp_path / "results.db")
+    routes = [[2, 0], [1], [3, 4, 5]]
+    evaluation = {"cost": np.array([3.5, 2.0, 7.25]), "load": np.array([4.0, 1.0, 9.0])}
+    store.save("a", routes, evaluation, {"lam": 1.2})
+    stored_routes, stored_evaluation, params = store.lookup("a")
+    assert stored_routes == routes
+    assert np.array_equal(stored_evaluation["cost"], evaluation["cost"])
+    assert params == {"lam": 1.2}
+    assert store.lookup("missing") is None
+
+    _, size = store.usage()
+    store.max_bytes = 2 * size
+    store.save("b", routes, evaluation)
+    store.lookup("a")  # "a" is now used more recently than "b"
+    store.save("c", routes, evaluation)
+    assert store.lookup("b") is None
+    assert store.lookup("a") is not None and store.lookup("c") is not None
+    assert store.usage()[0] == 2
+
+def test_solve_many_answers_unchanged_instances_from_store(tmp_path):
+    """
+    Test that a second run is served from the store, with pooled workers, and that changed inputs are solved again.
+    """
+    for seed in range(3):
+        write_instance(tmp_path / f"depot{seed}.npy", seed)
+    instances = load_instances(tmp_path, capacity=20)
+    store = ResultStore(tmp_path / "results.db", keep_matrices=True)
+
+    first = list(solve_many(instances, workers=2, store=store))
+    second = list(solve_many(instances, workers=1, store=store))
+    assert [record["cached"] for record in first] == [False] * 3
+    assert [record["cached"] for record in second] == [True] * 3
+    strip = lambda record: {key: value for key, value in record.items() if key not in ("seconds", "cached")}
+    assert [strip(record) for record in second] == [strip(record) for record in first]
+    assert store.usage()[0] == 6  # Three results and three completed matrices
+
+    assert solve_instance({**instances[0], "capacity": 25}, store)["cached"] is False
+    write_instance(tmp_path / "depot0.npy", 10)
+    assert solve_instance(instances[0], store)["cached"] is False
+
+def test_main_uses_store(tmp_path):
+    """
+    Test the --store option of the CLI.
+    """
+    write_instance(tmp_path / "depot.npy", 5)
+    (tmp_path / "manifest.json").write_text(json.dumps([{"path": "depot.npy"}]))
+    out = tmp_path / "results.jsonl"
+    arguments = ["solve", str(tmp_path / "manifest.json"), "--capacity", "20", "--workers", "1",
+                 "--store", str(tmp_path / "results.db"), "-o", str(out)]
+    assert main(arguments) == 0
+    assert main(arguments) == 0
+    [record] = [json.loads(line) for line in out.read_text().splitlines()]
+    assert record["cached"] is True
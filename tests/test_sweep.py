@@ -0,0 +1,44 @@
+import numpy as np
+from algorithms.clark_wright import clark_wright
+from algorithms.routes import route_costs
+from algorithms.sweep import default_grid, sweep_clark_wright
+
+def random_instance(seed, customers=40):
+    rng = np.random.default_rng(seed)
+    points = rng.random((customers + 1, 2))
+    matrix = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+    demands = rng.integers(1, 10, size=customers).tolist() + [0]
+    return matrix, demands
+
+def test_default_grid_has_fifty_sets():
+    """
+    Test that the default grid holds 50 distinct parameter sets including the classic one.
+    """
+    grid = default_grid()
+    assert len(grid) == 50
+    assert len({tuple(sorted(params.items())) for params in grid}) == 50
+    assert {"lam": 1.0, "mu": 0.0, "nu": 0.0} in grid
+
+def test_sweep_never_worse_than_classic_savings():
+    """
+    Test that the best plan of a serial sweep is feasible and no worse than plain Clark-Wright.
+    """
+    matrix, demands = random_instance(4)
+    routes, params, results = sweep_clark_wright(matrix, demands, 25, workers=1)
+
+    assert len(results) == 50
+    assert sorted(node for route in routes for node in route) == list(range(40))
+    assert all(sum(demands[node] for node in route) <= 25 for route in routes)
+    cost = route_costs(matrix, routes).sum()
+    assert cost == min(cost for _, cost in results)
+    assert cost <= route_costs(matrix, clark_wright(matrix, demands, 25)).sum() + 1e-9
+    assert params in default_grid()
+
+def test_parallel_sweep_matches_serial():
+    """
+    Test that the process-pool sweep returns the same plan as the serial one.
+    """
+    matrix, demands = random_instance(5, customers=25)
+    grid = [{"lam": 0.6}, {"lam": 1.0}, {"lam": 1.4, "mu": 0.5}, {"lam": 1.0, "nu": 0.5}]
+
+    assert sweep_clark_wright(matrix, demands, 20, grid=grid, workers=2) == sweep_clark_wright(matrix, demands, 20, grid=grid, workers=1)
@@ -0,0 +1,59 @@
+import pytest
+import numpy as np
+import pandas as pd
+from navigation.tables import edge_frame, graph_from_edges, page_slice, tours_table
+
+def test_page_slice_clamps_to_existing_pages():
+    """
+    Test the bounds of the first, last and out-of-range pages.
+    """
+    assert page_slice(250, 1, 100) == (0, 100, 3)
+    assert page_slice(250, 3, 100) == (200, 250, 3)
+    assert page_slice(250, 9, 100) == (200, 250, 3)
+    assert page_slice(0, 1, 100) == (0, 0, 1)
+
+def test_tours_table_builds_only_the_page():
+    """
+    Test that a page of the tours table holds the requested tours, numbered from the page start.
+    """
+    names = ["A", "B", "C", "Depot"]
+    routes = [[0], [1, 2]]
+    evaluation = {
+        "cost": np.array([10.0, 30.0]),
+        "load": np.array([5.0, 8.0]),
+        "utilization": np.array([0.5, 0.8]),
+    }
+    table = tours_table(routes, names, evaluation, 10, start=1, stop=2)
+    assert table.index.tolist() == [2]
+    assert table.loc[2, "Route"] == "Depot -> B -> C -> Depot"
+    assert table.loc[2, "Stops"] == 2
+    assert table.loc[2, "Distance"] == 30.0
+    assert len(tours_table(routes, names, evaluation, 10)) == 2
+
+def test_edge_table_round_trip():
+    """
+    Test that the edge table lists each edge once and rebuilds the bidirectional graph.
+    """
+    graph = {"A": {"B": 1, "C": 4}, "B": {"A": 1}, "C": {}}
+    edges = edge_frame(graph)
+    assert len(edges) == 2
+    rebuilt, skipped = graph_from_edges(edges, ["A", "B", "C"])
+    assert skipped == 0
+    assert rebuilt == {"A": {"B": 1, "C": 4}, "B": {"A": 1}, "C": {"A": 4}}
+
+def test_graph_from_edges_skips_invalid_rows():
+    """
+    Test that incomplete rows, unknown nodes, self-loops and negative distances are skipped, but zero weights are kept.
+    """
+    edges = pd.DataFrame([
+        ["A", "B", 2.0],
+        [None, "B", 1.0],
+        ["A", "Z", 1.0],
+        ["A", "A", 1.0],
+        ["B", "C", -1.0],
+        ["B", "C", float("nan")],
+        ["A", "C", 0.0],
+    ], columns=["From", "To", "Distance"])
+    graph, skipped = graph_from_edges(edges, ["A", "B", "C"])
+    assert skipped == 5
+    assert graph == {"A": {"B": 2.0, "C": 0.0}, "B": {"A": 2.0}, "C": {"A": 0.0}}